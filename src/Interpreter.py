@@ -4,12 +4,20 @@
 from core.Printer import Printer
 from core.Expression import Expression
 from core.Logger import Logger
-from core.Line import Line
 from core.Stack import Stack
 from core.Setter import Setter
 from core.Fail import fail
 from core.Boolean import Boolean
-from core.Function import Function
+from core.Function import Function, get_function_name
+from core.Statement import Statement
+from core.Parser import Parser
+from core.Optimizer import Optimizer
+from core.Loop import Loop
+from core.Frame import Frame, CallFrame
+from core.Array import NumberArray, is_array, is_number
+from core.Set import Set
+from core.NativeRuntime import NativeRuntime
+from core.TokenCache import call_site_cache, function_cache
 from colors import color
 import os
 import io
@@ -19,25 +27,81 @@ import random
 import time
 from Reserved import reserved
 
+default_recursion_limit = 500
+# Python frames a call made from inside an expression can take, including a function call in its
+# arguments. Only these calls nest Python frames, and the Python recursion limit is never raised
+# past max_python_recursion_limit, since Python frames also take space on the C stack.
+python_frames_per_call = 25
+max_python_recursion_limit = 15000
+
 
 class Interpreter:
-    def __init__ (self, script_name):
+    def __init__ (self, script_name, execution_mode="interpreter", recursion_limit=default_recursion_limit):
         self.script_name = script_name
         self.lines = []
+        self.statements = []
         self.variables = {}
         self.variables_out_of_scope = {}
         self.functions = {}
         self.recursion_depth = 0
-        self.recursion_limit = 500
+        self.nested_calls = 0
+        self.recursion_limit = default_recursion_limit
+        self.set_recursion_limit(recursion_limit)
         self.call_stack = Stack()
         self.function_call_stack = Stack()
+        self.bound_return_values = {}
+        self.tail_call = None
+        self.performed_io = False
         self.repl_counter = 0
-        self.in_if_chain = False
-        self.looking_for_else = False
-        self.in_nested_repl = False
         self.exit_repl_on_error = False
+        self.dump_optimized = False
         self.error_type = "Interpreter Error"
-        
+        self.native_runtime = None
+        if execution_mode == "native":
+            self.native_runtime = NativeRuntime(self)
+        self.statement_handlers = {
+            "comment" : self.execute_comment,
+            "if" : self.execute_conditional,
+            "elseIf" : self.execute_conditional,
+            "else" : self.execute_conditional,
+            "repeat" : self.execute_repeat,
+            "while" : self.execute_while,
+            "for" : self.execute_for,
+            "function" : self.execute_function_definition,
+            "return" : self.execute_return,
+            "end" : self.execute_end,
+            "print" : self.execute_print,
+            "log" : self.execute_log,
+            "set" : self.execute_set,
+            "append" : self.execute_append,
+            "put" : self.execute_put,
+            "add" : self.execute_add,
+            "remove" : self.execute_remove,
+            "merge" : self.execute_merge,
+            "sort" : self.execute_sort,
+            "sleep" : self.execute_sleep,
+            "exit" : self.execute_exit,
+            "call" : self.execute_call
+        }
+        self.block_handlers = {
+            "if" : self.enter_conditional,
+            "repeat" : self.enter_repeat,
+            "while" : self.enter_while,
+            "for" : self.enter_for
+        }
+        self.call_handlers = {}
+        if self.native_runtime == None:
+            self.call_handlers = {
+                "set" : self.enter_set,
+                "call" : self.enter_call
+            }
+
+
+    def set_recursion_limit(self, recursion_limit):
+        self.recursion_limit = recursion_limit
+        self.python_recursion_limit = min(recursion_limit * python_frames_per_call + 1000, max_python_recursion_limit)
+        self.nested_call_limit = (self.python_recursion_limit - 1000) // python_frames_per_call
+
 
     def run(self):
         if self.script_name != "REPL":
@@ -51,7 +115,7 @@ class Interpreter:
 
             self.lines = script.readlines()
             self.run_script(self.lines, 0)
-            
+
         else:
             try:
                 self.run_repl()
@@ -63,538 +127,783 @@ class Interpreter:
             except KeyboardInterrupt:
                 fail("Recieved Keyboard Interrupt (ctl+c). Terminating program..." , self.error_type, self.call_stack)
 
-    
+
     def run_script(self, lines, overall_script_position):
         if overall_script_position == None:
-            self.lines = lines
             overall_script_position = 0
+        self.lines = lines
+        self.statements = self.parse(lines, self.script_name, overall_script_position + self.repl_counter)
+        if self.dump_optimized == True:
+            print('\n'.join(Optimizer(self.statements, self.call_stack).dump()))
+            return
+        try:
+            return self.run_program(self.statements)
+        finally:
+            for depth in list(self.bound_return_values):
+                self.unbind_return_values(depth)
 
-        line_count = len(lines)
-        i = 0
 
-        while(i < line_count) :
-            line = Line(lines[i].lstrip(), i + overall_script_position + self.repl_counter, self.script_name)
-            self.call_stack.push(line)
-            i = self.execute(self.call_stack) - overall_script_position
-            if i < 0:
-                return -1
-            self.call_stack.pop()
-            i += 1
+    def parse(self, lines, file_name, first_line_number):
+        statements = Parser(lines, file_name, first_line_number).parse()
+        return Optimizer(statements, self.call_stack).optimize()
 
 
-    def run_repl(self):
-        line = ""
+    # The Python recursion limit is only raised while a program runs, and is restored afterwards.
+    def run_program(self, statements):
+        python_recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(python_recursion_limit, self.python_recursion_limit))
+        try:
+            if self.native_runtime != None:
+                return self.native_runtime.run(statements)
+            return self.run_statements(statements, 0, len(statements))
+        finally:
+            sys.setrecursionlimit(python_recursion_limit)
+
+
+    def run_statements(self, program, start, stop):
+        return self.run_frames([Frame(None, program, start, stop)])
+
 
+    def run_frames(self, frames):
+        call_stack = self.call_stack.get_stack()
+        call_stack_depth = len(call_stack)
+        while len(frames) > 0:
+            frame = frames[-1]
+            if frame.index < frame.stop:
+                statement = frame.program[frame.index]
+                call_stack.append(statement)
+                if statement.kind in self.block_handlers:
+                    block = self.block_handlers[statement.kind](statement)
+                    if block != None:
+                        frames.append(block)
+                        continue
+                    i = statement.end
+                elif statement.kind in self.call_handlers:
+                    call_frame = self.call_handlers[statement.kind](statement)
+                    if call_frame != None:
+                        frames.append(call_frame)
+                        continue
+                    i = statement.index
+                else:
+                    i = self.execute(statement)
+                call_stack.pop()
+                if i < 0:
+                    call_frame = self.leave_frames_to_call(frames)
+                    if call_frame == None:
+                        del call_stack[call_stack_depth:]
+                        return -1
+                    self.return_from_call(frames, call_frame)
+                    continue
+                frame.index = i + 1
+            elif type(frame) == CallFrame:
+                self.return_from_call(frames, frame)
+            elif frame.statement != None and self.continue_block(frame):
+                frame.restart()
+            else:
+                frames.pop()
+                if len(frames) > 0:
+                    call_stack.pop()
+                    frames[-1].index = frame.statement.end + 1
+
+
+    # A return leaves every block of the function that returned, up to the frame it was called in.
+    def leave_frames_to_call(self, frames):
+        for i in range(len(frames) - 1, -1, -1):
+            if type(frames[i]) == CallFrame:
+                del frames[i + 1:]
+                return frames[i]
+        return None
+
+
+    # A function called by a statement returns to the frame below it, unless it made a tail call,
+    # which runs the next function in the same frame.
+    def return_from_call(self, frames, call_frame):
+        call_stack = self.call_stack.get_stack()
+        del call_stack[call_frame.call_stack_depth:]
+        if self.tail_call != None:
+            tail_call_name, statement = self.start_tail_call()
+            call_stack.append(statement)
+            call_frame.enter(tail_call_name, self.functions[tail_call_name].function_body)
+            return
+        function_name = call_frame.call[0]
+        self.functions[function_name].return_value = self.functions[call_frame.function_name].return_value
+        self.leave_function(call_frame.call)
+        frames.pop()
+        self.finish_call(call_frame.statement, function_name)
+        call_stack.pop()
+        frames[-1].index = call_frame.statement.index + 1
+
+
+    def continue_block(self, frame):
+        if frame.statement.kind == "while":
+            return self.evaluate_while_condition(frame.statement) == True
+        if frame.loop == None:
+            return False
+        if frame.loop.next(self.variables):
+            return True
+        frame.loop.finish(self.variables)
+        return False
+
+
+    def run_repl(self):
         while True:
             line_raw = input("| " + str(self.repl_counter+1) + "   >> ") + "\n"
             self.lines.append(line_raw)
-            line = Line(line_raw, self.repl_counter, "REPL")
-            self.call_stack.push(line)
+            statement = Statement(line_raw, self.repl_counter, "REPL")
+            call_stack_depth = len(self.call_stack.get_stack())
+            self.call_stack.push(statement)
             try:
-                self.execute(self.call_stack)
+                lines = [line_raw]
+                if statement.opens_block() or statement.kind == "function":
+                    lines += self.get_repl_nested_code()
+                self.call_stack.pop()
+                self.statements = self.parse(lines, "REPL", statement.line_number)
+                self.run_program(self.statements)
             except SystemExit as e:
                 rc = int(str(e))
                 if rc == 0 or self.exit_repl_on_error == True:
                     raise sys.exit(rc)
-            if self.call_stack.peek() != None:
-                self.call_stack.pop()
+                self.recover_from_repl_error(call_stack_depth)
             self.repl_counter += 1
 
 
-    def find_else(self, lines, line_number):
-        line_count = len(lines)
-        i = 0
-        while(i < line_count):
-            line_raw = lines[i]
-            if line_raw.strip()[:2] == "if":
-                i = self.find_next_end(lines, line_count, i)
-            elif line_raw.strip() == "else" or line_raw.strip()[:6] == "elseIf":
-                self.looking_for_else = True
-                return line_number + i
-            i += 1
-        return line_number + line_count
-
-
-    def find_next_end(self, lines, line_count, start_line):
-        for i in range(start_line, line_count, 1):
-            if lines[i].strip()[:3] == "end":
-                return i
-
-
-    def execute(self, call_stack):
-        line_raw = call_stack.peek().line
-        function = line_raw.split(' ')[0].strip()
-        parameters = line_raw[len(function)+1:].strip()
-        line_number = call_stack.peek().line_number - self.repl_counter
-
-        if function[:1] == "#" or function == "":
-            print(end="")
-            return line_number
-
-        elif function == "if" or function == "elseIf" or function == "else":
-            if self.recursion_depth > 0:
-                self.in_nested_repl = True
-            if function == "elseIf" or function == "else":
-                if self.in_if_chain == False:
-                    fail("Dangling \"" + function + "\".", self.error_type, call_stack)
-                elif self.looking_for_else == False:
-                    return line_number + len(self.get_nested_code(line_number + 1))
-            bool_result = False
-            if function == "if" or function == "elseIf":
-                self.in_if_chain = True
-                self.looking_for_else = False
-                b = Boolean(parameters, call_stack, self.variables)
-                bool_result = b.evaluate()
-            conditional_lines = self.get_nested_code(line_number + 1)
-            if self.script_name == "REPL" and self.in_nested_repl == False:
-                self.in_nested_repl = True
+    def recover_from_repl_error(self, call_stack_depth):
+        while len(self.call_stack.get_stack()) > call_stack_depth:
+            self.call_stack.pop()
+        for depth in list(self.bound_return_values):
+            self.unbind_return_values(depth)
+        if self.recursion_depth > 0:
+            self.variables = self.variables_out_of_scope
+            self.recursion_depth = 0
+            self.function_call_stack = Stack()
+        self.nested_calls = 0
+        self.tail_call = None
+
+
+    # Return values bound while running a statement are removed once it has finished.
+    def execute(self, statement):
+        index = self.statement_handlers[statement.kind](statement)
+        self.unbind_return_values(self.recursion_depth)
+        return index
+
+
+    def execute_comment(self, statement):
+        print(end="")
+        return statement.index
+
+
+    def execute_block(self, statement):
+        frame = self.block_handlers[statement.kind](statement)
+        if frame != None and self.run_frames([frame]) == -1:
+            return -1
+        return statement.end
+
+
+    def execute_conditional(self, statement):
+        if statement.kind != "if":
+            fail("Dangling \"" + statement.function + "\".", self.error_type, self.call_stack)
+        return self.execute_block(statement)
+
+
+    # Arms that can never be taken have already been dropped from the chain by the optimizer.
+    def enter_conditional(self, statement):
+        if statement.end == None:
+            self.evaluate_condition(statement.parameters)
+        self.get_block_end(statement)
+        for arm, condition, start, stop in statement.chain:
+            if arm is not statement:
                 self.call_stack.pop()
-                self.repl_counter -= len(conditional_lines)
-                self.run_script([line_raw] + conditional_lines, None)
-                self.repl_counter += len(conditional_lines)
-                self.in_nested_repl = False
-                return
-            if bool_result == True or function == "else":
-                exiting_function = self.run_script(conditional_lines, line_number + 1)
-                if exiting_function == -1:
-                    return -1
-                self.in_if_chain = True
-                line_number += len(conditional_lines)
+                self.call_stack.push(arm)
+            if condition == None or self.evaluate_condition(condition) == True:
+                return Frame(statement, statement.program, start, stop)
+        return None
+
+
+    def evaluate_condition(self, condition):
+        return Boolean(condition, self.call_stack, self.variables).evaluate()
+
+
+    def execute_repeat(self, statement):
+        return self.execute_block(statement)
+
+
+    def enter_repeat(self, statement):
+        return self.enter_loop(statement, self.start_repeat(statement))
+
+
+    def enter_loop(self, statement, loop):
+        end = self.get_block_end(statement)
+        if loop.next(self.variables) == False:
+            loop.finish(self.variables)
+            return None
+        frame = Frame(statement, statement.program, statement.index + 1, end)
+        frame.loop = loop
+        return frame
+
+
+    def start_repeat(self, statement):
+        loop = Loop(statement)
+        is_custom_step = False
+        step = 1
+        is_custom_start = False
+        start = 0
+        for option, option_value in statement.repeat_options:
+            if option == "counter":
+                if loop.variable != None:
+                    fail("\"counter\" already defined. Only define a counter once." , self.error_type, self.call_stack)
+                loop.set_variable(option_value, self.variables, False)
+                setter = Setter(option_value + " to  0", self.call_stack, self.variables, self.functions)
+                self.variables.update(setter.set())
+            elif option == "step":
+                if is_custom_step == True:
+                    fail("\"step\" already defined. Only define a step once." , self.error_type, self.call_stack)
+                step = self.resolve_function_calls(option_value)
+                step_expression = Expression(step, self.call_stack, self.variables)
+                step = step_expression.evaluate()
+                if type(step) != int:
+                        fail("\"step\" must be an integer." , self.error_type, self.call_stack)
+                is_custom_step = True
+            elif option == "start":
+                if is_custom_start == True:
+                    fail("\"start\" already defined. Only define a start value once." , self.error_type, self.call_stack)
+                start = self.resolve_function_calls(option_value)
+                start_expression = Expression(start, self.call_stack, self.variables)
+                start = start_expression.evaluate()
+                if type(start) != int:
+                        fail("\"start\" must be an integer." , self.error_type, self.call_stack)
+                is_custom_start = True
             else:
-                line_number = self.find_else(conditional_lines, line_number)
-            return line_number
-
-        elif function == "repeat":
-            parameters = ' '.join(parameters.split())
-            is_counter = False
-            counter = None
-            counter_overrides_an_existing_variable = False
-            counter_original_value = None
-            is_custom_step = False
-            step = 1
-            is_custom_start = False
-            start = 0
-            parameter_tokens = parameters.split(",")
-            if len(parameter_tokens) > 1:
-                option_tokens = parameter_tokens[1:]
-                for option_token in option_tokens:
-                    option_token = option_token.strip()
-                    if option_token[:8] == "counter ":
-                        if is_counter == True:
-                            fail("\"counter\" already defined. Only define a counter once." , self.error_type, self.call_stack)
-                        counter = option_token[8:]
-                        if counter in self.variables:
-                            counter_overrides_an_existing_variable = True
-                            counter_original_value = self.variables[counter]
-                        setter = Setter(counter + " to  0", call_stack, self.variables, self.functions)
-                        self.variables.update(setter.set())
-                        is_counter = True
-                    elif option_token[:5] == "step ":
-                        if is_custom_step == True:
-                            fail("\"step\" already defined. Only define a step once." , self.error_type, self.call_stack)
-                        step = self.resolve_function_calls(option_token[5:], line_number)
-                        step_expression = Expression(step, self.call_stack, self.variables)
-                        step = step_expression.evaluate()
-                        if type(step) != int:
-                                fail("\"step\" must be an integer." , self.error_type, self.call_stack)
-                        is_custom_step = True
-                    elif option_token[:6] == "start ":
-                        if is_custom_start == True:
-                            fail("\"start\" already defined. Only define a start value once." , self.error_type, self.call_stack)
-                        start = self.resolve_function_calls(option_token[6:], line_number)
-                        start_expression = Expression(start, self.call_stack, self.variables)
-                        start = start_expression.evaluate()
-                        if type(start) != int:
-                                fail("\"start\" must be an integer." , self.error_type, self.call_stack)
-                        is_custom_start = True
-                    else:
-                        fail("Unknown option for repeat loop." , self.error_type, self.call_stack)
-            repeat_to = self.resolve_function_calls(parameter_tokens[0], line_number)
-            repeat_expression = Expression(repeat_to, self.call_stack, self.variables)
-            repeat_to = repeat_expression.evaluate()
-            if type(repeat_to) != int:
-                fail("The number of times to repeat the code block must be an integer." , self.error_type, self.call_stack)
-            if repeat_to == 0:
-                fail("The number of times to repeat the code block cannot be '0'." , self.error_type, self.call_stack)
-            if step == 0:
-                fail("\"step\" cannot be '0'." , self.error_type, self.call_stack)
-            if repeat_to - start > 0 and step < 0:
-                fail("\"step\" cannot be less than '0' if the difference between the amount of times to repeat the code block and \"start\" is greater than '0'." , self.error_type, self.call_stack)
-            if repeat_to - start < 0 and step > 0:
-                fail("\"step\" cannot be greater than '0' if the difference between the amount of times to repeat the code block and \"start\" is less than '0'." , self.error_type, self.call_stack)
-            repeat_lines = self.get_nested_code(line_number + 1)
-            for i in range(start, repeat_to, step):
-                if is_counter == True:
-                    self.variables[counter] = i
-                if self.script_name == "REPL" and self.in_nested_repl == False:
-                    self.in_nested_repl = True
-                    repl_repeat_lines = repeat_lines[:-1]
-                    self.repl_counter -= len(repl_repeat_lines)
-                    self.run_script(repl_repeat_lines, None)
-                    self.repl_counter += len(repl_repeat_lines)
-                    self.in_nested_repl = False
-                else:
-                    self.run_script(repeat_lines, line_number + 1)
-            if is_counter == True:
-                self.variables.pop(counter)
-            if counter_overrides_an_existing_variable == True:
-                self.variables[counter] = counter_original_value
-            return line_number + len(repeat_lines) + 1
-
-        elif function == "while":
-            parameters = ' '.join(parameters.split())
-            if parameters == '':
-                fail("'while' must take a boolean argument." , self.error_type, self.call_stack)
-            boolean = self.resolve_function_calls(parameters, line_number)
-            b = Boolean(boolean, call_stack, self.variables)
-            while_lines = self.get_nested_code(line_number + 1)
-            while b.evaluate() == True:
-                if self.script_name == "REPL" and self.in_nested_repl == False:
-                    self.in_nested_repl = True
-                    repl_while_lines = while_lines[:-1]
-                    self.repl_counter -= len(repl_while_lines)
-                    self.run_script(repl_while_lines, None)
-                    self.repl_counter += len(repl_while_lines)
-                    self.in_nested_repl = False
-                else:
-                    self.run_script(while_lines, line_number + 1)
-                boolean = self.resolve_function_calls(parameters, line_number)
-                b = Boolean(boolean, call_stack, self.variables)
-            return line_number + len(while_lines) + 1
-
-        if function == "for":
-            parameters = ' '.join(parameters.split())
-            parameter_tokens = parameters.split()
-            if len(parameter_tokens) < 3:
-                fail("'for' requires at least 3 arguments. Correct syntax for 'repeat for': 'repeat for element in array'" , self.error_type, self.call_stack)
-            if parameter_tokens[1] != "in":
-                fail("'for' requires the 'in' keyword. Correct syntax for 'repeat for': 'repeat for element in array'" , self.error_type, self.call_stack)
-            element_variable = parameter_tokens[0]
-            element_variable_overrides_existing_variable = False
-            element_variable_original_value = None
-            if element_variable in self.variables:
-                element_variable_overrides_existing_variable = True
-                element_variable_original_value = self.variables[element_variable]
-            array_expression = self.resolve_function_calls(' '.join(parameter_tokens[2:]), line_number)
-            e = Expression(array_expression, self.call_stack, self.variables)
-            array = e.evaluate()
-            if type(array) != list:
-                fail(f"'for' can only iterate over an array. '{parameter_tokens[2:]}' is not an array." , self.error_type, self.call_stack)
-            for_lines = self.get_nested_code(line_number + 1)
-            for element in array:
-                self.variables[element_variable] = element
-                if self.script_name == "REPL" and self.in_nested_repl == False:
-                    self.in_nested_repl = True
-                    repl_for_line = for_lines[:-1]
-                    self.repl_counter -= len(repl_for_line)
-                    self.run_script(repl_for_line, None)
-                    self.repl_counter += len(repl_for_line)
-                    self.in_nested_repl = False
-                else: 
-                    self.run_script(for_lines, line_number + 1)
-            if element_variable_overrides_existing_variable == True:
-                self.variables[element_variable] = element_variable_original_value
-            return line_number + len(for_lines) + 1
-
-        elif function == "function":
-            function_name = parameters.split("(")[0].strip()
-            if function_name in self.functions:
-                fail("Function \"" + function_name + "\" is already defined." , self.error_type, self.call_stack)
-            if function_name in self.variables:
-                fail("Function cannot have the same name as a defined variable." , self.error_type, self.call_stack)
-            function_start = line_number
-            if self.script_name == "REPL":
-                function_start = self.repl_counter
-            function_body = self.get_nested_code(line_number + 1)
-            function_end = len(function_body)
-            f = Function(parameters, function_body, self.call_stack, self.functions, self.variables, function_start)
-            self.functions[f.function_name] = f
-            return line_number + function_end + 1
-
-        elif function == "return":
-            if self.recursion_depth == 0:
-                fail("\"return\" can only be used in functions", self.error_type, self.call_stack)
-            function_name = self.function_call_stack.peek()
-            parameters = self.resolve_function_calls(parameters, line_number)
-            e = Expression(parameters, self.call_stack, self.variables)
-            return_value = e.evaluate()
-            if type(return_value) == str:
-                return_value = '"' + return_value + '"'
-            self.functions[function_name].return_value = return_value
-            self.function_cleanup()
+                fail("Unknown option for repeat loop." , self.error_type, self.call_stack)
+        repeat_to = self.resolve_function_calls(statement.repeat_count)
+        repeat_expression = Expression(repeat_to, self.call_stack, self.variables)
+        repeat_to = repeat_expression.evaluate()
+        if type(repeat_to) != int:
+            fail("The number of times to repeat the code block must be an integer." , self.error_type, self.call_stack)
+        if repeat_to == 0:
+            fail("The number of times to repeat the code block cannot be '0'." , self.error_type, self.call_stack)
+        self.unbind_return_values(self.recursion_depth)
+        if step == 0:
+            fail("\"step\" cannot be '0'." , self.error_type, self.call_stack)
+        if repeat_to - start > 0 and step < 0:
+            fail("\"step\" cannot be less than '0' if the difference between the amount of times to repeat the code block and \"start\" is greater than '0'." , self.error_type, self.call_stack)
+        if repeat_to - start < 0 and step > 0:
+            fail("\"step\" cannot be greater than '0' if the difference between the amount of times to repeat the code block and \"start\" is less than '0'." , self.error_type, self.call_stack)
+        loop.set_values(range(start, repeat_to, step))
+        return loop
+
+
+    def execute_while(self, statement):
+        return self.execute_block(statement)
+
+
+    def enter_while(self, statement):
+        condition = self.evaluate_while_condition(statement)
+        end = self.get_block_end(statement)
+        if condition != True:
+            return None
+        return Frame(statement, statement.program, statement.index + 1, end)
+
+
+    def evaluate_while_condition(self, statement):
+        parameters = statement.while_condition
+        if parameters == '':
+            fail("'while' must take a boolean argument." , self.error_type, self.call_stack)
+        boolean = self.resolve_function_calls(parameters)
+        condition = Boolean(boolean, self.call_stack, self.variables).evaluate()
+        self.unbind_return_values(self.recursion_depth)
+        return condition
+
+
+    def execute_for(self, statement):
+        return self.execute_block(statement)
+
+
+    def enter_for(self, statement):
+        return self.enter_loop(statement, self.start_for(statement))
+
+
+    def start_for(self, statement):
+        parameter_tokens = statement.for_parameters
+        if len(parameter_tokens) < 3:
+            fail("'for' requires at least 3 arguments. Correct syntax for 'repeat for': 'repeat for element in array'" , self.error_type, self.call_stack)
+        if parameter_tokens[1] != "in":
+            fail("'for' requires the 'in' keyword. Correct syntax for 'repeat for': 'repeat for element in array'" , self.error_type, self.call_stack)
+        loop = Loop(statement)
+        loop.set_variable(parameter_tokens[0], self.variables, True)
+        array_expression = self.resolve_function_calls(' '.join(parameter_tokens[2:]))
+        e = Expression(array_expression, self.call_stack, self.variables)
+        array = e.evaluate()
+        if type(array) == dict or type(array) == Set:
+            array = list(array)
+        if is_array(array) == False:
+            fail(f"'for' can only iterate over an array, a set or the keys of a map. '{parameter_tokens[2:]}' is not an array, a set or a map." , self.error_type, self.call_stack)
+        self.unbind_return_values(self.recursion_depth)
+        loop.set_values(array)
+        return loop
+
+
+    def execute_function_definition(self, statement):
+        function_name = get_function_name(statement.parameters)
+        if function_name in self.functions:
+            fail("Function \"" + function_name + "\" is already defined." , self.error_type, self.call_stack)
+        if function_name in self.variables:
+            fail("Function cannot have the same name as a defined variable." , self.error_type, self.call_stack)
+        end = self.get_block_end(statement)
+        function_body = statement.program[statement.index + 1:end]
+        f = Function(statement.parameters, function_body, self.call_stack, self.functions, self.variables, statement.line_number)
+        self.functions[f.function_name] = f
+        return end
+
+
+    def execute_return(self, statement):
+        if self.recursion_depth == 0:
+            fail("\"return\" can only be used in functions", self.error_type, self.call_stack)
+        function_name = self.function_call_stack.peek()
+        tail_call = self.get_single_call(statement.parameters)
+        if tail_call != None:
+            tail_call_name, tail_call_parameters = tail_call
+            frame = self.functions[tail_call_name].create_frame(tail_call_parameters, self.variables)
+            self.tail_call = (tail_call_name, frame, statement)
             return -1
+        parameters = self.resolve_function_calls(statement.parameters)
+        e = Expression(parameters, self.call_stack, self.variables)
+        self.functions[function_name].return_value = e.evaluate()
+        return -1
 
-        elif function == "end":
-            if self.in_if_chain == True:
-                self.in_if_chain = False
-                return line_number
-            if self.recursion_depth > 0:
-                self.function_cleanup()
-                return line_number
-            fail("Extra or dangling \"end\".", self.error_type, self.call_stack)
-
-        elif function[:5] == "print":
-            parameters = self.resolve_function_calls(parameters, line_number)
-            p = Printer(function, parameters, call_stack, self.variables)
-            if self.script_name == "REPL" and self.exit_repl_on_error == False:
-                output = io.StringIO()
-                with redirect_stdout(output):
-                    p.print()
-                output = output.getvalue()
-                print("\t " + output[:-1].replace("\n", "\n         "))
-            else:
+
+    # "return f(x)" is a tail call when the call is the whole expression. Its arguments are
+    # evaluated right away, and f then runs in place of the current call.
+    def get_single_call(self, parameters):
+        if len(parameters) == 0 or parameters[-1] != ")":
+            return None
+        parameter_tokens = Expression(parameters, self.call_stack, self.variables).tokenize(parameters)
+        if len(parameter_tokens) != 1:
+            return None
+        function_calls = self.get_functions(parameter_tokens)
+        if len(function_calls) != 1:
+            return None
+        function_name, function_call = function_calls[0]
+        if function_call != parameter_tokens[0].strip() or function_call[len(function_name):len(function_name) + 1] != "(":
+            return None
+        return function_name, function_call[len(function_name):]
+
+
+    def execute_end(self, statement):
+        fail("Extra or dangling \"end\".", self.error_type, self.call_stack)
+
+
+    def execute_print(self, statement):
+        self.performed_io = True
+        parameters = self.resolve_function_calls(statement.parameters)
+        p = Printer(statement.function, parameters, self.call_stack, self.variables)
+        if self.script_name == "REPL" and self.exit_repl_on_error == False:
+            output = io.StringIO()
+            with redirect_stdout(output):
                 p.print()
-            return line_number
-
-        elif function[:3] == "log":
-            parameters = self.resolve_function_calls(parameters, line_number)
-            l = Logger(function, parameters, call_stack, self.variables)
-            if self.script_name == "REPL":
-                output = io.StringIO()
-                with redirect_stdout(output):
-                    l.log()
-                output = output.getvalue()
-                print("\t " + output[:-1].replace("\n", "\n         "))
-            else:
+            output = output.getvalue()
+            print("\t " + output[:-1].replace("\n", "\n         "))
+        else:
+            p.print()
+        return statement.index
+
+
+    def execute_log(self, statement):
+        self.performed_io = True
+        parameters = self.resolve_function_calls(statement.parameters)
+        l = Logger(statement.function, parameters, self.call_stack, self.variables)
+        if self.script_name == "REPL":
+            output = io.StringIO()
+            with redirect_stdout(output):
                 l.log()
-            return line_number
-
-        elif function == "set":
-            parameters = self.resolve_function_calls(parameters, line_number)
-            parameter_tokens = parameters.split()
-            if parameter_tokens[-1] == "input":
-                user_input = input("")
-                parameters = ' '.join(parameter_tokens[:-1]) + ' "' + user_input + '"'
-            elif parameter_tokens[2] == "input":
-                prompt = ' '.join(parameter_tokens[3:])
-                expression = Expression(prompt, self.call_stack, self.variables)
-                prompt = expression.evaluate()
-                user_input = input(prompt)
-                parameters = ' '.join(parameter_tokens[:2]) + ' "' + user_input + '"'
-            elif parameter_tokens[2] == "randomInteger":
-                random_integer_parameters = ' '.join(parameter_tokens[3:])
-                random_integer_parameter_tokens = random_integer_parameters.split(",")
-                random_integer_parameter_tokens_length = len(random_integer_parameter_tokens)
-                if random_integer_parameter_tokens_length > 2 or random_integer_parameter_tokens_length < 1:
-                    fail("'randomInteger' can only take 2 parameters, and must take at least 1.", self.error_type, call_stack)
-                if random_integer_parameter_tokens_length == 2:
-                    expression = Expression(random_integer_parameter_tokens[0], self.call_stack, self.variables)
-                    lower_limit = expression.evaluate()
-                    expression = Expression(random_integer_parameter_tokens[1], self.call_stack, self.variables)
-                    upper_limit = expression.evaluate()
-                if random_integer_parameter_tokens_length == 1:
-                    lower_limit = 0
-                    expression = Expression(random_integer_parameter_tokens[0], self.call_stack, self.variables)
-                    upper_limit = expression.evaluate()
-                if type(lower_limit) != int or type(upper_limit) != int:
-                    fail("'randomInteger' can only take integer parameters.", self.error_type, call_stack)
-                if upper_limit < lower_limit:
-                    fail("Lower limit cannot be greater than upper limit.", self.error_type, call_stack)
-                parameter_tokens[2] = str(random.randint(lower_limit, upper_limit))
-                parameters = ' '.join(parameter_tokens[:3])
-            elif parameter_tokens[-1] == "randomDecimal":
-                parameter_tokens[-1] = str(random.random())
-                parameters = ' '.join(parameter_tokens)
-            setter = Setter(parameters, call_stack, self.variables, self.functions)
-            self.variables.update(setter.set())
-            return line_number
-
-        elif function == "append" or function == "prepend" or function == "push":
-            parameters = self.resolve_function_calls(parameters, line_number)
-            parameter_tokens = parameters.split()
-            if parameter_tokens[-2] != "to":
-                fail(f"'{function}' operation missing 'to' keyword." , self.error_type, call_stack)
-            expression = Expression(' '.join(parameter_tokens[:-2]), self.call_stack, self.variables)
-            value = expression.evaluate()
-            array = parameter_tokens[-1]
-            if array not in self.variables:
-                fail(f"The array '{array}' does not exist in the current scope.", self.error_type, call_stack)
-            if type(self.variables[array]) != list:
-                fail("Values can only be appended to arrays.", self.error_type, call_stack)
-            if function == "append":
-                self.variables[array].append(value)
-            elif function == "prepend" or function == "push" :
-                self.variables[array].insert(0, value)
-            return line_number
-
-        elif function == "pop" or function == "removeFirst" or function == "removeLast" or function == "remove":
-            parameters = self.resolve_function_calls(parameters, line_number)
-            parameters = " " + parameters
-            if " from " not in parameters:
-                fail(f"'{function}' operation missing 'from' keyword.", self.error_type, call_stack)
-            required_tokens = 2
-            parameter_tokens = parameters.split(" from ")
-            if " into " in parameters:
-                required_tokens = 3
-                parameter_tokens = parameter_tokens[:-1] + parameter_tokens[-1].split(" into ")
-                variable = parameter_tokens[-1]
-            if len(parameter_tokens) != required_tokens:
-                fail(f"The '{function}' function must contain one instance of the 'from' keyword and may contain one instance of the 'into' keyword.", self.error_type, call_stack)
-            array = parameter_tokens[1].strip()
-            if array not in self.variables:
-                fail(f"The array '{array}' does not exist in the current scope.", self.error_type, call_stack)
-            if type(self.variables[array]) != list:
-                fail(f"Elements may only be removed from arrays.", self.error_type, call_stack)
-            if len(self.variables[array]) == 0:
-                fail(f"Elements cannot be removed from array '{array}' because it is empty.", self.error_type, call_stack)
-            if function != "remove" and parameter_tokens[0].strip() != '':
-                fail(f"The '{function}' function was given too many arguments.", self.error_type, call_stack)
-            if function == "pop" or function == "removeFirst":
-                removed_value = self.variables[array][0]
-                self.variables[array] = self.variables[array][1:]
-            elif function == "removeLast":
-                removed_value = self.variables[array][-1]
-                self.variables[array] = self.variables[array][:-1]
-            elif function == "remove":
-                index_expression = parameter_tokens[0]
-                index = Expression(index_expression, self.call_stack, self.variables).evaluate()
-                if type(index) != int:
-                    fail(f"Array index '{index_expression}' is not an integer. Array index must be an integer.", self.error_type, call_stack)
-                try:
-                    removed_value = self.variables[array][index]
-                    self.variables[array].pop(index)
-                except:
-                    fail(f"Array index '{index_expression}' is out of range for array '{array}'.", self.error_type, call_stack)
-            if required_tokens == 3:
-                setter = Setter(parameters, call_stack, self.variables, self.functions)
-                if setter.is_variable_name_valid(variable) == True:
-                    self.variables[variable] = removed_value
-            return line_number
-
-        elif function == "merge":
-            parameters = self.resolve_function_calls(parameters, line_number)
-            if " into " not in parameters:
-                fail(f"'{function}' operation missing 'into' keyword.", self.error_type, call_stack)
-            parameter_tokens = parameters.split(" into ")
-            if len(parameter_tokens) != 2:
-                fail(f"The '{function}' function may only contain one instance of the 'into' keyword.", self.error_type, call_stack)
-            from_array = Expression(parameter_tokens[0].strip(), self.call_stack, self.variables).evaluate()
-            into_array = parameter_tokens[-1].strip()
-            if into_array not in self.variables:
-                fail(f"The array '{into_array}' does not exist in the current scope.", self.error_type, call_stack)
-            if type(from_array) != list:
-                fail(f"Only arrays can be merged. {from_array} is not an array", self.error_type, call_stack)
-            if type(self.variables[into_array]) != list:
-                fail(f"Only arrays can be merged. {into_array} is not an array", self.error_type, call_stack)
-            self.variables[into_array] = self.variables[into_array] + from_array
-            return line_number
-
-        elif function == "sort" or function == "sortReverse":
-            if parameters not in self.variables:
-                fail(f"Array to sort must be stored in a variable. '{parameters}' is not a variable", self.error_type, call_stack)
-            if type(self.variables[parameters]) != list:
-                fail(f"Only arrays can be sorted. '{parameters}'' is not an array", self.error_type, call_stack)
-            if function == "sort":
-                self.variables[parameters].sort()
-            else:
-                self.variables[parameters].sort(reverse=True)
-            return line_number
-
-        elif function == "sleep":
-            parameters = self.resolve_function_calls(parameters, line_number)
-            seconds = Expression(parameters, self.call_stack, self.variables).evaluate()
-            if type(seconds) == int or type(seconds) == float:
-                time.sleep(seconds)
-            else:
-                fail("Number of seconds to sleep for must be a number.", self.error_type, call_stack)
-            return line_number
+            output = output.getvalue()
+            print("\t " + output[:-1].replace("\n", "\n         "))
+        else:
+            l.log()
+        return statement.index
+
+
+    def execute_set(self, statement):
+        parameters = self.resolve_function_calls(statement.parameters)
+        parameter_tokens = parameters.split()
+        if parameter_tokens[-1] in ["input", "randomDecimal"] or parameter_tokens[2] in ["input", "randomInteger"]:
+            self.performed_io = True
+        if parameter_tokens[-1] == "input":
+            user_input = input("")
+            parameters = ' '.join(parameter_tokens[:-1]) + ' "' + user_input + '"'
+        elif parameter_tokens[2] == "input":
+            prompt = ' '.join(parameter_tokens[3:])
+            expression = Expression(prompt, self.call_stack, self.variables)
+            prompt = expression.evaluate()
+            user_input = input(prompt)
+            parameters = ' '.join(parameter_tokens[:2]) + ' "' + user_input + '"'
+        elif parameter_tokens[2] == "randomInteger":
+            random_integer_parameters = ' '.join(parameter_tokens[3:])
+            random_integer_parameter_tokens = random_integer_parameters.split(",")
+            random_integer_parameter_tokens_length = len(random_integer_parameter_tokens)
+            if random_integer_parameter_tokens_length > 2 or random_integer_parameter_tokens_length < 1:
+                fail("'randomInteger' can only take 2 parameters, and must take at least 1.", self.error_type, self.call_stack)
+            if random_integer_parameter_tokens_length == 2:
+                expression = Expression(random_integer_parameter_tokens[0], self.call_stack, self.variables)
+                lower_limit = expression.evaluate()
+                expression = Expression(random_integer_parameter_tokens[1], self.call_stack, self.variables)
+                upper_limit = expression.evaluate()
+            if random_integer_parameter_tokens_length == 1:
+                lower_limit = 0
+                expression = Expression(random_integer_parameter_tokens[0], self.call_stack, self.variables)
+                upper_limit = expression.evaluate()
+            if type(lower_limit) != int or type(upper_limit) != int:
+                fail("'randomInteger' can only take integer parameters.", self.error_type, self.call_stack)
+            if upper_limit < lower_limit:
+                fail("Lower limit cannot be greater than upper limit.", self.error_type, self.call_stack)
+            parameter_tokens[2] = str(random.randint(lower_limit, upper_limit))
+            parameters = ' '.join(parameter_tokens[:3])
+        elif parameter_tokens[-1] == "randomDecimal":
+            parameter_tokens[-1] = str(random.random())
+            parameters = ' '.join(parameter_tokens)
+        self.set_variable(parameters)
+        return statement.index
+
+
+    def set_variable(self, parameters):
+        setter = Setter(parameters, self.call_stack, self.variables, self.functions)
+        self.variables.update(setter.set())
+
+
+    def execute_append(self, statement):
+        function = statement.function
+        parameters = self.resolve_function_calls(statement.parameters)
+        parameter_tokens = parameters.split()
+        if parameter_tokens[-2] != "to":
+            fail(f"'{function}' operation missing 'to' keyword." , self.error_type, self.call_stack)
+        expression = Expression(' '.join(parameter_tokens[:-2]), self.call_stack, self.variables)
+        value = expression.evaluate()
+        array = parameter_tokens[-1]
+        if array not in self.variables:
+            fail(f"The array '{array}' does not exist in the current scope.", self.error_type, self.call_stack)
+        if is_array(self.variables[array]) == False:
+            fail("Values can only be appended to arrays.", self.error_type, self.call_stack)
+        if type(self.variables[array]) == NumberArray and is_number(value) == False:
+            fail(f"Only numbers can be added to the number array '{array}'.", self.error_type, self.call_stack)
+        if function == "append":
+            self.variables[array].append(value)
+        elif function == "prepend" or function == "push" :
+            self.variables[array].appendleft(value)
+        return statement.index
 
-        elif function == "exit":
-            sys.exit(0)
 
+    def execute_put(self, statement):
+        function = statement.function
+        parameters = self.resolve_function_calls(statement.parameters)
+        in_index = parameters.rfind(" in ")
+        at_index = parameters.rfind(" at ", 0, max(in_index, 0))
+        if in_index == -1:
+            fail(f"'{function}' operation missing 'in' keyword.", self.error_type, self.call_stack)
+        if at_index == -1:
+            fail(f"'{function}' operation missing 'at' keyword.", self.error_type, self.call_stack)
+        map_name = parameters[in_index + 4:].strip()
+        if map_name not in self.variables:
+            fail(f"The map '{map_name}' does not exist in the current scope.", self.error_type, self.call_stack)
+        if type(self.variables[map_name]) != dict:
+            fail("Values can only be put in maps.", self.error_type, self.call_stack)
+        expression = Expression(parameters[:at_index].strip(), self.call_stack, self.variables)
+        value = expression.evaluate()
+        key = expression.get_map_key(parameters[at_index + 4:in_index].strip())
+        self.variables[map_name][key] = value
+        return statement.index
+
+
+    def execute_add(self, statement):
+        function = statement.function
+        parameters = self.resolve_function_calls(statement.parameters)
+        to_index = parameters.rfind(" to ")
+        if to_index == -1:
+            fail(f"'{function}' operation missing 'to' keyword.", self.error_type, self.call_stack)
+        set_name = parameters[to_index + 4:].strip()
+        if set_name not in self.variables:
+            fail(f"The set '{set_name}' does not exist in the current scope.", self.error_type, self.call_stack)
+        if type(self.variables[set_name]) != Set:
+            fail("Values can only be added to sets.", self.error_type, self.call_stack)
+        value_expression = parameters[:to_index].strip()
+        value = Expression(value_expression, self.call_stack, self.variables).get_set_value(value_expression)
+        self.variables[set_name].add(value)
+        return statement.index
+
+
+    def execute_remove(self, statement):
+        function = statement.function
+        parameters = self.resolve_function_calls(statement.parameters)
+        parameters = " " + parameters
+        if " from " not in parameters:
+            fail(f"'{function}' operation missing 'from' keyword.", self.error_type, self.call_stack)
+        required_tokens = 2
+        parameter_tokens = parameters.split(" from ")
+        if " into " in parameters:
+            required_tokens = 3
+            parameter_tokens = parameter_tokens[:-1] + parameter_tokens[-1].split(" into ")
+            variable = parameter_tokens[-1]
+        if len(parameter_tokens) != required_tokens:
+            fail(f"The '{function}' function must contain one instance of the 'from' keyword and may contain one instance of the 'into' keyword.", self.error_type, self.call_stack)
+        array = parameter_tokens[1].strip()
+        if array not in self.variables:
+            fail(f"The array '{array}' does not exist in the current scope.", self.error_type, self.call_stack)
+        if function == "remove" and type(self.variables[array]) == dict:
+            removed_value = self.remove_map_element(parameter_tokens[0], array)
+        elif function == "remove" and type(self.variables[array]) == Set:
+            removed_value = self.remove_set_value(parameter_tokens[0], array)
         else:
+            removed_value = self.remove_array_element(function, parameter_tokens[0], array)
+        if required_tokens == 3:
+            setter = Setter(parameters, self.call_stack, self.variables, self.functions)
+            if setter.is_variable_name_valid(variable) == True:
+                self.variables[variable] = removed_value
+        return statement.index
+
+
+    def remove_array_element(self, function, index_expression, array):
+        array_object = self.variables[array]
+        if is_array(array_object) == False:
+            fail(f"Elements may only be removed from arrays.", self.error_type, self.call_stack)
+        if len(array_object) == 0:
+            fail(f"Elements cannot be removed from array '{array}' because it is empty.", self.error_type, self.call_stack)
+        if function != "remove" and index_expression.strip() != '':
+            fail(f"The '{function}' function was given too many arguments.", self.error_type, self.call_stack)
+        if function == "pop" or function == "removeFirst":
+            removed_value = array_object[0]
+            self.variables[array] = array_object.without_first()
+        elif function == "removeLast":
+            removed_value = array_object[-1]
+            self.variables[array] = array_object.without_last()
+        elif function == "remove":
+            index = Expression(index_expression, self.call_stack, self.variables).evaluate()
+            if type(index) != int:
+                fail(f"Array index '{index_expression}' is not an integer. Array index must be an integer.", self.error_type, self.call_stack)
             try:
-                function_name = function.split("(")[0]
-                if function_name in self.functions:
-                    self.execute_function(function, parameters, function_name, line_number)
-                    return line_number
-                else:
-                    raise Exception
-            except Exception:
-                fail("Unknown function.", self.error_type, call_stack)
+                removed_value = array_object[index]
+                del array_object[index]
+            except:
+                fail(f"Array index '{index_expression}' is out of range for array '{array}'.", self.error_type, self.call_stack)
+        return removed_value
+
+
+    def remove_map_element(self, key_expression, map_name):
+        key_expression = key_expression.strip()
+        key = Expression(key_expression, self.call_stack, self.variables).get_map_key(key_expression)
+        if key not in self.variables[map_name]:
+            fail(f"The key '{key_expression}' does not exist in map '{map_name}'.", self.error_type, self.call_stack)
+        return self.variables[map_name].pop(key)
+
+
+    def remove_set_value(self, value_expression, set_name):
+        value_expression = value_expression.strip()
+        value = Expression(value_expression, self.call_stack, self.variables).get_set_value(value_expression)
+        if value not in self.variables[set_name]:
+            fail(f"The value '{value_expression}' does not exist in set '{set_name}'.", self.error_type, self.call_stack)
+        self.variables[set_name].remove(value)
+        return value
+
+
+    def execute_merge(self, statement):
+        function = statement.function
+        parameters = self.resolve_function_calls(statement.parameters)
+        if " into " not in parameters:
+            fail(f"'{function}' operation missing 'into' keyword.", self.error_type, self.call_stack)
+        parameter_tokens = parameters.split(" into ")
+        if len(parameter_tokens) != 2:
+            fail(f"The '{function}' function may only contain one instance of the 'into' keyword.", self.error_type, self.call_stack)
+        from_array = Expression(parameter_tokens[0].strip(), self.call_stack, self.variables).evaluate()
+        into_array = parameter_tokens[-1].strip()
+        if into_array not in self.variables:
+            fail(f"The array '{into_array}' does not exist in the current scope.", self.error_type, self.call_stack)
+        if is_array(from_array) == False:
+            fail(f"Only arrays can be merged. {from_array} is not an array", self.error_type, self.call_stack)
+        if is_array(self.variables[into_array]) == False:
+            fail(f"Only arrays can be merged. {into_array} is not an array", self.error_type, self.call_stack)
+        if type(self.variables[into_array]) == NumberArray:
+            for value in from_array:
+                if is_number(value) == False:
+                    fail(f"Only numbers can be merged into the number array '{into_array}'.", self.error_type, self.call_stack)
+        self.variables[into_array].extend(from_array)
+        return statement.index
+
+
+    def execute_sort(self, statement):
+        parameters = statement.parameters
+        if parameters not in self.variables:
+            fail(f"Array to sort must be stored in a variable. '{parameters}' is not a variable", self.error_type, self.call_stack)
+        if is_array(self.variables[parameters]) == False:
+            fail(f"Only arrays can be sorted. '{parameters}'' is not an array", self.error_type, self.call_stack)
+        if statement.function == "sort":
+            self.variables[parameters].sort()
+        else:
+            self.variables[parameters].sort(reverse=True)
+        return statement.index
+
+
+    def execute_sleep(self, statement):
+        self.performed_io = True
+        parameters = self.resolve_function_calls(statement.parameters)
+        seconds = Expression(parameters, self.call_stack, self.variables).evaluate()
+        if type(seconds) == int or type(seconds) == float:
+            time.sleep(seconds)
+        else:
+            fail("Number of seconds to sleep for must be a number.", self.error_type, self.call_stack)
+        return statement.index
+
 
+    def execute_exit(self, statement):
+        sys.exit(0)
 
-    def function_cleanup(self):
+
+    def execute_call(self, statement):
+        try:
+            function_name = statement.function.split("(")[0]
+            if function_name in self.functions:
+                self.execute_function(statement.function, statement.parameters, function_name)
+                return statement.index
+            else:
+                raise Exception
+        except Exception:
+            fail("Unknown function.", self.error_type, self.call_stack)
+
+
+    # "f(x)" and "set x to f(x)" run f in a frame on the frame stack instead of in nested
+    # Python frames, so recursion through them is only bounded by the recursion limit.
+    def enter_call(self, statement):
+        try:
+            function_name = statement.function.split("(")[0]
+            if function_name in self.functions:
+                return self.enter_call_frame(statement, statement.function, statement.parameters, function_name)
+            else:
+                raise Exception
+        except Exception:
+            fail("Unknown function.", self.error_type, self.call_stack)
+
+
+    def enter_set(self, statement):
+        parameters = statement.parameters
+        value_start = parameters.find(" ") + 4
+        call = None
+        if parameters[value_start - 4:value_start] == " to ":
+            call = self.get_single_call(parameters[value_start:])
+        if call == None:
+            self.execute(statement)
+            return None
+        function_name, function_parameters = call
+        return self.enter_call_frame(statement, function_name + function_parameters, "", function_name)
+
+
+    def enter_call_frame(self, statement, function, parameters, function_name):
+        call = self.enter_function(function, parameters, function_name)
+        if call == None:
+            self.finish_call(statement, function_name)
+            return None
+        function_body = self.functions[function_name].function_body
+        return CallFrame(statement, call, len(self.call_stack.get_stack()), function_name, function_body)
+
+
+    def finish_call(self, statement, function_name):
+        if statement.kind == "set":
+            return_value = self.stringify_return_value(self.functions[function_name].return_value)
+            parameters = statement.parameters
+            self.set_variable(parameters[:parameters.find(" ") + 4] + return_value)
+        self.unbind_return_values(self.recursion_depth)
+
+
+    def function_cleanup(self, variables):
+        self.unbind_return_values(self.recursion_depth)
         self.recursion_depth -= 1
-        self.call_stack.pop()
-        if self.recursion_depth == 0:
-            self.variables = self.variables_out_of_scope
+        self.function_call_stack.pop()
+        self.variables = variables
 
 
-    def resolve_function_calls(self, parameters, line_number):
+    def resolve_function_calls(self, parameters):
         if len(parameters) == 0:
             return parameters
+        self.unbind_return_values(self.recursion_depth)
         expression = Expression(parameters, self.call_stack, self.variables)
-        parameter_tokens = expression.parse_expression(parameters, [])
+        parameter_tokens = expression.tokenize(parameters)
         function_calls = self.get_functions(parameter_tokens)
-        parameter_tokens = self.execute_functions(function_calls, parameter_tokens, line_number)
+        parameter_tokens = self.execute_functions(function_calls, parameter_tokens)
         return ' '.join(parameter_tokens)
 
+    # Only call sites whose name is a defined function are kept. Names are looked up in
+    # self.functions, so the cost of a statement does not depend on how many functions exist.
     def get_functions(self, parameter_tokens):
         function_calls = []
         for token in parameter_tokens:
-            for function in self.functions:
-                if function in token:
-                    token = token.strip("<").strip(">")
-                    if token[0] == "(" or token[0] == "[":
-                        specialized_expression_functions = self.get_functions_from_specialized_expression(token, function)
-                        for specialized_token in specialized_expression_functions:
-                            function_calls += [specialized_token]
-                    else:
-                        token = token.strip(",")
-                        function_calls += [token]
+            for function_name, function_call in self.get_call_sites(token):
+                if function_name in self.functions:
+                    function_calls.append((function_name, function_call))
         return function_calls
 
-    def get_functions_from_specialized_expression(self, expression, function):
-        parameter_tokens = expression.split(function)
-        functions = []
-        for token in parameter_tokens:
-            if token.count("(") <= token.count(")") and token.count("(") >= 1:
-                left_count = 0
-                right_count = 0
-                function_parameter = ""
-                for char in token:
-                    if char == "(":
-                        left_count += 1
-                    if char == ")":
-                        right_count += 1
-                    function_parameter += char
-                    if right_count == left_count:
-                        break 
-                if function_parameter[0] == "(":
-                    functions += [function + function_parameter]
-        parameter_tokens = expression.split(f" {function}")
-        for token in parameter_tokens:
-            token = token.strip().strip("(").strip("[")
-            if token[-4:] == "type":
-                functions += function
-        return functions
 
-    
-    def execute_functions(self, function_calls, parameter_tokens, line_number):
+    # Call sites are found once per token and cached, since functions may be defined after a
+    # statement is parsed but the places where a token could call a function never change.
+    def get_call_sites(self, token):
+        call_sites = call_site_cache.get("Interpreter", token)
+        if call_sites == None:
+            stripped_token = token.strip("<").strip(">")
+            if len(stripped_token) == 0:
+                call_sites = ()
+            elif stripped_token[0] == "(" or stripped_token[0] == "[" or stripped_token[0] == "{":
+                call_sites = self.get_call_sites_from_specialized_expression(stripped_token)
+            else:
+                function_call = stripped_token.strip(",")
+                call_sites = ((function_call.split("(")[0], function_call),)
+            call_site_cache.put("Interpreter", token, call_sites)
+        return call_sites
+
+
+    def get_call_sites_from_specialized_expression(self, expression):
+        call_sites = []
+        expression_length = len(expression)
+        name_start = 0
+        while name_start < expression_length:
+            if self.is_name_character(expression[name_start]) == False:
+                name_start += 1
+                continue
+            name_end = name_start
+            while name_end < expression_length and self.is_name_character(expression[name_end]):
+                name_end += 1
+            function_name = expression[name_start:name_end]
+            if name_end < expression_length and expression[name_end] == "(":
+                parameters_end = self.find_closing_parenthesis(expression, name_end)
+                if parameters_end != -1:
+                    call_sites.append((function_name, function_name + expression[name_end:parameters_end + 1]))
+            elif expression[:name_start].rstrip().endswith("type"):
+                call_sites.append((function_name, function_name))
+            name_start = name_end
+        return tuple(call_sites)
+
+
+    def is_name_character(self, char):
+        return char.isalnum() or char == "_"
+
+
+    def find_closing_parenthesis(self, expression, start):
+        depth = 0
+        for i in range(start, len(expression), 1):
+            if expression[i] == "(":
+                depth += 1
+            elif expression[i] == ")":
+                depth -= 1
+                if depth == 0:
+                    return i
+        return -1
+
+
+    def execute_functions(self, function_calls, parameter_tokens):
         parameter_tokens_length = len(parameter_tokens)
         for i in range(0, parameter_tokens_length, 1):
-            for function_call in function_calls:
+            for function_name, function_call in function_calls:
                 if parameter_tokens[i][0] == '"' and parameter_tokens[i][-1] == '"':
                     pass
-                elif function_call.split("(")[0] not in self.functions:
-                    pass
                 elif function_call in parameter_tokens[i] and "(" not in function_call and "type" in parameter_tokens[i]:
                     parameter_tokens[i] = ' '.join(parameter_tokens[i].split())
                     parameter_tokens[i] = parameter_tokens[i].replace(f"type {function_call}", "@Type:Function")
                 elif function_call in parameter_tokens[i] and parameter_tokens[i-1] != "type":
-                    function_name = function_call.split("(")[0]
-                    self.execute_function(function_call, "", function_name, line_number)
-                    return_value = self.functions[function_name].return_value
-                    if type(return_value) == list:
-                        p = Printer("print", "", self.call_stack, self.variables)
-                        return_value = p.stringify_array(return_value)
-                    e = Expression("", self.call_stack, self.variables)
-                    if e.is_value_type(return_value):
-                        return_value = e.create_string_representation_of_type(return_value)
-                    return_value = str(return_value)
-                    if return_value == "True" or return_value == "False":
-                        return_value = return_value.lower()
+                    self.execute_function(function_call, "", function_name)
+                    return_value = self.stringify_return_value(self.functions[function_name].return_value)
                     parameter_tokens[i] = parameter_tokens[i].replace(function_call, return_value)
                 elif function_call in parameter_tokens[i] and parameter_tokens[i-1] == "type":
                     i -= 1
@@ -604,88 +913,179 @@ class Interpreter:
         return parameter_tokens
 
 
-    def execute_function(self, function, parameters, function_name, line_number):
+    # Strings and arrays are bound to a name in the current scope instead of being written into the
+    # expression, so a call costs the same whatever the size of its result. The name cannot be
+    # used as a variable name and includes the recursion depth, so calls made while the callee runs
+    # cannot overwrite it. Other values are short and are written out as before.
+    def stringify_return_value(self, return_value):
+        if type(return_value) == str or is_array(return_value) or type(return_value) == dict or type(return_value) == Set:
+            return self.bind_return_value(return_value)
+        e = Expression("", self.call_stack, self.variables)
+        if e.is_value_type(return_value):
+            return_value = e.create_string_representation_of_type(return_value)
+        return_value = str(return_value)
+        if return_value == "True" or return_value == "False":
+            return_value = return_value.lower()
+        return return_value
+
+
+    def bind_return_value(self, return_value):
+        if self.recursion_depth not in self.bound_return_values:
+            self.bound_return_values[self.recursion_depth] = (self.variables, [])
+        variables, names = self.bound_return_values[self.recursion_depth]
+        name = "_" + str(self.recursion_depth) + "_" + str(len(names))
+        variables[name] = return_value
+        names.append(name)
+        return name
+
+
+    def unbind_return_values(self, depth):
+        if depth in self.bound_return_values:
+            variables, names = self.bound_return_values.pop(depth)
+            for name in names:
+                variables.pop(name, None)
+
+
+    # Calls made inside expressions run in nested Python frames, so there can only be as many of
+    # them at once as the Python recursion limit allows.
+    def execute_function(self, function, parameters, function_name):
+        call = self.enter_function(function, parameters, function_name)
+        if call == None:
+            return
+        self.nested_calls += 1
+        if self.nested_calls > self.nested_call_limit:
+            fail("Maximum recursion depth exceeded." , self.error_type, self.call_stack)
+        self.run_function(self.functions[function_name])
+        if self.tail_call != None:
+            self.run_tail_calls(function_name)
+        self.nested_calls -= 1
+        self.leave_function(call)
+
+
+    # Returns None when the call was answered without running the function body.
+    def enter_function(self, function, parameters, function_name):
         function_name_length = len(function_name)
         if function_name_length == len(function):
             fail(f"'{function}' is an incomplete function call. Function call systax: 'myFunction(param1, param2)'" , self.error_type, self.call_stack)
-        if function[function_name_length] == "(":
-            function_parameters = function[function_name_length:] + parameters
-            self.functions[function_name].populate_variables(function_parameters)
-            if self.recursion_depth == 0:
-                self.variables_out_of_scope = self.variables
-            self.variables = self.functions[function_name].function_variables
-            self.recursion_depth += 1
-            if self.recursion_depth == self.recursion_limit:
-                fail("Maximum recursion depth exceeded." , self.error_type, self.call_stack)
-            self.function_call_stack.push(function_name)
-            start_line = self.functions[function_name].function_start + 1
-            function_body = self.functions[function_name].function_body
-            function_call_line = self.repl_counter
-            in_if_chain_tmp = self.in_if_chain
-            looking_for_else_tmp = self.looking_for_else
-            in_nested_repl_tmp = self.in_nested_repl
-            self.in_if_chain = False
-            self.looking_for_else = False
-            self.in_nested_repl = False
-            if self.script_name == "REPL":
-                self.repl_counter = start_line
-                self.run_script(function_body, None)
-            else:
-                self.run_script(function_body, start_line)
-            self.in_if_chain = in_if_chain_tmp
-            self.looking_for_else = looking_for_else_tmp
-            self.in_nested_repl = in_nested_repl_tmp
-            if self.script_name == "REPL":
-                self.repl_counter = line_number
-            self.repl_counter = function_call_line
+        if function[function_name_length] != "(":
+            return None
+        function_parameters = function[function_name_length:] + parameters
+        frame = self.functions[function_name].create_frame(function_parameters, self.variables)
+        if self.functions[function_name].inline_return != None and self.run_inline_function(self.functions[function_name], frame):
+            return None
+        cache_key = None
+        if self.functions[function_name].cached == True:
+            cache_key = self.functions[function_name].get_cache_key(frame)
+        if cache_key != None:
+            return_value = function_cache.get(self.functions[function_name], cache_key)
+            if return_value != None:
+                self.functions[function_name].return_value = return_value
+                return None
+            self.functions[function_name].return_value = None
+        performed_io = self.performed_io
+        self.performed_io = False
+        caller_variables = self.variables
+        if self.recursion_depth == 0:
+            self.variables_out_of_scope = self.variables
+        self.variables = frame
+        self.recursion_depth += 1
+        if self.recursion_depth > self.recursion_limit:
+            fail("Maximum recursion depth exceeded." , self.error_type, self.call_stack)
+        self.function_call_stack.push(function_name)
+        return (function_name, caller_variables, performed_io, cache_key)
+
+
+    def leave_function(self, call):
+        function_name, caller_variables, performed_io, cache_key = call
+        self.function_cleanup(caller_variables)
+        # results are only cached when nothing the call ran, including other functions, performed io
+        if cache_key != None and self.performed_io == False:
+            self.cache_return_value(self.functions[function_name], cache_key)
+        self.performed_io = self.performed_io or performed_io
 
 
-    def get_nested_code(self, start_line):
-        nestable_lines = []
+    # The returned expression is evaluated directly in the frame of the call. The return statement
+    # is pushed to the call stack so errors are traced as if the function had been called.
+    def run_inline_function(self, function, frame):
+        statement = function.inline_return
+        self.call_stack.push(statement)
+        e = Expression(statement.parameters, self.call_stack, frame)
+        parameter_tokens = e.tokenize(statement.parameters)
+        if len(self.get_functions(parameter_tokens)) > 0:
+            self.call_stack.pop()
+            return False
+        e = Expression(' '.join(parameter_tokens), self.call_stack, frame)
+        function.return_value = e.evaluate()
+        self.call_stack.pop()
+        return True
+
+
+    def cache_return_value(self, function, cache_key):
+        return_value = function.return_value
+        if return_value != None and is_array(return_value) == False and type(return_value) != dict and type(return_value) != Set:
+            function_cache.put(function, cache_key, return_value)
+
+
+    # Tail calls reuse the depth of the call that made them, so tail recursion runs in constant
+    # stack. Only the most recent tail call statement is kept in the call stack for traces.
+    def run_tail_calls(self, function_name):
+        call_stack = self.call_stack.get_stack()
+        call_stack.append(None)
+        while self.tail_call != None:
+            tail_call_name, statement = self.start_tail_call()
+            call_stack[-1] = statement
+            self.run_function(self.functions[tail_call_name])
+        call_stack.pop()
+        self.functions[function_name].return_value = self.functions[tail_call_name].return_value
+
+
+    def start_tail_call(self):
+        tail_call_name, frame, statement = self.tail_call
+        self.tail_call = None
+        self.unbind_return_values(self.recursion_depth)
+        self.function_call_stack.pop()
+        self.function_call_stack.push(tail_call_name)
+        self.variables = frame
+        return tail_call_name, statement
+
+
+    def run_function(self, function):
+        if self.native_runtime != None:
+            self.native_runtime.run_function(function)
+        else:
+            self.run_function_body(function.function_body)
+
+
+    def run_function_body(self, function_body):
+        if len(function_body) > 0:
+            self.run_statements(function_body[0].program, function_body[0].index, function_body[-1].index + 1)
+
+
+    def get_repl_nested_code(self):
+        nested_lines = []
         required_end_count = 1
         end_count = 0
 
-        if self.script_name == "REPL" and self.in_nested_repl == False:
-            while(True):
-                self.repl_counter += 1
-                line_raw = input("| " + str(self.repl_counter+1) + "    ~ ") + "\n"
-                if line_raw.strip()[:2] == "if":
-                    required_end_count += 1
-                elif line_raw.strip()[:3] == "for":
-                    required_end_count += 1
-                elif line_raw.strip()[:5] == "while":
-                    required_end_count += 1
-                elif line_raw.strip()[:6] == "repeat":
-                    required_end_count += 1
-                elif line_raw.strip() == "end":
-                    end_count += 1
-                elif line_raw.strip()[:8] == "function":
-                    line = Line(line_raw, self.repl_counter, "REPL")
-                    self.call_stack.push(line)
-                    fail("A function cannot be defined inside a nestable." , self.error_type, self.call_stack)
-                if required_end_count == end_count:
-                    nestable_lines.append(line_raw)
-                    return nestable_lines
-                nestable_lines.append(line_raw)
-
-        line_count = len(self.lines)
-        for i in range(start_line,line_count,1):
-            line_raw = self.lines[i]
-            if line_raw.strip()[:2] == "if":
-                required_end_count += 1
-            elif line_raw.strip()[:3] == "for":
-                required_end_count += 1
-            elif line_raw.strip()[:5] == "while":
-                required_end_count += 1
-            elif line_raw.strip()[:6] == "repeat":
+        while(True):
+            self.repl_counter += 1
+            line_raw = input("| " + str(self.repl_counter+1) + "    ~ ") + "\n"
+            statement = Statement(line_raw, self.repl_counter, "REPL")
+            if statement.opens_block():
                 required_end_count += 1
-            elif line_raw.strip() == "end":
+            elif statement.kind == "end":
                 end_count += 1
-            elif line_raw.strip()[:8] == "function":
-                line = Line(line_raw, i + self.repl_counter, self.script_name)
-                self.call_stack.push(line)
+            elif statement.kind == "function":
+                self.call_stack.push(statement)
                 fail("A function cannot be defined inside a nestable." , self.error_type, self.call_stack)
+            nested_lines.append(line_raw)
             if required_end_count == end_count:
-                return nestable_lines
-            nestable_lines.append(line_raw)
-        fail("Missing end to nestable.", self.error_type, self.call_stack)
\ No newline at end of file
+                return nested_lines
+
+
+    def get_block_end(self, statement):
+        if statement.nested_function != None:
+            self.call_stack.push(statement.nested_function)
+            fail("A function cannot be defined inside a nestable." , self.error_type, self.call_stack)
+        if statement.end == None:
+            fail("Missing end to nestable.", self.error_type, self.call_stack)
+        return statement.end
@@ -3,13 +3,17 @@
 
 import sys
 import platform
-from Interpreter import Interpreter
+from Interpreter import Interpreter, default_recursion_limit
+from core.TokenCache import token_cache, program_cache, call_site_cache, function_cache, default_token_cache_size, default_function_cache_size
 
 name = "OctaneScript"
 version = "Alpha DEV"
 file_extension = ".os"
 maintainer = "lcarcaramo@gmail.com"
 project_home = "https://github.com/leonard112/OctaneScript"
+recursion_limit = default_recursion_limit
+show_cache_stats = False
+dump_optimized = False
 
 def print_info():
     print(
@@ -60,20 +64,50 @@ def print_help():
 usage:
     <no arguments>       Open REPL
     script_name%s       Run an %s program.
+    --native script_name%s
+                         Run an %s program compiled to Python code.
+    --recursion-limit n  Allow functions to recurse n calls deep (default %s).
+    --token-cache-size n
+                         Keep up to n tokenized and compiled expressions and call sites cached (default %s).
+    --function-cache-size n
+                         Keep up to n results of cached functions (default %s).
+    --cache-stats        Print cache hits, misses and evictions after running.
+    --dump-optimized     Print the program after constant folding instead of running it.
+                         Options must come before the other arguments.
     --version -v         Print %s version information.
     --info -i            Print information about your %s installation.
     --license -l         Show license information.
     --help -h            Get usage information.
-""" % (file_extension, name, name, name)
+""" % (file_extension, name, file_extension, name, default_recursion_limit, default_token_cache_size, default_function_cache_size, name, name)
 )
 
 
 def perform_operation_based_on_arguments(arguments):
-    if len(arguments) == 1:
+    global recursion_limit, show_cache_stats, dump_optimized
+    if len(arguments) > 2 and arguments[1] == "--recursion-limit" and arguments[2].isdigit() and int(arguments[2]) > 0:
+        recursion_limit = int(arguments[2])
+        perform_operation_based_on_arguments(arguments[:1] + arguments[3:])
+    elif len(arguments) > 2 and arguments[1] == "--token-cache-size" and arguments[2].isdigit():
+        token_cache.resize(int(arguments[2]))
+        program_cache.resize(int(arguments[2]))
+        call_site_cache.resize(int(arguments[2]))
+        perform_operation_based_on_arguments(arguments[:1] + arguments[3:])
+    elif len(arguments) > 2 and arguments[1] == "--function-cache-size" and arguments[2].isdigit():
+        function_cache.resize(int(arguments[2]))
+        perform_operation_based_on_arguments(arguments[:1] + arguments[3:])
+    elif len(arguments) > 1 and arguments[1] == "--cache-stats":
+        show_cache_stats = True
+        perform_operation_based_on_arguments(arguments[:1] + arguments[2:])
+    elif len(arguments) > 1 and arguments[1] == "--dump-optimized":
+        dump_optimized = True
+        perform_operation_based_on_arguments(arguments[:1] + arguments[2:])
+    elif len(arguments) == 1:
         print_info()
         enter_interpreter_as("REPL")
     elif arguments[1][-3:] == file_extension :
         enter_interpreter_as(arguments[1])
+    elif arguments[1] == "--native" and len(arguments) > 2 and arguments[2][-3:] == file_extension:
+        enter_interpreter_as(arguments[2], "native")
     elif arguments[1] == "--version" or arguments[1] == "-v":
         print_version()
     elif arguments[1] == "--info" or arguments[1] == "-i":
@@ -86,10 +120,17 @@ def perform_operation_based_on_arguments(arguments):
         print_help()
 
 
-def enter_interpreter_as(entrypoint):
-    sys.setrecursionlimit(10**6)
-    interpreter = Interpreter(entrypoint)
-    interpreter.run()
+def enter_interpreter_as(entrypoint, execution_mode="interpreter"):
+    interpreter = Interpreter(entrypoint, execution_mode, recursion_limit)
+    interpreter.dump_optimized = dump_optimized
+    try:
+        interpreter.run()
+    finally:
+        if show_cache_stats == True:
+            print(token_cache.get_stats(), file=sys.stderr)
+            print(program_cache.get_stats(), file=sys.stderr)
+            print(call_site_cache.get_stats(), file=sys.stderr)
+            print(function_cache.get_stats(), file=sys.stderr)
 
 
 if __name__ == '__main__':
@@ -50,6 +50,12 @@ reserved = [
     "append", "push", "prepend", "removeFirst", "removeLast", "remove"
     "peek", "start", "end", "first", "last", "merge", "into", "sort", "sortReverse",
 
+    # MAPS
+    "put", "contains",
+
+    # SETS
+    "add", "union", "intersection", "difference",
+
     # GENERAL
     "type"
 ]
\ No newline at end of file
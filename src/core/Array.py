@@ -0,0 +1,303 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+from array import array
+
+integer_limit = 2 ** 63
+prepend_space = 8
+compact_after = 16
+
+
+def is_array(value):
+    return type(value) == Array or type(value) == list or type(value) == NumberArray
+
+
+def is_number(value):
+    return type(value) == int or type(value) == float
+
+
+def as_list(value):
+    if type(value) == Array:
+        return value.buffer.values[value.start:value.stop]
+    if type(value) == NumberArray:
+        return list(value)
+    return value
+
+
+# Arrays are ordered by their first differing value, so only the values up to one past the
+# length of the shorter array are copied to compare them.
+def comparable(value, other):
+    length = min(len(value), len(other)) + 1
+    if type(value) == Array:
+        return value.buffer.values[value.start:min(value.start + length, value.stop)]
+    return as_list(value[:length])
+
+
+# A buffer of values and the number of arrays that see them.
+class Buffer:
+    def __init__ (self, values):
+        self.values = values
+        self.views = 0
+
+
+# Arrays see the values of a buffer between start and stop. Removing the first or last value
+# creates a new array over the same buffer, so it takes constant time and variables and loops
+# that refer to the old array still see every value, like when arrays were copied without the
+# value. Values can be added after the end of the buffer without changing the arrays sharing it.
+# Any other change first gives the array its own copy of the values if the buffer is shared.
+class BufferedArray:
+    __slots__ = ("buffer", "start", "stop")
+
+    def __init__ (self, values=()):
+        self.attach(Buffer(self.empty_values()), 0, 0)
+        self.extend(values)
+
+
+    def attach(self, buffer, start, stop):
+        self.buffer = buffer
+        self.start = start
+        self.stop = stop
+        buffer.views += 1
+
+
+    def __del__(self):
+        self.buffer.views -= 1
+
+
+    def view(self, start, stop):
+        array_object = type(self).__new__(type(self))
+        array_object.attach(self.buffer, start, stop)
+        return array_object
+
+
+    def copy(self, start, stop):
+        array_object = type(self).__new__(type(self))
+        array_object.attach(Buffer(self.buffer.values[start:stop]), 0, stop - start)
+        return array_object
+
+
+    # Gives the array a buffer of its own with space for space values before the first one.
+    def own(self, space=0):
+        values = self.buffer.values
+        if space == 0 and self.buffer.views == 1:
+            del values[self.stop:]
+            return
+        own_values = self.padding(values, space) + values[self.start:self.stop]
+        self.buffer.views -= 1
+        self.attach(Buffer(own_values), space, space + self.stop - self.start)
+
+
+    def append(self, value):
+        if self.stop != len(self.buffer.values):
+            self.own()
+        self.buffer.values.append(value)
+        self.stop += 1
+
+
+    def appendleft(self, value):
+        if self.start == 0 or self.buffer.views > 1:
+            self.own(max(prepend_space, len(self)))
+        self.start -= 1
+        self.buffer.values[self.start] = value
+
+
+    def extend(self, values):
+        if is_array(values):
+            values = self.values_of(values)
+        if self.stop != len(self.buffer.values):
+            self.own()
+        self.buffer.values.extend(values)
+        self.stop = len(self.buffer.values)
+
+
+    # The values in front of start are only kept while they are fewer than the rest of the
+    # buffer, so draining an array from the front does not keep every value it held.
+    def without_first(self):
+        start = self.start + 1
+        if start >= compact_after and start * 2 >= len(self.buffer.values):
+            return self.copy(start, self.stop)
+        return self.view(start, self.stop)
+
+
+    def without_last(self):
+        return self.view(self.start, self.stop - 1)
+
+
+    def sort(self, reverse=False):
+        self.own()
+        values = self.buffer.values
+        ordered = self.padding(values, 0)
+        ordered.extend(sorted(values[self.start:self.stop], reverse=reverse))
+        values[self.start:self.stop] = ordered
+
+
+    def position(self, index):
+        length = self.stop - self.start
+        if index < 0:
+            index += length
+        if index < 0 or index >= length:
+            raise IndexError("array index out of range")
+        return self.start + index
+
+
+    def __getitem__(self, index):
+        if type(index) != slice:
+            return self.read(self.buffer.values[self.position(index)])
+        start, stop, step = index.indices(len(self))
+        if step == 1:
+            return self.copy(self.start + start, self.start + max(start, stop))
+        values = self.buffer.values[self.start + start:self.start + stop:step]
+        array_object = type(self).__new__(type(self))
+        array_object.attach(Buffer(values), 0, len(values))
+        return array_object
+
+
+    def __delitem__(self, index):
+        index = self.position(index) - self.start
+        self.own()
+        del self.buffer.values[self.start + index]
+        self.stop -= 1
+
+
+    # Iterating sees values added or removed in place while iterating, like iterating over a list.
+    def __iter__(self):
+        i = 0
+        while i < self.stop - self.start:
+            yield self.read(self.buffer.values[self.start + i])
+            i += 1
+
+
+    def __len__(self):
+        return self.stop - self.start
+
+
+    def __contains__(self, value):
+        return value in self.buffer.values[self.start:self.stop]
+
+
+    def __repr__(self):
+        return repr(as_list(self))
+
+
+    def __eq__(self, other):
+        if is_array(other) == False:
+            return NotImplemented
+        return len(self) == len(other) and as_list(self) == as_list(other)
+
+
+    def __ne__(self, other):
+        if is_array(other) == False:
+            return NotImplemented
+        return len(self) != len(other) or as_list(self) != as_list(other)
+
+
+    def __lt__(self, other):
+        if is_array(other) == False:
+            return NotImplemented
+        return comparable(self, other) < comparable(other, self)
+
+
+    def __le__(self, other):
+        if is_array(other) == False:
+            return NotImplemented
+        return comparable(self, other) <= comparable(other, self)
+
+
+    def __gt__(self, other):
+        if is_array(other) == False:
+            return NotImplemented
+        return comparable(self, other) > comparable(other, self)
+
+
+    def __ge__(self, other):
+        if is_array(other) == False:
+            return NotImplemented
+        return comparable(self, other) >= comparable(other, self)
+
+
+    __hash__ = None
+
+
+class Array(BufferedArray):
+    __slots__ = ()
+
+    def empty_values(self):
+        return []
+
+
+    def padding(self, values, length):
+        return [None] * length
+
+
+    def values_of(self, values):
+        return as_list(values)
+
+
+    def read(self, value):
+        return value
+
+
+    def __add__(self, other):
+        if is_array(other) == False:
+            return NotImplemented
+        return Array(as_list(self) + as_list(other))
+
+
+    def __radd__(self, other):
+        if is_array(other) == False:
+            return NotImplemented
+        return Array(as_list(other) + as_list(self))
+
+
+# Number arrays store numbers in a contiguous buffer instead of as separate objects. Values are
+# stored as 64 bit integers until a decimal, or an integer that does not fit in 64 bits, is added.
+# Then the whole buffer is converted to 64 bit decimals, and whole decimals are read back as
+# integers like the results of math expressions. Only numbers can be stored, which is checked
+# before values are added.
+class NumberArray(BufferedArray):
+    __slots__ = ()
+
+    def empty_values(self):
+        return array("q")
+
+
+    def padding(self, values, length):
+        return array(values.typecode, [0]) * length
+
+
+    def values_of(self, values):
+        if type(values) == NumberArray:
+            values = values.buffer.values[values.start:values.stop]
+            if values.typecode == "d":
+                self.promote(0.0)
+            if values.typecode == self.buffer.values.typecode:
+                return values
+            return values.tolist()
+        values = as_list(values)
+        for value in values:
+            self.promote(value)
+        return values
+
+
+    def append(self, value):
+        self.promote(value)
+        BufferedArray.append(self, value)
+
+
+    def appendleft(self, value):
+        self.promote(value)
+        BufferedArray.appendleft(self, value)
+
+
+    def promote(self, value):
+        if self.buffer.values.typecode == "d":
+            return
+        if type(value) == float or value >= integer_limit or value < -integer_limit:
+            self.own()
+            self.buffer.values = array("d", self.buffer.values)
+
+
+    def read(self, value):
+        if type(value) == float and value.is_integer():
+            return int(value)
+        return value
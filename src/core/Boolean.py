@@ -4,7 +4,10 @@
 import core.Expression
 from core.NestableExpression import NestableExpression
 import core.Printer
-from core.Fail import fail
+from core.Fail import fail, try_silently
+from core.TypedFrame import TypedFrame
+from core.Array import is_array
+from core.Set import Set
 
 class Boolean(NestableExpression):
     def __init__ (self, expression, call_stack, variables):
@@ -15,52 +18,161 @@ class Boolean(NestableExpression):
         self.left_enclosing_symbol = "["
         self.error_type = "Boolean Error"
         self.symbols = ["[", "]", "lessThanEquals", "greaterThanEquals", "lessThan", "greaterThan", 
-                        "equals", "notEquals", "and", "or", "true", "false"]
+                        "equals", "notEquals", "contains", "and", "or", "true", "false"]
 
 
     def evaluate(self):
         if self.expression[0] != "[" or self.expression[-1] != "]":
             fail("Extra or missing brackets.", self.error_type, self.call_stack)
-        result = self.evaluate_nestable_expression(self.parse_expression(self.expression, []), 
-                                                 self.perform_operation)[0].lower()
+        result = self.run(self.compile(self.expression)).lower()
         if result == "false":
             return False
         else:
             return True
 
-    
-    def perform_operation(self, tokens):
+
+    def try_evaluate(self):
+        return try_silently(self.evaluate)
+
+
+    # Steps are run on demand starting from the result, so the right operand of "and" and "or"
+    # is skipped when the left operand already decides the answer. Only comparisons are skipped,
+    # since they always give a boolean and so cannot make the operation fail on differing types.
+    def run(self, program):
+        last_step = program[-1]
+        if last_step[0] == "fail":
+            for index in range(len(program) - 1):
+                self.run_step(program, index)
+            fail(last_step[1], self.error_type, self.call_stack)
+        return str(self.run_step(program, last_step[1]))
+
+
+    def run_step(self, program, index):
+        step = program[index]
+        if step[0] == "operation":
+            operator = step[2]
+            if type(operator) == int:
+                operator = str(self.run_step(program, operator))
+            operand_1 = self.resolve_operand(program, step[1])
+            value = self.short_circuit(program, operator, operand_1, step[3])
+            if value == None:
+                operand_2 = self.resolve_operand(program, step[3])
+                value = self.perform_operator(operator, operand_1, operand_2)
+            if value == None:
+                fail("Invalid operation", self.error_type, self.call_stack)
+            return value
+        tokens = [token if type(token) == str else str(self.run_step(program, token)) for token in step[1]]
+        if self.is_valid_answer(tokens) == False:
+            fail("Missing or extra operator.", self.error_type, self.call_stack)
+        return tokens[0]
+
+
+    def compile_operand(self, token):
+        if type(token) == int:
+            return ("step", token)
+        token = token.strip()
+        value = self.resolve_literal(token)
+        if value != None:
+            return ("literal", value)
+        return ("expression", token)
+
+
+    def resolve_operand(self, program, operand):
+        kind = operand[0]
+        if kind == "literal":
+            return operand[1]
+        elif kind == "step":
+            value = self.run_step(program, operand[1])
+            if type(value) == bool:
+                return value
+            return self.resolve(value.strip())
+        if type(self.variables) == TypedFrame and operand[1] in self.variables.number_names:
+            value = self.variables.get(operand[1])
+            if type(value) == int or type(value) == float:
+                return float(value)
+        return self.resolve_expression(operand[1])
+
+
+    def short_circuit(self, program, operator, operand_1, operand_2):
+        if operand_2[0] != "step" or program[operand_2[1]][0] != "operation":
+            return None
+        if type(operand_1) != bool and type(operand_1) != float:
+            return None
+        if operator == "and" and operand_1 == False and type(operand_1) == bool:
+            return False
+        if operator == "or" and (operand_1 == True or type(operand_1) == float):
+            return True
+        return None
+
+
+    def perform_operator(self, operator, token_1, token_2):
         try:
-            token_1 = self.resolve(tokens[0].strip())
-            token_2 = self.resolve(tokens[2].strip())
-            e = core.Expression.Expression("", self.call_stack, self.variables)
-            if e.is_value_type(token_1) or e.is_value_type(token_2):
-                operator = tokens[1]
+            if operator == "contains":
+                return self.perform_contains(token_1, token_2)
+            if self.is_value_type(token_1) or self.is_value_type(token_2):
                 if operator == "equals":
                     return token_1 == token_2
                 elif operator == "notEquals":
                     return token_1 != token_2
                 raise Exception
-            return {
-                'equals' : token_1 == token_2,
-                'lessThan' : token_1 < token_2,
-                'lessThanEquals' : token_1 <= token_2,
-                'greaterThan' : token_1 > token_2,
-                'greaterThanEquals' : token_1 >= token_2,
-                'notEquals' : token_1 != token_2,
-                'and' : self.perform_and_or(token_1, token_2, "and"),
-                'or' : self.perform_and_or(token_1, token_2, "or")
-            }.get(tokens[1], None)
+            if operator == "lessThan":
+                return token_1 < token_2
+            elif operator == "lessThanEquals":
+                return token_1 <= token_2
+            elif operator == "greaterThan":
+                return token_1 > token_2
+            elif operator == "greaterThanEquals":
+                return token_1 >= token_2
+            # maps cannot be ordered, but two maps or two sets can be compared for equality
+            if (type(token_1) == dict and type(token_2) == dict) or (type(token_1) == Set and type(token_2) == Set):
+                if operator == "equals":
+                    return token_1 == token_2
+                elif operator == "notEquals":
+                    return token_1 != token_2
+            # operands that cannot be ordered cannot be compared with any operator
+            token_1 < token_2
+            if operator == "equals":
+                return token_1 == token_2
+            elif operator == "notEquals":
+                return token_1 != token_2
+            elif operator == "and" or operator == "or":
+                return self.perform_and_or(token_1, token_2, operator)
+            return None
         except Exception:
             fail("Differing value types cannot be compared.\n\t\t" +
                  "Operand 1: " + self.stringify_token(token_1) + "\n\t\t" +
                  "Operand 2: " + self.stringify_token(token_2), self.error_type, self.call_stack)
 
 
+    # Strings are resolved to their value wrapped in double quotes, so the quotes are removed
+    # before looking them up in a map or array.
+    def perform_contains(self, container, value):
+        if type(value) == str and len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+            value = value[1:-1]
+        if type(container) == dict or type(container) == Set:
+            if type(value) == str or type(value) == float or type(value) == bool:
+                return value in container
+            return False
+        if is_array(container):
+            return value in container
+        if type(container) == str and len(container) >= 2 and container[0] == '"' and container[-1] == '"':
+            if type(value) == float and value.is_integer():
+                value = int(value)
+            return str(value) in container[1:-1]
+        fail("'contains' can only be used on sets, maps, arrays and strings.\n\t\t" +
+             "Operand 1: " + self.stringify_token(container), self.error_type, self.call_stack)
+
+
+    def is_value_type(self, token):
+        if type(token) != type:
+            return False
+        return core.Expression.Expression("", self.call_stack, self.variables).is_value_type(token)
+
+
     def stringify_token(self, token):
-        if type(token) == list:
+        if is_array(token) or type(token) == dict or type(token) == Set:
             p = core.Printer.Printer("print", "", self.call_stack, self.variables)
-            return p.stringify_array(token)
+            return p.stringify_element(token)
         e = core.Expression.Expression("", self.call_stack, self.variables)
         if e.is_value_type(token):
             return e.create_string_representation_of_type(token)
@@ -80,25 +192,35 @@ class Boolean(NestableExpression):
 
 
     def resolve(self, value):
+        literal = self.resolve_literal(value)
+        if literal != None:
+            return literal
+        return self.resolve_expression(value)
+
+
+    def resolve_literal(self, value):
         value_lower = value.lower()
         if value_lower == "true":
             return True
         elif value_lower == "false":
             return False
-        else:
-            try:
-                return float(value)
-            except:
-                e = core.Expression.Expression(value, self.call_stack, self.variables)
-                value = e.evaluate()
-                if e.is_value_type(value):
-                    return value
-                if type(value) == list:
-                    return value
-                try:
-                    return float(value)
-                except:
-                    return '"' + str(value) + '"'
+        try:
+            return float(value)
+        except:
+            return None
+
+
+    def resolve_expression(self, value):
+        e = core.Expression.Expression(value, self.call_stack, self.variables)
+        value = e.evaluate()
+        if e.is_value_type(value):
+            return value
+        if is_array(value) or type(value) == dict or type(value) == Set:
+            return value
+        try:
+            return float(value)
+        except:
+            return '"' + str(value) + '"'
 
 
     def is_valid_answer(self, tokens):
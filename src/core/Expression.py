@@ -1,13 +1,18 @@
 # This file is licensed under the MIT license.
 # See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
 
-from core.Utilites import suppress_stdout_stderr
 from core.Boolean import Boolean
 from core.Math import Math
-from core.Fail import fail
+from core.Fail import fail, try_silently, failed_evaluation
+from core.TokenCache import token_cache
+from core.Lexer import Lexer
+from core.Array import Array, NumberArray, is_array, is_number
+from core.Set import Set
 from Reserved import reserved
 import types
 
+set_operators = ["union", "intersection", "difference"]
+
 
 class Expression:
     def __init__ (self, expression, call_stack, variables):
@@ -15,6 +20,7 @@ class Expression:
         self.call_stack = call_stack
         self.variables = variables
         self.error_type = "Expression Error"
+        self.cacheable = True
 
 
     def evaluate (self):
@@ -23,15 +29,31 @@ class Expression:
         elif self.expression == "":
             return ""
         elif self.expression == "array":
-            return []
+            return Array()
+        elif self.expression == "map":
+            return {}
+        elif self.expression == "emptySet":
+            return Set()
+        set_operation = None
+        if " union " in self.expression or " intersection " in self.expression or " difference " in self.expression:
+            set_operation = self.find_set_operation(self.expression)
+        if set_operation != None:
+            return self.perform_set_operation(set_operation)
         elif self.expression[0] == "<" and self.expression[-1] == ">":
             return self.build_array(self.expression)
+        elif self.expression[0] == "{" and self.expression[-1] == "}":
+            return self.build_map_or_set(self.expression)
         elif self.expression[0] == "@" and " " not in self.expression:
             return self.get_type(self.expression)
         elif self.expression.split()[0] == "type":
-            return type(Expression(' '.join(self.expression.split()[1:]), self.call_stack, self.variables).evaluate())
-
-        tokens = self.parse_expression(self.expression, [])
+            value_type = type(Expression(' '.join(self.expression.split()[1:]), self.call_stack, self.variables).evaluate())
+            if value_type == Array or value_type == NumberArray:
+                return list
+            return value_type
+        elif self.is_number_array_expression(self.expression):
+            return self.build_number_array(self.expression[len("numbers"):].strip())
+
+        tokens = self.tokenize(self.expression)
         self.is_valid_expression(tokens)
 
         result = ""
@@ -55,6 +77,8 @@ class Expression:
             elif token[0] == "[" and token[-1] == "]":
                 boolean = Boolean(token, self.call_stack, self.variables)
                 result += str(boolean.evaluate()).lower()
+            elif token[0] == "{" and token[-1] == "}":
+                result += "{" + str(self.build_map_or_set(token))[1:-1] + "}"
             elif token == ".":
                 None
             else:
@@ -64,8 +88,10 @@ class Expression:
                     return token
                 if self.is_value_type(token) == True:
                     result += self.create_string_representation_of_type(token)
-                elif type(token) == list:
+                elif is_array(token):
                     result += "<" + str(token)[1:-1] + ">"
+                elif type(token) == dict or type(token) == Set:
+                    result += "{" + str(token)[1:-1] + "}"
                 elif type(token) == bool:
                     result += str(token).lower()
                 else:
@@ -73,6 +99,10 @@ class Expression:
         return self.perform_type_conversion(result)
             
 
+    def try_evaluate(self):
+        return try_silently(self.evaluate)
+
+
     def resolve(self, token):
         token = self.perform_type_conversion(token)
         if type(token) == str:
@@ -102,6 +132,8 @@ class Expression:
         start_delimiter_index = indicies.find("<")
         end_delimiter_index = indicies.find(">")
         array_index_expression = indicies[start_delimiter_index + 1:end_delimiter_index].strip()
+        if type(array) == dict:
+            return self.get_map_value(unparsed_expression, array, indicies, array_index_expression, end_delimiter_index)
         if ":" in array_index_expression:
             array_index_expression_tokens = array_index_expression.split(":")
             if len(array_index_expression_tokens) != 2:
@@ -144,6 +176,33 @@ class Expression:
             fail("The array element \"" + unparsed_expression + "\" does not exist.", self.error_type, self.call_stack)
     
 
+    def get_map_value(self, unparsed_expression, map_object, indicies, key_expression, end_delimiter_index):
+        key = self.get_map_key(key_expression)
+        if key not in map_object:
+            fail("The map element \"" + unparsed_expression + "\" does not exist.", self.error_type, self.call_stack)
+        if len(indicies) > end_delimiter_index + 1:
+            return self.handle_nested_array_element_or_subarray(indicies, end_delimiter_index, unparsed_expression, map_object[key])
+        return map_object[key]
+
+
+    def get_map_key(self, key_expression):
+        key = Expression(key_expression, self.call_stack, self.variables).evaluate()
+        if self.is_hashable(key) == False:
+            fail(f"Map key '{key_expression}' is not a string, number or boolean.", self.error_type, self.call_stack)
+        return key
+
+
+    def get_set_value(self, value_expression):
+        value = Expression(value_expression, self.call_stack, self.variables).evaluate()
+        if self.is_hashable(value) == False:
+            fail(f"Set value '{value_expression}' is not a string, number or boolean.", self.error_type, self.call_stack)
+        return value
+
+
+    def is_hashable(self, value):
+        return type(value) == str or type(value) == int or type(value) == float or type(value) == bool
+
+
     def get_array_index_value(self, array_index_expression):
         array_index = Expression(array_index_expression, self.call_stack, self.variables).evaluate()
         if type(array_index) != int:
@@ -184,103 +243,127 @@ class Expression:
                 return token.replace("\\n", "\n").replace("\\t", "\t")
 
 
-    def parse_expression(self, expression, tokens):
-        expression = expression.strip()
-    
-        if expression[0] == '"':
-            next_occurance = expression[1:].find('"') + 1
-            tail = expression[next_occurance + 1:]
-            tokens += [expression[0:next_occurance+1]]
-        elif expression[0] == "'":
-            next_occurance = expression[1:].find("'") + 1
-            tail = expression[next_occurance + 1:]
-            tokens += [expression[0:next_occurance+1]]
-        elif expression[0] == ".":
-            tail = expression[1:]
-            tokens += [expression[0]]
-        elif expression[0] == "(":
+    def tokenize(self, expression):
+        tokens = token_cache.get("Expression", expression)
+        if tokens == None:
+            self.cacheable = True
+            tokens = self.parse_expression(expression).tokens
+            if self.cacheable == True:
+                token_cache.put("Expression", expression, tokens)
+        return tokens
+
+
+    def parse_expression(self, expression):
+        lexer = Lexer(expression)
+        self.parse_token(lexer)
+        while lexer.is_finished() == False:
+            try:
+                self.parse_token(lexer)
+            except SystemExit:
+                # errors in the rest of the expression have already been reported
+                self.cacheable = False
+                return lexer
+            except Exception:
+                return lexer
+        return lexer
+
+
+    def parse_token(self, lexer):
+        expression = lexer.expression
+        position = lexer.skip_space(lexer.position)
+        if position >= lexer.length:
+            raise IndexError
+        char = expression[position]
+        if char == '"' or char == "'":
+            end = lexer.find(char, position + 1)
+            if end == -1:
+                end = position
+            lexer.add_token(expression[position:end+1], position, end + 1)
+        elif char == ".":
+            lexer.add_token(char, position, position + 1)
+        elif char == "(":
             try:
-                math_expression = self.parse_specialized_expression(expression, 0, -1, "(", ")", True)
+                end = lexer.find_closing(position, "(", ")")
             except:
                 fail("Extra or missing parentheses on math expression.", self.error_type, self.call_stack)
-            tail = expression[len(math_expression):]
-            tokens += [math_expression]
-        elif expression[0] == "[":
+            lexer.add_token(expression[position:end], position, end)
+        elif char == "[":
             try:
-                boolean = self.parse_specialized_expression(expression, 0, -1, "[", "]", True)
+                end = lexer.find_closing(position, "[", "]")
             except:
                 fail("Extra or missing bracket on boolean expression.", self.error_type, self.call_stack)
-            tail = expression[len(boolean):]
-            tokens += [boolean]
+            lexer.add_token(expression[position:end], position, end)
+        elif char == "{":
+            try:
+                end = lexer.find_closing(position, "{", "}")
+            except:
+                fail("Extra or missing brace on map or set.", self.error_type, self.call_stack)
+            lexer.add_token(expression[position:end], position, end)
         else:
-            if expression[0] == "<":
-                non_string_token = expression.split('.', 1)[0]
-            else:
-                non_string_token = expression.split(' ', 1)[0].split('.', 1)[0]
-            non_string_token_length = len(non_string_token)
-            if "<" in non_string_token:
-                if non_string_token[0] == "<" and ">" in expression:
-                    try:
-                        if tokens[-1] == ".":
-                            non_string_token = expression[:expression.rindex('>')+1]
-                            non_string_token_length = len(non_string_token)
-                        else:
-                            raise Exception
-                    except:
-                        try:
-                            if tokens[-1] not in reserved:
-                                non_string_token = tokens[-1] + " " + expression[:expression.rindex('>')+1]
-                                tokens = tokens[:-1]
-                                non_string_token_length = len(non_string_token)
-                        except:
-                            pass
-                else:
-                    try:
-                        non_string_token = expression[:expression.rindex('>')+1]
-                        non_string_token_length = len(non_string_token)
-                    except:
-                        pass
-            if "(" in non_string_token and "<(" not in non_string_token:
-                function_parameter_start = expression.find("(")
-                expression_after_function_parameter_start = expression[function_parameter_start:]
-                function_name = expression[:function_parameter_start]
-                non_string_token = function_name + self.parse_specialized_expression(expression_after_function_parameter_start, 0, -1, "(", ")", True) + ","
+            self.parse_non_string_token(lexer, position)
+
+
+    def parse_non_string_token(self, lexer, position):
+        expression = lexer.expression
+        tokens = lexer.tokens
+        end = lexer.find(".", position)
+        if expression[position] != "<":
+            space = lexer.find(" ", position)
+            if space != -1 and (end == -1 or space < end):
+                end = space
+        if end == -1:
+            end = lexer.length
+        non_string_token = expression[position:end]
+        non_string_token_length = len(non_string_token)
+        replaces_last_token = False
+        if "<" in non_string_token:
+            last_angle_bracket = lexer.rfind(">", position)
+            if non_string_token[0] == "<" and last_angle_bracket != -1:
+                if len(tokens) > 0 and tokens[-1] == ".":
+                    non_string_token = expression[position:last_angle_bracket+1]
+                    non_string_token_length = len(non_string_token)
+                elif len(tokens) > 0 and tokens[-1] not in reserved:
+                    non_string_token = tokens[-1] + " " + expression[position:last_angle_bracket+1]
+                    replaces_last_token = True
+                    non_string_token_length = len(non_string_token)
+            elif last_angle_bracket != -1:
+                non_string_token = expression[position:last_angle_bracket+1]
                 non_string_token_length = len(non_string_token)
-                if len(expression) >= non_string_token_length:
-                    if expression[non_string_token_length-1] == ">":
-                        non_string_token = non_string_token[:-1] + ">"
-                else:
-                    non_string_token = non_string_token[:-1]
-            non_string_token_type = self.perform_type_conversion(non_string_token)
-            tail = expression[non_string_token_length:]
-            if type(non_string_token_type) == int and len(tail) > 0:
-                if tail[0] == ".":
-                    non_string_token = non_string_token + "." + tail[1:].split(' ', 1)[0].split('.', 1)[0]
-                    tail = expression[len(non_string_token):]
-            elif "(" in non_string_token and ")" in non_string_token and non_string_token[-1] == ",":
+        if "(" in non_string_token and "<(" not in non_string_token:
+            function_parameter_start = lexer.find("(", position)
+            if function_parameter_start == -1:
+                function_parameter_start = lexer.length - 1
+            function_parameter_end = lexer.find_closing(function_parameter_start, "(", ")")
+            non_string_token = expression[position:function_parameter_end] + ","
+            non_string_token_length = len(non_string_token)
+            if lexer.length - position >= non_string_token_length:
+                if expression[position + non_string_token_length - 1] == ">":
+                    non_string_token = non_string_token[:-1] + ">"
+            else:
                 non_string_token = non_string_token[:-1]
-                tail = expression[len(non_string_token):]
-            tokens += [non_string_token]
-        try:
-            return self.parse_expression(tail, tokens)
-        except:
-            return tokens
-
-
-    # pass '0' for parentheses_count
-    # pass '-1' in for i
-    # pass 'True' in for init
-    def parse_specialized_expression(self, expression, parentheses_count, i, start_parentheses_type, end_parentheses_type, init):
-        i += 1
-
-        if parentheses_count == 0 and init == False:
-            return expression[:i]
-        if expression[i] == start_parentheses_type:
-            return self.parse_specialized_expression(expression, parentheses_count + 1, i, start_parentheses_type, end_parentheses_type, False)
-        elif expression[i] == end_parentheses_type:
-            return self.parse_specialized_expression(expression, parentheses_count - 1, i, start_parentheses_type, end_parentheses_type, False)
+        if len(non_string_token) >= 2 and non_string_token[0] == "<" and non_string_token[-1] == ">":
+            # arrays are built while tokenizing, which depends on the variables in scope
+            self.cacheable = False
+        non_string_token_type = self.perform_type_conversion(non_string_token)
+        next_position = position + non_string_token_length
+        if type(non_string_token_type) == int and next_position < lexer.length:
+            if expression[next_position] == ".":
+                end = lexer.find(".", next_position + 1)
+                space = lexer.find(" ", next_position + 1)
+                if space != -1 and (end == -1 or space < end):
+                    end = space
+                if end == -1:
+                    end = lexer.length
+                non_string_token = non_string_token + "." + expression[next_position+1:end]
+                next_position = position + len(non_string_token)
+        elif "(" in non_string_token and ")" in non_string_token and non_string_token[-1] == ",":
+            non_string_token = non_string_token[:-1]
+            next_position = position + len(non_string_token)
+        next_position = min(next_position, lexer.length)
+        if replaces_last_token:
+            lexer.replace_last_token(non_string_token, next_position)
         else:
-            return self.parse_specialized_expression(expression, parentheses_count, i, start_parentheses_type, end_parentheses_type, False)
+            lexer.add_token(non_string_token, position, next_position)
 
 
     def is_valid_expression(self, expression):
@@ -294,26 +377,139 @@ class Expression:
         self.ensure_array_does_not_have_extra_commas(array)
         array = array[1:-1]
         array = array.strip()
-        try: # check if array is actually a boolean
-            if " " not in array:
-                raise Exception
+        if " " in array: # check if array is actually a boolean
             boolean = Boolean("[" + array + "]", self.call_stack, self.variables)
-            with suppress_stdout_stderr():
-                return boolean.evaluate()
-        except:
-            if array.count('<') != array.count('>'):
-                fail("Extra or missing '<', or '>'.", self.error_type, self.call_stack)
-            array = array.replace("[", "[<").replace("]", ">[")
-            array_tokens = array.split("[")
-            array_tokens = ' '.join(array_tokens).split(",")
-            array_object = []
-            array_tokens = self.reconcatenate_nested_object(array_tokens, "<", ">")
-            array_tokens = self.reconcatenate_nested_object(array_tokens, "'", "'")
-            for array_token in array_tokens:
-                array_token = array_token.strip()
-                expression = Expression(array_token, self.call_stack, self.variables)
-                array_object.append(expression.evaluate())
-            return array_object
+            result = boolean.try_evaluate()
+            if result != failed_evaluation:
+                return result
+        if array.count('<') != array.count('>'):
+            fail("Extra or missing '<', or '>'.", self.error_type, self.call_stack)
+        array = array.replace("[", "[<").replace("]", ">[")
+        array_tokens = array.split("[")
+        array_tokens = ' '.join(array_tokens).split(",")
+        array_object = Array()
+        array_tokens = self.reconcatenate_nested_object(array_tokens, "<", ">")
+        array_tokens = self.reconcatenate_nested_object(array_tokens, "{", "}")
+        array_tokens = self.reconcatenate_nested_object(array_tokens, "'", "'")
+        for array_token in array_tokens:
+            array_token = array_token.strip()
+            expression = Expression(array_token, self.call_stack, self.variables)
+            array_object.append(expression.evaluate())
+        return array_object
+
+
+    # "numbers" is not reserved, so a variable with that name is used as a variable.
+    def is_number_array_expression(self, expression):
+        tokens = expression.split(None, 1)
+        if len(tokens) != 2 or tokens[0] != "numbers" or "numbers" in self.variables:
+            return False
+        return tokens[1][0] != "."
+
+
+    def build_number_array(self, array_expression):
+        array = Expression(array_expression, self.call_stack, self.variables).evaluate()
+        if is_array(array) == False:
+            fail(f"Number arrays can only be created from arrays. '{array_expression}' is not an array.", self.error_type, self.call_stack)
+        for value in array:
+            if is_number(value) == False:
+                fail(f"Number arrays can only contain numbers. '{value}' is not a number.", self.error_type, self.call_stack)
+        return NumberArray(array)
+
+
+    # Braces hold either map entries, which are "key: value" pairs, or set values, separated by
+    # commas. Empty braces are an empty map.
+    def build_map_or_set(self, expression):
+        if len(expression[1:-1].strip()) == 0:
+            return {}
+        entries = self.split_map_expression(expression[1:-1], ",")
+        for entry in entries:
+            if len(entry.strip()) == 0:
+                fail("Extra comma in map or set definition.", self.error_type, self.call_stack)
+        if len(self.split_map_expression(entries[0], ":")) < 2:
+            return self.build_set(entries)
+        return self.build_map(entries)
+
+
+    def build_map(self, entries):
+        map_object = {}
+        for entry in entries:
+            entry_tokens = self.split_map_expression(entry, ":")
+            if len(entry_tokens) < 2:
+                fail(f"Map entry '{entry.strip()}' is missing ':' between its key and value.", self.error_type, self.call_stack)
+            key = self.get_map_key(entry_tokens[0].strip())
+            value_expression = entry[len(entry_tokens[0]) + 1:].strip()
+            map_object[key] = Expression(value_expression, self.call_stack, self.variables).evaluate()
+        return map_object
+
+
+    def build_set(self, entries):
+        set_object = Set()
+        for entry in entries:
+            if len(self.split_map_expression(entry, ":")) > 1:
+                fail(f"Set value '{entry.strip()}' cannot contain ':'. Braces hold either a map or a set.", self.error_type, self.call_stack)
+            set_object.add(self.get_set_value(entry.strip()))
+        return set_object
+
+
+    # Operators are found outside of strings and nested brackets. The last one is performed last,
+    # so set operations are evaluated from left to right.
+    def find_set_operation(self, expression):
+        set_operation = None
+        depth = 0
+        quote = None
+        for i in range(0, len(expression), 1):
+            char = expression[i]
+            if quote != None:
+                if char == quote:
+                    quote = None
+            elif char == '"' or char == "'":
+                quote = char
+            elif char in "<{[(":
+                depth += 1
+            elif char in ">}])":
+                depth -= 1
+            elif char == " " and depth == 0:
+                for operator in set_operators:
+                    if expression.startswith(" " + operator + " ", i):
+                        set_operation = (expression[:i].strip(), operator, expression[i + len(operator) + 2:].strip())
+        return set_operation
+
+
+    def perform_set_operation(self, set_operation):
+        operand_1, operator, operand_2 = set_operation
+        set_1 = Expression(operand_1, self.call_stack, self.variables).evaluate()
+        set_2 = Expression(operand_2, self.call_stack, self.variables).evaluate()
+        if type(set_1) != Set or type(set_2) != Set:
+            fail(f"'{operator}' can only be performed on sets.", self.error_type, self.call_stack)
+        if operator == "union":
+            return set_1.union(set_2)
+        elif operator == "intersection":
+            return set_1.intersection(set_2)
+        return set_1.difference(set_2)
+
+
+    # Splits on a separator that is not inside a string or inside nested brackets.
+    def split_map_expression(self, expression, separator):
+        parts = []
+        depth = 0
+        quote = None
+        part_start = 0
+        for i in range(0, len(expression), 1):
+            char = expression[i]
+            if quote != None:
+                if char == quote:
+                    quote = None
+            elif char == '"' or char == "'":
+                quote = char
+            elif char in "<{[(":
+                depth += 1
+            elif char in ">}])":
+                depth -= 1
+            elif char == separator and depth == 0:
+                parts.append(expression[part_start:i])
+                part_start = i + 1
+        parts.append(expression[part_start:])
+        return parts
 
 
     def reconcatenate_nested_object(self, array_tokens, start_delimiter, end_delimiter):
@@ -356,6 +552,10 @@ class Expression:
             return True
         elif value_type == list:
             return True
+        elif value_type == dict:
+            return True
+        elif value_type == Set:
+            return True
         elif value_type == types.FunctionType:
             return True
         return False
@@ -372,6 +572,10 @@ class Expression:
             return "@Type:Boolean"
         elif value_type == list:
             return "@Type:Array"
+        elif value_type == dict:
+            return "@Type:Map"
+        elif value_type == Set:
+            return "@Type:Set"
         elif value_type == types.FunctionType:
             return "@Type:Function"
         fail(f"'{value_type}' is not a valid type.", self.error_type, self.call_stack)
@@ -386,6 +590,10 @@ class Expression:
             return bool
         elif value_type == "@Type:Array":
             return list
+        elif value_type == "@Type:Map":
+            return dict
+        elif value_type == "@Type:Set":
+            return Set
         elif value_type == "@Type:Function":
             return types.FunctionType
         return value_type
@@ -13,8 +13,30 @@ error_report_banner = """=======================================================
 octane_script_trace_banner = "\n__________________________________ OCTANESCRIPT TRACE __________________________________\n"
 python_trace_banner = "\n_____________________________________ PYTHON TRACE _____________________________________\n"
 
+failed_evaluation = object()
+silent_failure_depth = 0
+
+
+class SilentFailure(SystemExit):
+    pass
+
+
+# Runs an evaluation that is allowed to fail. Failures raise SilentFailure instead of writing
+# an error report, and the evaluation returns failed_evaluation.
+def try_silently(evaluate):
+    global silent_failure_depth
+    silent_failure_depth += 1
+    try:
+        return evaluate()
+    except (Exception, SystemExit):
+        return failed_evaluation
+    finally:
+        silent_failure_depth -= 1
+
 
 def fail(message, error_type, call_stack):
+    if silent_failure_depth > 0:
+        raise SilentFailure(1)
     import Main
     metadata = """Time of Error: [%s]
 OctaneScript Version: %s
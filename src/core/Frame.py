@@ -0,0 +1,38 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+class Frame:
+    def __init__ (self, statement, program, start, stop):
+        self.statement = statement
+        self.program = program
+        self.start = start
+        self.stop = stop
+        self.index = start
+        self.loop = None
+
+
+    def restart(self):
+        self.index = self.start
+
+
+# The frame of a function called by a statement. The statement is finished with the return value
+# once the function returns, and a tail call runs the next function in the same frame.
+class CallFrame(Frame):
+    def __init__ (self, statement, call, call_stack_depth, function_name, function_body):
+        Frame.__init__(self, statement, [], 0, 0)
+        self.call = call
+        self.call_stack_depth = call_stack_depth
+        self.enter(function_name, function_body)
+
+
+    def enter(self, function_name, function_body):
+        self.function_name = function_name
+        if len(function_body) > 0:
+            self.program = function_body[0].program
+            self.start = function_body[0].index
+            self.stop = function_body[-1].index + 1
+        else:
+            self.program = []
+            self.start = 0
+            self.stop = 0
+        self.restart()
@@ -1,27 +1,50 @@
 # This file is licensed under the MIT license.
 # See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
 
-from core.Utilites import suppress_stdout_stderr
-from core.Fail import fail
+from core.Fail import fail, failed_evaluation
 from core.Expression import Expression
 from core.Setter import Setter
+from core.TypedFrame import TypedFrame
+from core.Array import is_array
+from core.Set import Set
+
+cached_modifier = "cached "
+io_statement_kinds = ["print", "log", "sleep", "exit"]
+io_set_values = ["input", "randomInteger", "randomDecimal"]
+specialization_threshold = 8
+
+
+def get_function_name(function_definition):
+    if function_definition.startswith(cached_modifier):
+        function_definition = function_definition[len(cached_modifier):]
+    return function_definition.split("(")[0].strip()
 
 
 class Function:
     def __init__ (self, function_definition, function_body, call_stack, functions, global_variables, function_start):
         self.function_body = function_body
+        self.function_code = None
         self.call_stack = call_stack
         self.global_variables = global_variables
         self.functions = functions
-        self.function_variables = {}
-        self.function_variable_count = 0
+        self.parameters = []
+        self.parameter_count = 0
+        self.call_sites = {}
         self.return_value = None
+        self.cached = False
+        self.type_profile = (None, 0)
+        self.specializable_parameters = ()
+        self.number_names = None
         self.error_type = "Function Error"
         if function_start < 0:
             fail("Function start line cannot be '0'.", self.error_type, self.call_stack)
         else:
             self.function_start = function_start
 
+        if function_definition.startswith(cached_modifier):
+            function_definition = function_definition[len(cached_modifier):].lstrip()
+            self.ensure_function_body_does_not_perform_io()
+            self.cached = True
         self.function_name = function_definition.split("(")[0].rstrip()
         function_name_length = len(self.function_name)
         if len(function_definition) == function_name_length:
@@ -29,41 +52,173 @@ class Function:
         if function_definition[function_name_length] == "(":
             parameters = function_definition[function_name_length:]
             if len(parameters) > 2:
-                self.function_variables = self.get_function_variables(parameters)
-                self.function_variable_count = len(self.function_variables)
+                self.parameters = self.get_parameters(parameters)
+                self.parameter_count = len(self.parameters)
         else:
             fail("There cannot be spaces between the function name and \"(\" that begins the definition of the function parameters).", self.error_type, self.call_stack)
+        self.inline_return = self.get_inline_return()
+        self.specializable_parameters = self.get_specializable_parameters()
 
     
-    def get_function_variables(self, parameters):
+    def get_parameters(self, parameters):
         parameters = self.tokenize_parameters(parameters)
-        function_variables = {}
+        parameter_names = []
         for parameter in parameters:
             parameter = parameter.strip()
             setter = Setter("", self.call_stack, {}, self.functions)
             setter.is_variable_name_valid(parameter)
-            function_variables[parameter] = None
-        return function_variables
+            if parameter not in parameter_names:
+                parameter_names.append(parameter)
+        return parameter_names
 
 
-    def populate_variables(self, parameters):
+    # Every call gets its own frame, so a call never changes the variables of another call to the
+    # same function. Arguments are evaluated in the scope of the caller, or the global scope if
+    # they are not defined there.
+    def create_frame(self, parameters, caller_variables=None):
+        if caller_variables == None:
+            caller_variables = self.global_variables
+        arguments = self.parse_arguments(parameters)
+        frame = {}
         try:
-            parameters = self.tokenize_parameters(parameters)
-            expression = Expression("", self.call_stack, self.function_variables)
-            parameters = expression.reconcatenate_nested_object(parameters, '<', '>')
-            if self.function_variable_count != len(parameters):
+            for i in range(0, self.parameter_count, 1):
+                kind, argument = arguments[i]
+                if kind == "value":
+                    frame[self.parameters[i]] = argument
+                elif argument in caller_variables:
+                    frame[self.parameters[i]] = caller_variables[argument]
+                else:
+                    value = Expression(argument, self.call_stack, caller_variables).try_evaluate()
+                    if value == failed_evaluation:
+                        value = Expression(argument, self.call_stack, self.global_variables).evaluate()
+                    frame[self.parameters[i]] = value
+        except Exception:
+            fail("Bad parameter subsitution.", self.error_type, self.call_stack)
+        return self.specialize(frame)
+
+
+    # The types of the arguments are recorded on every call. Once a function has been called with
+    # the same types enough times in a row, its frames tell Math and Boolean which parameters hold
+    # numbers. A call with other types resets the count, and gets a plain frame.
+    def specialize(self, frame):
+        if len(self.specializable_parameters) == 0:
+            return frame
+        signature = tuple([type(frame[parameter]) for parameter in self.specializable_parameters])
+        profiled_signature, count = self.type_profile
+        if signature == profiled_signature and count >= specialization_threshold:
+            if self.number_names == None:
+                return frame
+            typed_frame = TypedFrame(frame)
+            typed_frame.number_names = self.number_names
+            return typed_frame
+        if signature != profiled_signature:
+            count = 0
+        self.type_profile = (signature, count + 1)
+        number_names = frozenset([self.specializable_parameters[i] for i in range(len(signature))
+                                  if signature[i] == int or signature[i] == float])
+        self.number_names = None
+        if len(number_names) > 0:
+            self.number_names = number_names
+        return frame
+
+
+    # Parameters that are assigned to in the body could change type during a call, so only the
+    # others can be specialized.
+    def get_specializable_parameters(self):
+        assigned_names = []
+        for statement in self.function_body:
+            assigned_names += self.get_assigned_names(statement)
+        return tuple(parameter for parameter in self.parameters if parameter not in assigned_names)
+
+
+    def get_assigned_names(self, statement):
+        parameter_tokens = statement.parameters.split()
+        if len(parameter_tokens) == 0:
+            return []
+        if statement.kind == "set" or statement.kind == "for":
+            return [parameter_tokens[0]]
+        if statement.kind == "remove" and " into " in statement.parameters:
+            return [statement.parameters.split(" into ")[-1].strip()]
+        if statement.kind == "repeat":
+            return [value for option, value in getattr(statement, "repeat_options", []) if option == "counter"]
+        return []
+
+
+    # The arguments of a call site are parsed and checked against the parameters only the first
+    # time the call is made. Literal arguments are evaluated once, everything else is evaluated
+    # again on every call.
+    def parse_arguments(self, parameters):
+        arguments = self.call_sites.get(parameters)
+        if arguments != None:
+            return arguments
+        try:
+            argument_list = self.tokenize_parameters(parameters)
+            expression = Expression("", self.call_stack, {})
+            argument_list = expression.reconcatenate_nested_object(argument_list, '<', '>')
+            argument_list = expression.reconcatenate_nested_object(argument_list, '{', '}')
+            if self.parameter_count != len(argument_list):
                 fail("Too many or two few parameters.", self.error_type, self.call_stack)
-            for variable in self.function_variables:
-                try:
-                    expression = Expression(parameters[0], self.call_stack, self.function_variables)
-                    with suppress_stdout_stderr():
-                        self.function_variables[variable] = expression.evaluate()
-                except:
-                    expression = Expression(parameters[0], self.call_stack, self.global_variables)
-                    self.function_variables[variable] = expression.evaluate()
-                parameters.pop(0)
+            arguments = []
+            for argument in argument_list:
+                if self.is_literal(argument):
+                    arguments.append(("value", Expression(argument, self.call_stack, {}).evaluate()))
+                else:
+                    arguments.append(("expression", argument))
         except Exception:
             fail("Bad parameter subsitution.", self.error_type, self.call_stack)
+        arguments = tuple(arguments)
+        self.call_sites[parameters] = arguments
+        return arguments
+
+
+    def is_literal(self, argument):
+        if argument == "true" or argument == "false":
+            return True
+        if len(argument) >= 2 and argument[0] in "\"'" and argument[-1] == argument[0]:
+            return argument[0] not in argument[1:-1]
+        if len(argument) > 0 and (argument[0].isdigit() or argument[0] in "-."):
+            try:
+                float(argument)
+                return True
+            except ValueError:
+                return False
+        return False
+
+
+    # Functions whose body is a single return can be run at the call site without a call of their
+    # own. Whether the returned expression calls other functions is checked on each call, since
+    # they may be defined later.
+    def get_inline_return(self):
+        if self.cached == True or len(self.function_body) != 1:
+            return None
+        statement = self.function_body[0]
+        if statement.kind != "return" or len(statement.parameters) == 0:
+            return None
+        return statement
+
+
+    def ensure_function_body_does_not_perform_io(self):
+        for statement in self.function_body:
+            performs_io = statement.kind in io_statement_kinds
+            if statement.kind == "set":
+                for value in io_set_values:
+                    if value in statement.parameters.split():
+                        performs_io = True
+            if performs_io == True:
+                self.call_stack.push(statement)
+                fail("Cached functions cannot print, log, sleep, exit, read input or use random values.", self.error_type, self.call_stack)
+
+
+    # Arguments are part of the key together with their type, so that true and 1 are cached separately.
+    # Arrays, maps and sets can be changed after the call, so calls that take them are not cached.
+    def get_cache_key(self, frame):
+        cache_key = []
+        for parameter in self.parameters:
+            value = frame[parameter]
+            if is_array(value) or type(value) == dict or type(value) == Set:
+                return None
+            cache_key.append((type(value), value))
+        return tuple(cache_key)
 
 
     def tokenize_parameters(self, parameters):
@@ -0,0 +1,71 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+# Holds the position of a tokenizer within an expression. Searches only move forward through
+# the expression, so tokenizing an expression is linear in its length instead of copying the
+# rest of the expression for every token.
+
+class Lexer:
+    def __init__ (self, expression):
+        self.expression = expression.strip()
+        self.length = len(self.expression)
+        self.offset = len(expression) - len(expression.lstrip())
+        self.position = 0
+        self.tokens = []
+        self.offsets = []
+        self.occurrences = {}
+        self.last_occurrences = {}
+
+
+    def add_token(self, token, position, next_position):
+        self.tokens.append(token)
+        self.offsets.append(self.offset + position)
+        self.position = next_position
+
+
+    def replace_last_token(self, token, next_position):
+        self.tokens[-1] = token
+        self.position = next_position
+
+
+    def is_finished(self):
+        return self.skip_space(self.position) >= self.length
+
+
+    def skip_space(self, position):
+        while position < self.length and self.expression[position].isspace():
+            position += 1
+        return position
+
+
+    def find(self, symbol, start):
+        if symbol in self.occurrences:
+            searched_from, found = self.occurrences[symbol]
+            if searched_from <= start and (found == -1 or start <= found):
+                return found
+        found = self.expression.find(symbol, start)
+        self.occurrences[symbol] = (start, found)
+        return found
+
+
+    def rfind(self, symbol, start):
+        if symbol not in self.last_occurrences:
+            self.last_occurrences[symbol] = self.expression.rfind(symbol)
+        if self.last_occurrences[symbol] < start:
+            return -1
+        return self.last_occurrences[symbol]
+
+
+    def find_closing(self, position, opening, closing):
+        count = 0
+        i = position
+        while i == position or count != 0:
+            if i >= self.length:
+                raise IndexError
+            char = self.expression[i]
+            if char == opening:
+                count += 1
+            elif char == closing:
+                count -= 1
+            i += 1
+        return i
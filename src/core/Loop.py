@@ -0,0 +1,40 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+class Loop:
+    def __init__ (self, statement):
+        self.statement = statement
+        self.variable = None
+        self.values = iter([])
+        self.keep_variable = True
+        self.variable_overrides_existing_variable = False
+        self.variable_original_value = None
+
+
+    def set_variable(self, variable, variables, keep_variable):
+        self.variable = variable
+        self.keep_variable = keep_variable
+        if variable in variables:
+            self.variable_overrides_existing_variable = True
+            self.variable_original_value = variables[variable]
+
+
+    def set_values(self, values):
+        self.values = iter(values)
+
+
+    def next(self, variables):
+        for value in self.values:
+            if self.variable != None:
+                variables[self.variable] = value
+            return True
+        return False
+
+
+    def finish(self, variables):
+        if self.variable == None:
+            return
+        if self.keep_variable == False:
+            variables.pop(self.variable)
+        if self.variable_overrides_existing_variable == True:
+            variables[self.variable] = self.variable_original_value
@@ -3,6 +3,7 @@
 
 from core.NestableExpression import NestableExpression
 from core.Fail import fail
+from core.TypedFrame import TypedFrame
 
 
 class Math(NestableExpression):
@@ -19,14 +20,67 @@ class Math(NestableExpression):
     def calculate(self):
         if self.expression[0] != "(" or self.expression[-1] != ")":
             fail("Extra or missing parentheses.", self.error_type, self.call_stack)
-        return self.evaluate_nestable_expression(self.parse_expression(self.expression, []), 
-                                                 self.perform_operation)[0]
+        return self.run(self.compile(self.expression))
 
 
-    def perform_operation(self, tokens):
-        operator = tokens[1]
-        operand_1 = self.resolve(tokens[0])
-        operand_2 = self.resolve(tokens[2])
+    def run(self, program):
+        values = [None] * len(program)
+        for index in range(len(program)):
+            step = program[index]
+            kind = step[0]
+            if kind == "operation":
+                operator = step[2]
+                if type(operator) == int:
+                    operator = str(values[operator])
+                operand_1 = self.resolve_operand(step[1], values)
+                operand_2 = self.resolve_operand(step[3], values)
+                value = self.perform_operator(operator, operand_1, operand_2)
+                if value == None:
+                    fail("Invalid operation", self.error_type, self.call_stack)
+                values[index] = value
+            elif kind == "answer":
+                tokens = [token if type(token) == str else str(values[token]) for token in step[1]]
+                if self.is_valid_answer(tokens) == False:
+                    fail("Missing or extra operator.", self.error_type, self.call_stack)
+                values[index] = tokens[0]
+            elif kind == "result":
+                if type(step[1]) == str:
+                    return step[1]
+                return str(values[step[1]])
+            else:
+                fail(step[1], self.error_type, self.call_stack)
+
+
+    def compile_operand(self, token):
+        if type(token) == int:
+            return ("step", token)
+        try:
+            return ("number", float(token))
+        except:
+            return ("variable", token)
+
+
+    def resolve_operand(self, operand, values):
+        kind = operand[0]
+        if kind == "number":
+            return operand[1]
+        elif kind == "step":
+            value = values[operand[1]]
+            if type(value) == float:
+                return value
+            # answers of single tokens and complex numbers are resolved like the text they would print as
+            return self.resolve(str(value))
+        if type(self.variables) == TypedFrame and operand[1] in self.variables.number_names:
+            value = self.variables.get(operand[1])
+            if type(value) == int or type(value) == float:
+                return float(value)
+        try:
+            return float(self.get_variable(operand[1]))
+        except Exception:
+            fail(f"Math operations can only be performed with numbers. '{operand[1]}' is not a number.", self.error_type, self.call_stack)
+
+
+    def perform_operator(self, operator, operand_1, operand_2):
         if operator == '+': 
             return operand_1 + operand_2
         elif operator =='-': 
@@ -0,0 +1,256 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+# Translates the subset of expressions whose meaning is fully understood into Python source.
+# Anything outside of that subset is left to Expression, Math and Boolean at runtime.
+
+from core.Expression import Expression
+from Reserved import reserved
+
+math_operators = {'+' : "+", '-' : "-", '*' : "*", '/' : "/", '%' : "%"}
+math_functions = {'^' : "power", 'rootOf' : "root_of"}
+boolean_operators = {
+    "equals" : "equals",
+    "notEquals" : "not_equals",
+    "lessThan" : "less_than",
+    "lessThanEquals" : "less_than_equals",
+    "greaterThan" : "greater_than",
+    "greaterThanEquals" : "greater_than_equals",
+    "and" : "boolean_and",
+    "or" : "boolean_or"
+}
+boolean_symbols = ["lessThanEquals", "greaterThanEquals", "lessThan", "greaterThan", "equals", "notEquals",
+                   "contains", "and", "or", "true", "false"]
+string_characters = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 ,!?:;_-"
+
+
+class NativeExpression:
+    def __init__ (self, expression, function_names):
+        self.expression = expression
+        self.function_names = function_names
+        self.names = []
+        self.tokens = []
+        self.position = 0
+
+
+    def translate_value(self):
+        if self.tokenize() == False or len(self.tokens) == 0:
+            return None
+        kind, token = self.tokens[0]
+        if len(self.tokens) == 1:
+            if kind == "number" or kind == "string":
+                return repr(self.convert(token))
+            elif kind == "name" and self.is_native_name(token, False):
+                return "defined(" + self.local(token) + ")"
+            return None
+        if token == "(":
+            source = self.translate_math_group(False)
+            if source != None and self.position == len(self.tokens):
+                return "number(" + source[0] + ")"
+        elif token == "[":
+            source = self.translate_boolean_group()
+            if source != None and self.position == len(self.tokens):
+                return source[0]
+        return None
+
+
+    def translate_condition(self):
+        if self.tokenize() == False or len(self.tokens) == 0 or self.tokens[0][1] != "[":
+            return None
+        source = self.translate_boolean_group()
+        if source != None and self.position == len(self.tokens):
+            return source[0]
+        return None
+
+
+    def translate_math_group(self, inside_boolean):
+        self.position += 1
+        operands = []
+        operators = []
+        while True:
+            operand = self.translate_math_operand(inside_boolean, len(operators) == 0)
+            if operand == None:
+                return None
+            operands.append(operand)
+            kind, token = self.next_token()
+            if token == ")" and kind == "symbol":
+                break
+            if token not in math_operators and token not in math_functions:
+                return None
+            operators.append(token)
+        if len(operators) == 0:
+            if operands[0][1] == "name":
+                return None
+            return (operands[0][0], operands[0][2] + 1)
+        depth = self.get_group_depth(operands)
+        if depth == None:
+            return None
+        source = operands[0][0]
+        for i in range(0, len(operators), 1):
+            operator = operators[i]
+            if operator in math_operators:
+                source = "(" + source + " " + math_operators[operator] + " " + operands[i+1][0] + ")"
+            else:
+                source = math_functions[operator] + "(" + source + ", " + operands[i+1][0] + ")"
+        return (source, depth)
+
+
+    def translate_math_operand(self, inside_boolean, is_first):
+        kind, token = self.next_token()
+        if kind == "number":
+            return (repr(float(token)), kind, 0)
+        elif kind == "name" and self.is_native_name(token, inside_boolean):
+            return ("float(" + self.local(token) + ")", kind, 0)
+        elif kind == "symbol" and token == "(":
+            self.position -= 1
+            source = self.translate_math_group(inside_boolean)
+            if source == None:
+                return None
+            return (source[0], "group", source[1])
+        return None
+
+
+    def translate_boolean_group(self):
+        self.position += 1
+        operands = [self.translate_boolean_operand()]
+        operators = []
+        while operands[-1] != None:
+            kind, token = self.next_token()
+            if token == "]" and kind == "symbol":
+                break
+            if kind != "name" or token not in boolean_operators:
+                return None
+            operators.append(token)
+            operands.append(self.translate_boolean_operand())
+        if operands[-1] == None or len(operators) == 0:
+            return None
+        depth = self.get_group_depth(operands)
+        if depth == None:
+            return None
+        source = operands[0][0]
+        for i in range(0, len(operators), 1):
+            source = boolean_operators[operators[i]] + "(" + source + ", " + operands[i+1][0] + ")"
+        return (source, depth)
+
+
+    def translate_boolean_operand(self):
+        kind, token = self.next_token()
+        if kind == "number":
+            return (repr(float(token)), kind, 0)
+        elif kind == "string":
+            value = self.convert(token)
+            try:
+                return (repr(float(value)), kind, 0)
+            except Exception:
+                return (repr('"' + str(value) + '"'), kind, 0)
+        elif kind == "name":
+            if token.lower() == "true":
+                return ("True", kind, 0)
+            elif token.lower() == "false":
+                return ("False", kind, 0)
+            elif self.is_native_name(token, False):
+                return ("boolean_operand(" + self.local(token) + ")", kind, 0)
+        elif kind == "symbol" and token == "(":
+            self.position -= 1
+            source = self.translate_math_group(True)
+            if source != None:
+                return (source[0], kind, 0)
+        elif kind == "symbol" and token == "[":
+            self.position -= 1
+            source = self.translate_boolean_group()
+            if source != None:
+                return (source[0], "group", source[1])
+        return None
+
+
+    def get_group_depth(self, operands):
+        # Nested groups are evaluated by pairing the first opening symbol with the last closing
+        # symbol, which only matches left to right evaluation for a single nested group, or for
+        # two flat groups when the first of them starts the enclosing group.
+        groups = [operand for operand in operands if operand[1] == "group"]
+        if len(groups) == 0:
+            return 1
+        if len(groups) == 1:
+            return groups[0][2] + 1
+        if len(groups) == 2 and operands[0][1] == "group" and groups[0][2] == 1 and groups[1][2] == 1:
+            return 2
+        return None
+
+
+    def next_token(self):
+        if self.position >= len(self.tokens):
+            return (None, None)
+        self.position += 1
+        return self.tokens[self.position - 1]
+
+
+    def tokenize(self):
+        expression = self.expression.strip()
+        expression_length = len(expression)
+        i = 0
+        while i < expression_length:
+            char = expression[i]
+            if char == " ":
+                i += 1
+                continue
+            elif char in "()[]+-*/%^":
+                self.tokens.append(("symbol", char))
+                i += 1
+            elif char == '"' or char == "'":
+                end = expression.find(char, i + 1)
+                if end == -1:
+                    return False
+                for string_char in expression[i+1:end]:
+                    if string_char not in string_characters:
+                        return False
+                self.tokens.append(("string", expression[i+1:end]))
+                i = end + 1
+            elif char.isdigit() and char.isascii():
+                end = i
+                while end < expression_length and expression[end].isdigit() and expression[end].isascii():
+                    end += 1
+                if end + 1 < expression_length and expression[end] == "." and expression[end+1].isdigit():
+                    end += 1
+                    while end < expression_length and expression[end].isdigit() and expression[end].isascii():
+                        end += 1
+                self.tokens.append(("number", expression[i:end]))
+                i = end
+            elif char.isalpha() and char.isascii():
+                end = i
+                while end < expression_length and expression[end].isalpha() and expression[end].isascii():
+                    end += 1
+                self.tokens.append(("name", expression[i:end]))
+                i = end
+            else:
+                return False
+            if i < expression_length and self.tokens[-1][0] != "symbol":
+                if expression[i] not in " ()[]+-*/%^":
+                    return False
+        return True
+
+
+    def is_native_name(self, name, inside_boolean):
+        if name in reserved or name in self.function_names or name == "array" or name == "map" or name == "emptySet" or "rootOf" in name or "type" in name:
+            return False
+        if name in boolean_operators or name.lower() == "true" or name.lower() == "false":
+            return False
+        try:
+            float(name)
+            return False
+        except Exception:
+            pass
+        if inside_boolean:
+            for symbol in boolean_symbols:
+                if symbol in name:
+                    return False
+        return True
+
+
+    def local(self, name):
+        if name not in self.names:
+            self.names.append(name)
+        return "v_" + name
+
+
+    def convert(self, token):
+        return Expression("", None, {}).perform_type_conversion(token)
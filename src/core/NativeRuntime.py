@@ -0,0 +1,255 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+from core.Transpiler import Transpiler
+from core.Printer import Printer
+from core.Array import is_array
+from core.Set import Set
+import types
+
+
+class Undefined:
+    pass
+
+
+UNDEFINED = Undefined()
+value_types = [str, int, float, bool, list, dict, Set, types.FunctionType]
+
+
+class NativeRuntime:
+    def __init__ (self, interpreter):
+        self.interpreter = interpreter
+
+
+    def run(self, statements):
+        program = self.compile(statements)
+        if program == None:
+            return self.interpreter.run_statements(statements, 0, len(statements))
+        return program(self, self.interpreter.variables)
+
+
+    def run_function(self, function):
+        if function.function_code == None:
+            function.function_code = self.compile(function.function_body)
+        if function.function_code == None:
+            return self.interpreter.run_function_body(function.function_body)
+        return function.function_code(self, self.interpreter.variables)
+
+
+    def compile(self, statements):
+        try:
+            return Transpiler(statements, self.interpreter.script_name).compile(self.get_namespace())
+        except (SyntaxError, RecursionError, MemoryError):
+            return None
+
+
+    def get_namespace(self):
+        return {
+            "UNDEFINED" : UNDEFINED,
+            "defined" : defined,
+            "number" : number,
+            "power" : power,
+            "root_of" : root_of,
+            "boolean_operand" : boolean_operand,
+            "equals" : equals,
+            "not_equals" : not_equals,
+            "less_than" : less_than,
+            "less_than_equals" : less_than_equals,
+            "greater_than" : greater_than,
+            "greater_than_equals" : greater_than_equals,
+            "boolean_and" : boolean_and,
+            "boolean_or" : boolean_or,
+            "store" : store,
+            "load" : load,
+            "finish" : finish
+        }
+
+
+    def enter(self, entry):
+        statement, path = entry
+        call_stack = self.interpreter.call_stack.get_stack()
+        call_stack_depth = len(call_stack)
+        call_stack.extend(path)
+        call_stack.append(statement)
+        return call_stack, call_stack_depth
+
+
+    def execute(self, entry):
+        call_stack, call_stack_depth = self.enter(entry)
+        result = self.interpreter.execute(entry[0])
+        del call_stack[call_stack_depth:]
+        return result
+
+
+    def condition(self, entry):
+        call_stack, call_stack_depth = self.enter(entry)
+        result = self.interpreter.evaluate_condition(entry[0].parameters)
+        del call_stack[call_stack_depth:]
+        return result
+
+
+    def select_arm(self, entry):
+        call_stack, call_stack_depth = self.enter(entry)
+        arm_number = 0
+        for arm, condition, start, stop in entry[0].chain:
+            arm_number += 1
+            call_stack[-1] = arm
+            if condition == None or self.interpreter.evaluate_condition(condition) == True:
+                del call_stack[call_stack_depth:]
+                return arm_number
+        del call_stack[call_stack_depth:]
+        return 0
+
+
+    def while_condition(self, entry):
+        call_stack, call_stack_depth = self.enter(entry)
+        result = self.interpreter.evaluate_while_condition(entry[0])
+        del call_stack[call_stack_depth:]
+        return result
+
+
+    def start_repeat(self, entry):
+        call_stack, call_stack_depth = self.enter(entry)
+        loop = self.interpreter.start_repeat(entry[0])
+        del call_stack[call_stack_depth:]
+        return loop
+
+
+    def start_for(self, entry):
+        call_stack, call_stack_depth = self.enter(entry)
+        loop = self.interpreter.start_for(entry[0])
+        del call_stack[call_stack_depth:]
+        return loop
+
+
+    def print_value(self, entry, value):
+        self.interpreter.performed_io = True
+        call_stack, call_stack_depth = self.enter(entry)
+        Printer(entry[0].function, "", self.interpreter.call_stack, self.interpreter.variables).print_value(value)
+        del call_stack[call_stack_depth:]
+
+
+    def set_return_value(self, value):
+        function_name = self.interpreter.function_call_stack.peek()
+        self.interpreter.functions[function_name].return_value = value
+
+
+def store(variables, names, values):
+    for i in range(0, len(names), 1):
+        if values[i] is UNDEFINED:
+            variables.pop(names[i], None)
+        else:
+            variables[names[i]] = values[i]
+
+
+def load(variables, names):
+    return [variables.get(name, UNDEFINED) for name in names]
+
+
+def finish(loop, value):
+    if loop.variable_overrides_existing_variable == True:
+        return loop.variable_original_value
+    if loop.keep_variable == False:
+        return UNDEFINED
+    return value
+
+
+def defined(value):
+    if value is UNDEFINED:
+        raise NameError
+    return value
+
+
+def number(value):
+    try:
+        integer = int(value)
+    except (OverflowError, ValueError):
+        return str(value)
+    if value == integer:
+        return integer
+    return value
+
+
+def power(operand_1, operand_2):
+    result = operand_1 ** operand_2
+    if type(result) != float:
+        raise ArithmeticError
+    return result
+
+
+def root_of(operand_1, operand_2):
+    return power(operand_2, 1/operand_1)
+
+
+def is_value_type(value):
+    return type(value) == type and value in value_types
+
+
+def boolean_operand(value):
+    if value is UNDEFINED:
+        raise NameError
+    if is_value_type(value) or is_array(value) or type(value) == dict or type(value) == Set:
+        return value
+    try:
+        return float(value)
+    except Exception:
+        return '"' + str(value) + '"'
+
+
+def compare(operand_1, operand_2):
+    # every comparison is performed by the interpreter, so incomparable operands always fail
+    if is_value_type(operand_1) or is_value_type(operand_2):
+        raise TypeError
+    operand_1 < operand_2
+
+
+def equals(operand_1, operand_2):
+    if is_value_type(operand_1) or is_value_type(operand_2):
+        return operand_1 == operand_2
+    operand_1 < operand_2
+    return operand_1 == operand_2
+
+
+def not_equals(operand_1, operand_2):
+    if is_value_type(operand_1) or is_value_type(operand_2):
+        return operand_1 != operand_2
+    operand_1 < operand_2
+    return operand_1 != operand_2
+
+
+def less_than(operand_1, operand_2):
+    compare(operand_1, operand_2)
+    return operand_1 < operand_2
+
+
+def less_than_equals(operand_1, operand_2):
+    compare(operand_1, operand_2)
+    return operand_1 <= operand_2
+
+
+def greater_than(operand_1, operand_2):
+    compare(operand_1, operand_2)
+    return operand_1 > operand_2
+
+
+def greater_than_equals(operand_1, operand_2):
+    compare(operand_1, operand_2)
+    return operand_1 >= operand_2
+
+
+def boolean_and(operand_1, operand_2):
+    compare(operand_1, operand_2)
+    if type(operand_1) != bool:
+        operand_1 = True
+    if type(operand_2) != bool:
+        operand_2 = True
+    return operand_1 and operand_2
+
+
+def boolean_or(operand_1, operand_2):
+    compare(operand_1, operand_2)
+    if type(operand_1) != bool:
+        operand_1 = True
+    if type(operand_2) != bool:
+        operand_2 = True
+    return operand_1 or operand_2
@@ -4,6 +4,8 @@
 # IMPORTANT: This is only intended to be used as a base class
 
 from core.Fail import fail
+from core.Lexer import Lexer
+from core.TokenCache import token_cache, program_cache
 
 class NestableExpression:
     def __init__ (self, expression, call_stack, variables):
@@ -16,179 +18,266 @@ class NestableExpression:
         self.symbols = []
 
 
-    def parse_expression(self, expression, tokens):
-        expression = expression.strip()
+    def tokenize(self, expression):
+        tokenizer = type(self).__name__
+        tokens = token_cache.get(tokenizer, expression)
+        if tokens == None:
+            tokens = self.parse_expression(expression).tokens
+            token_cache.put(tokenizer, expression, tokens)
+        return tokens
 
-        if len(expression) == 0:
-            return tokens
-        else:
-            first_word = expression.split(' ', 1)[0].split(self.right_enclosing_symbol, 1)[0].split(".", 1)[0]
+
+    def parse_expression(self, expression):
+        lexer = Lexer(expression)
+        expression = lexer.expression
+        while lexer.is_finished() == False:
+            position = lexer.skip_space(lexer.position)
+            first_word_end = min(self.find_or_end(lexer, ' ', position),
+                                 self.find_or_end(lexer, self.right_enclosing_symbol, position),
+                                 self.find_or_end(lexer, ".", position))
+            first_word = expression[position:first_word_end]
             # parse entire alpha words proceeded by space, right enclosing symbol, or "." operator
             if first_word.isalpha():
-                first_word_length = len(first_word)
-                rest_of_expression = expression[first_word_length:]
+                rest_of_expression = lexer.skip_space(first_word_end)
+                if rest_of_expression >= lexer.length:
+                    fail(f"Missing operator or '{self.right_enclosing_symbol}' after '{first_word}'.", self.error_type, self.call_stack)
                 # if word is following by . operator tokenize string expression
-                if rest_of_expression.strip()[0] == ".":
-                    token = self.parse_string_expression(expression)
-                    token_length = len(token)
-                    tokens += [token]
-                    return self.parse_expression(expression[token_length:], tokens)
+                if expression[rest_of_expression] == ".":
+                    token = self.parse_string_expression(lexer, position)
                 elif first_word == "type":
-                    token = first_word + " " + self.parse_string_expression(expression[first_word_length+1:])
-                    token_length = len(token)
-                    tokens += [token]
-                    return self.parse_expression(expression[token_length:], tokens)
-                tokens += [expression[0:first_word_length]]
-                return self.parse_expression(expression[first_word_length:], tokens)
-            else:
-                if expression[0] == '"' or expression[0] == "'": # parse entire string expressions
-                    token = self.parse_string_expression(expression)
-                else: # parse expression symbols
-                    token = self.tokenize_on_symbol(expression)
-                token_length = len(token)
-                tokens += [token]
-                return self.parse_expression(expression[token_length:], tokens)
+                    token = first_word + " " + self.parse_string_expression(lexer, first_word_end + 1)
+                else:
+                    token = first_word
+            elif expression[position] == '"' or expression[position] == "'": # parse entire string expressions
+                token = self.parse_string_expression(lexer, position)
+            else: # parse expression symbols
+                token = self.tokenize_on_symbol(lexer, position)
+            if len(token) == 0:
+                fail(f"Unexpected '{expression[position]}'.", self.error_type, self.call_stack)
+            lexer.add_token(token, position, position + len(token))
+        return lexer
+
 
+    def find_or_end(self, lexer, symbol, position):
+        found = lexer.find(symbol, position)
+        if found == -1:
+            return lexer.length
+        return found
 
-    def tokenize_on_symbol(self, expression):
+
+    def tokenize_on_symbol(self, lexer, position):
+        expression = lexer.expression
         for symbol in self.symbols: # when expression currently starts with expression symbol
-            symbol_length = len(symbol)
-            if expression[0:symbol_length] == symbol:
-                if symbol == "[" and expression.find(".") > expression.find("]"):
-                    first_char_following_boolean = expression[expression.find(self.right_enclosing_symbol)+1:].lstrip()[0]
-                    if first_char_following_boolean == ".":
-                        token = self.parse_string_expression(expression)
+            if expression.startswith(symbol, position):
+                if symbol == "[" and self.relative_find(lexer, ".", position) > self.relative_find(lexer, "]", position):
+                    right_enclosing_symbol_index = lexer.find(self.right_enclosing_symbol, position)
+                    following_boolean = position
+                    if right_enclosing_symbol_index != -1:
+                        following_boolean = right_enclosing_symbol_index + 1
+                    following_boolean = lexer.skip_space(following_boolean)
+                    if following_boolean >= lexer.length:
+                        fail(f"Missing '{self.right_enclosing_symbol}'.", self.error_type, self.call_stack)
+                    if expression[following_boolean] == ".":
+                        token = self.parse_string_expression(lexer, position)
                         if token.count("[") == token.count("]"):
                             return token
                 return symbol
-        token = expression
+        # the token is kept as the end of a slice of the expression until it stops being one,
+        # so that the rest of the expression is never copied
+        token = None
+        token_end = lexer.length
         for symbol in self.symbols: # when expression contains an expression symbol
-            if symbol in expression:
+            symbol_index = lexer.find(symbol, position)
+            if symbol_index == -1:
+                continue
+            has_token_after = False
+            if token == None:
+                if symbol_index + len(symbol) <= token_end:
+                    token_end = symbol_index
+                    has_token_after = True
+            else:
                 tokens = token.split(symbol, 1)
                 token = tokens[0]
-                after_token = None
-                if len(tokens) > 1:
-                    after_token = tokens[1]
-                if symbol.isalpha() and after_token != None:
-                    token = self.tokenize_on_alpha_symbol_after_initial_token(expression, symbol, token)
+                has_token_after = len(tokens) > 1
+            if symbol.isalpha() and has_token_after:
+                token, token_end = self.tokenize_on_alpha_symbol_after_initial_token(lexer, position, symbol_index,
+                                                                                     symbol, token, token_end)
+        if token == None:
+            return expression[position:token_end]
         return token
 
 
-    def tokenize_on_alpha_symbol_after_initial_token(self, expression, symbol, token):
-        symbol_index = expression.index(symbol)
-        char_before_symbol = expression[symbol_index-1]
+    def tokenize_on_alpha_symbol_after_initial_token(self, lexer, position, symbol_index, symbol, token, token_end):
+        expression = lexer.expression
+        char_before_symbol = expression[symbol_index-1] if symbol_index > position else expression[-1]
         symbol_length = len(symbol)
         if char_before_symbol.isalpha():
-            token = token.split(symbol, 1)[0] + symbol
-        if len(token)+symbol_length < len(expression):
+            if token == None:
+                token_end += symbol_length
+            else:
+                token = token + symbol
+        token_length = token_end - position if token == None else len(token)
+        if token_length + symbol_length < lexer.length - position:
             char_after_token = expression[symbol_index+symbol_length]
             if char_after_token.isalpha():
-                expression_after_token = expression[symbol_index+len(symbol):]
-                char_after_symbol_index = self.get_first_non_alpha_char_or_end(expression_after_token)
-                char_after_token = expression[symbol_index+symbol_length+char_after_symbol_index]
-                token = expression[:symbol_index+symbol_length+char_after_symbol_index]
+                char_after_symbol_index = symbol_index + symbol_length
+                while char_after_symbol_index < lexer.length and expression[char_after_symbol_index].isalpha():
+                    char_after_symbol_index += 1
+                if char_after_symbol_index == lexer.length:
+                    char_after_symbol_index = symbol_index + symbol_length - 1
+                char_after_token = expression[char_after_symbol_index]
+                token = None
+                token_end = char_after_symbol_index
             if char_after_token == ".":
-                token = self.parse_string_expression(expression)
-        if token.rstrip()[-1] == self.right_enclosing_symbol:
+                token = self.parse_string_expression(lexer, position)
+        if token == None:
+            last_char = token_end - 1
+            while last_char >= position and expression[last_char].isspace():
+                last_char -= 1
+            if last_char < position:
+                fail(f"Missing value before '{symbol}'.", self.error_type, self.call_stack)
+            if expression[last_char] == self.right_enclosing_symbol:
+                token_end = lexer.find(self.right_enclosing_symbol, position)
+        elif token.rstrip()[-1] == self.right_enclosing_symbol:
             token = token[:token.index(self.right_enclosing_symbol)]
-        return token
+        return token, token_end
 
 
-    def parse_string_expression(self, expression):
-        expression_no_white_space = expression.replace(" ", "")
-        start_symbol = expression_no_white_space[0]
-        if start_symbol == '"' or start_symbol == "'" or start_symbol == "(" or start_symbol == "[" or start_symbol == "<":
-            token = ""
-            if start_symbol == "(":
-                token = expression[:expression.index(")")+1]
-            elif start_symbol == "[":
-                token = expression[:expression.index("]")+1]
-            elif start_symbol == "<":
-                token = expression[:expression.index(">")+1]
+    def relative_find(self, lexer, symbol, position):
+        found = lexer.find(symbol, position)
+        if found == -1:
+            return -1
+        return found - position
+
+
+    def parse_string_expression(self, lexer, position):
+        expression = lexer.expression
+        start = ""
+        while True:
+            start_symbol_index = self.skip_spaces(lexer, position)
+            if start_symbol_index >= lexer.length:
+                fail("Missing value after '.'.", self.error_type, self.call_stack)
+            start_symbol = expression[start_symbol_index]
+            if start_symbol == '"' or start_symbol == "'" or start_symbol == "(" or start_symbol == "[" or start_symbol == "<":
+                if start_symbol == "(" or start_symbol == "[" or start_symbol == "<":
+                    token_end = lexer.find(self.get_closing_symbol(start_symbol), position)
+                    if token_end == -1:
+                        fail(f"Missing '{self.get_closing_symbol(start_symbol)}' after '{start_symbol}'.", self.error_type, self.call_stack)
+                    token_end += 1
+                else:
+                    token_end = lexer.find(start_symbol, position + 1)
+                    if token_end == -1: # let erronious value bubble up to be handled later
+                        token_end = lexer.length
+                    else:
+                        token_end += 1
+                dot_index = lexer.find(".", position)
+                if dot_index != -1 and dot_index >= token_end and self.skip_spaces(lexer, token_end) == dot_index:
+                    split_index, next_position = self.split_string_expression_on_dot_operator(lexer, dot_index)
+                    start += expression[position:split_index]
+                    position = next_position
+                    continue
+                token = expression[position:token_end]
+                if start_symbol == self.left_enclosing_symbol:
+                    return start + token
+                return start + token.replace(self.right_enclosing_symbol, "")
             else:
-                try:
-                    token = expression[:expression[1:].index(start_symbol)+2]
-                except: # let erronious value bubble up to be handled later
-                    token = expression
-            if expression_no_white_space.find(".") == len(token.replace(" ", "")):
-                partitions = self.split_string_expression_on_dot_operator(expression)
-                return partitions[0] + self.parse_string_expression(partitions[1])
-            if start_symbol == self.left_enclosing_symbol:
-                return token
-            return token.replace(self.right_enclosing_symbol, "")
-        else:
-            variable_token = expression.split(' ', 1)[0].split('.', 1)[0]
-            rest_of_expression = expression[len(variable_token):]
-            if len(rest_of_expression) > 0:
-                if rest_of_expression.lstrip()[0] == ".":
-                    partitions = self.split_string_expression_on_dot_operator(expression)
-                    return partitions[0] + self.parse_string_expression(partitions[1])
-            return expression.split(' ', 1)[0].replace(self.right_enclosing_symbol, "")
-
-
-    def get_first_non_alpha_char_or_end(self, expression):
-        for char in expression:
-            if char.isalpha() == False:
-                return expression.index(char)
-        return -1
-
-    def split_string_expression_on_dot_operator(self, expression):
-        dot_index = expression.find(".")
-        expression_after_dot = expression[dot_index+1:].lstrip()
-        expression_start = self.get_first_string_token_up_to_and_including_dot_operator(expression, dot_index)
-        return [expression_start, expression_after_dot]
-
-    def get_first_string_token_up_to_and_including_dot_operator(self, expression, dot_index):
-        next_token_starting_char = expression[dot_index+1:].lstrip()[0]
-        next_token_starting_char_index = expression[dot_index:].index(next_token_starting_char) + dot_index
-        return expression[:next_token_starting_char_index]
-
-
-    def evaluate_nestable_expression(self, expression, single_operation_evaluator):
+                variable_end = min(self.find_or_end(lexer, " ", position), self.find_or_end(lexer, ".", position))
+                if variable_end < lexer.length and expression[lexer.skip_space(variable_end)] == ".":
+                    split_index, next_position = self.split_string_expression_on_dot_operator(lexer, lexer.skip_space(variable_end))
+                    start += expression[position:split_index]
+                    position = next_position
+                    continue
+                return start + expression[position:self.find_or_end(lexer, " ", position)].replace(self.right_enclosing_symbol, "")
+
+
+    def get_closing_symbol(self, start_symbol):
+        if start_symbol == "(":
+            return ")"
+        if start_symbol == "[":
+            return "]"
+        return ">"
+
+
+    def split_string_expression_on_dot_operator(self, lexer, dot_index):
+        next_token_start = lexer.skip_space(dot_index + 1)
+        if next_token_start >= lexer.length:
+            fail("Missing value after '.'.", self.error_type, self.call_stack)
+        if lexer.expression[next_token_start] == ".":
+            return dot_index, next_token_start
+        return next_token_start, next_token_start
+
+
+    def skip_spaces(self, lexer, position):
+        while position < lexer.length and lexer.expression[position] == " ":
+            position += 1
+        return position
+
+
+    # Compiles an expression into a program of steps. Each step is (kind, ...) and its result is
+    # referred to by its index in the program. A nested expression is always split at the same
+    # tokens no matter what its operands evaluate to, so the splitting is done once here instead
+    # of on every evaluation.
+    def compile(self, expression):
+        compiler = type(self).__name__
+        program = program_cache.get(compiler, expression)
+        if program == None:
+            steps = []
+            result = self.compile_nestable_expression(self.tokenize(expression), steps)
+            if result != None:
+                steps.append(("result", result[0]))
+            program = tuple(steps)
+            program_cache.put(compiler, expression, program)
+        return program
+
+
+    def compile_nestable_expression(self, expression, program):
         left_enclosing_symbol_count = expression.count(self.left_enclosing_symbol)
         right_enclosing_symbol_count = expression.count(self.right_enclosing_symbol)
-        if left_enclosing_symbol_count == right_enclosing_symbol_count:
-
-            if left_enclosing_symbol_count > 0:
-                new_expression = []
-                left_enclosing_symbol_index = expression.index(self.left_enclosing_symbol)
-                right_enclosing_symbol_index = len(expression) - expression[::-1].index(self.right_enclosing_symbol) - 1
-                
-                if left_enclosing_symbol_index > right_enclosing_symbol_index:
-                    outside_left = expression[:right_enclosing_symbol_index]
-                    evaluated_outside_left = self.evaluate_nestable_expression(outside_left, single_operation_evaluator)
-                    outside_right = expression[left_enclosing_symbol_index+1:]
-                    evaluated_outside_right = self.evaluate_nestable_expression(outside_right, single_operation_evaluator)
-                    intermediate_expression = expression[right_enclosing_symbol_index+1:left_enclosing_symbol_index]
-                    new_expression = evaluated_outside_left + intermediate_expression + evaluated_outside_right
-                else:
-                    outside_left = expression[:left_enclosing_symbol_index]
-                    outside_right = expression[right_enclosing_symbol_index+1:]
-                    sub_expression = expression[left_enclosing_symbol_index+1:right_enclosing_symbol_index]
-
-                    evaluated_sub_expression = self.evaluate_nestable_expression(sub_expression, single_operation_evaluator)
-                    new_expression = outside_left + evaluated_sub_expression + outside_right
-                return self.evaluate_nestable_expression(new_expression, single_operation_evaluator)
-            return self.evaluate_all(expression, single_operation_evaluator)
-            
-        else:
-            fail("Extra or missing enclosing symbol.", self.error_type, self.call_stack)
-
-
-    def evaluate_all(self, tokens, single_operation_evaluator):
-        if len(tokens) > 3:
-            return self.evaluate_all(self.evaluate_single_operation(tokens[0:3], single_operation_evaluator) + 
-                                                               tokens[3:], single_operation_evaluator)
-        elif len(tokens) == 3:
-            return self.evaluate_single_operation(tokens[0:3], single_operation_evaluator)
-        else:
-            if self.is_valid_answer(tokens):
-                return tokens
-            fail("Missing or extra operator.", self.error_type, self.call_stack)
-
-
-    def evaluate_single_operation(self, tokens, single_operation_evaluator):
-            value = single_operation_evaluator(tokens)
-            if value == None:
-                fail("Invalid operation", self.error_type, self.call_stack)
-            return [str(value)]
\ No newline at end of file
+        if left_enclosing_symbol_count != right_enclosing_symbol_count:
+            program.append(("fail", "Extra or missing enclosing symbol."))
+            return None
+        while left_enclosing_symbol_count > 0:
+            left_enclosing_symbol_index = expression.index(self.left_enclosing_symbol)
+            right_enclosing_symbol_index = len(expression) - expression[::-1].index(self.right_enclosing_symbol) - 1
+            if left_enclosing_symbol_index > right_enclosing_symbol_index:
+                compiled_outside_left = self.compile_nestable_expression(expression[:right_enclosing_symbol_index], program)
+                if compiled_outside_left == None:
+                    return None
+                compiled_outside_right = self.compile_nestable_expression(expression[left_enclosing_symbol_index+1:], program)
+                if compiled_outside_right == None:
+                    return None
+                intermediate_expression = expression[right_enclosing_symbol_index+1:left_enclosing_symbol_index]
+                expression = compiled_outside_left + intermediate_expression + compiled_outside_right
+            else:
+                sub_expression = expression[left_enclosing_symbol_index+1:right_enclosing_symbol_index]
+                compiled_sub_expression = self.compile_nestable_expression(sub_expression, program)
+                if compiled_sub_expression == None:
+                    return None
+                expression = (expression[:left_enclosing_symbol_index] + compiled_sub_expression +
+                              expression[right_enclosing_symbol_index+1:])
+            left_enclosing_symbol_count = expression.count(self.left_enclosing_symbol)
+            if left_enclosing_symbol_count != expression.count(self.right_enclosing_symbol):
+                program.append(("fail", "Extra or missing enclosing symbol."))
+                return None
+        return self.compile_all(expression, program)
+
+
+    # results of earlier steps are referred to by their index, so they never match a token
+    def compile_all(self, tokens, program):
+        while len(tokens) > 3:
+            tokens = self.compile_single_operation(tokens[0:3], program) + tokens[3:]
+        if len(tokens) == 3:
+            return self.compile_single_operation(tokens, program)
+        program.append(("answer", tuple(tokens)))
+        return [len(program) - 1]
+
+
+    def compile_single_operation(self, tokens, program):
+        program.append(("operation", self.compile_operand(tokens[0]), tokens[1], self.compile_operand(tokens[2])))
+        return [len(program) - 1]
+
+
+    def compile_operand(self, token):
+        if type(token) == int:
+            return ("step", token)
+        return ("token", token)
\ No newline at end of file
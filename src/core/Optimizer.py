@@ -0,0 +1,213 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+import re
+from core.Expression import Expression
+from core.Boolean import Boolean
+from core.Math import Math
+from core.Fail import try_silently, failed_evaluation
+
+# parentheses that only hold numbers and operators, and are not the parameters of a function call
+literal_math = re.compile(r"(?<![\w)])\(\s*\d+(?:\.\d+)?(?:\s*(?:[-+*/%^]|rootOf)\s*\d+(?:\.\d+)?)+\s*\)")
+indentation = "    "
+
+
+# Folds expressions that only use literals before a program runs, and drops the arms of
+# conditionals that can never be taken. Anything that cannot be evaluated without variables
+# or functions is left as it is, so errors are still reported when the statement runs.
+class Optimizer:
+    def __init__ (self, statements, call_stack):
+        self.statements = statements
+        self.call_stack = call_stack
+
+
+    def optimize(self):
+        for statement in self.statements:
+            kind = statement.kind
+            if kind == "print" or kind == "log" or kind == "return":
+                statement.parameters = self.fold_expression(statement.parameters)
+            elif kind == "set":
+                self.optimize_set(statement)
+            elif kind == "while":
+                statement.while_condition = self.fold_math(statement.while_condition)
+            elif kind == "if" and statement.end != None:
+                self.optimize_chain(statement)
+        return self.statements
+
+
+    def optimize_set(self, statement):
+        assignment = statement.parameters.find(" to ")
+        if assignment > 0:
+            value = statement.parameters[assignment + 4:]
+            statement.parameters = statement.parameters[:assignment + 4] + self.fold_expression(value)
+
+
+    # Arms whose condition is always false are dropped. An arm whose condition is always true
+    # is entered without evaluating it, and the arms after it are dropped.
+    def optimize_chain(self, statement):
+        chain = []
+        for arm, condition, start, stop in statement.chain:
+            if condition != None:
+                condition = self.fold_math(condition)
+                arm.parameters = condition
+                value = Boolean(condition, self.call_stack, {}).try_evaluate()
+                if value == False and type(value) == bool:
+                    continue
+                if value == True and type(value) == bool:
+                    condition = None
+            chain.append((arm, condition, start, stop))
+            if condition == None:
+                break
+        statement.chain = chain
+
+
+    def fold_expression(self, expression):
+        expression = self.fold_math(expression)
+        if len(expression) == 0:
+            return expression
+        value = Expression(expression, self.call_stack, {}).try_evaluate()
+        literal = self.create_literal(value)
+        if literal == None or literal == expression:
+            return expression
+        folded_value = Expression(literal, self.call_stack, {}).try_evaluate()
+        if type(folded_value) != type(value) or folded_value != value:
+            return expression
+        return literal
+
+
+    def fold_math(self, expression):
+        parts = re.split(r"(\"[^\"]*\"|'[^']*')", expression)
+        for i in range(0, len(parts), 2):
+            parts[i] = self.fold_math_groups(parts[i])
+        return ''.join(parts)
+
+
+    def fold_math_groups(self, expression):
+        folded_expression = ""
+        i = 0
+        while i < len(expression):
+            end = -1
+            if expression[i] == "(":
+                end = self.find_closing_parenthesis(expression, i)
+            if end == -1:
+                folded_expression += expression[i]
+                i += 1
+            else:
+                folded_expression += self.fold_math_group(expression[i:end + 1])
+                i = end + 1
+        return folded_expression
+
+
+    # Some nestings of parentheses cannot be compiled by Math. Folding inside them could turn an
+    # expression that fails into one that works, so they are left as they are.
+    def fold_math_group(self, group):
+        if self.compiles(group) == False:
+            return group
+        folded_group = literal_math.sub(self.fold_literal_math, group)
+        while literal_math.search(folded_group) != None:
+            next_group = literal_math.sub(self.fold_literal_math, folded_group)
+            if next_group == folded_group:
+                break
+            folded_group = next_group
+        if folded_group != group and folded_group[0] == "(" and self.compiles(folded_group) == False:
+            return group
+        return folded_group
+
+
+    def compiles(self, group):
+        math = Math(group, self.call_stack, {})
+        program = try_silently(lambda: math.compile(group))
+        if program == failed_evaluation:
+            return False
+        for step in program:
+            if step[0] == "fail":
+                return False
+        return True
+
+
+    def find_closing_parenthesis(self, expression, start):
+        depth = 0
+        for i in range(start, len(expression), 1):
+            if expression[i] == "(":
+                depth += 1
+            elif expression[i] == ")":
+                depth -= 1
+                if depth == 0:
+                    return i
+        return -1
+
+
+    def fold_literal_math(self, match):
+        value = Expression(match.group(0), self.call_stack, {}).try_evaluate()
+        if type(value) != int and type(value) != float:
+            return match.group(0)
+        literal = self.create_literal(value)
+        if literal == None or literal[0] == "-":
+            return match.group(0)
+        return literal
+
+
+    def create_literal(self, value):
+        if type(value) == bool:
+            return str(value).lower()
+        if type(value) == int:
+            return str(value)
+        if type(value) == float:
+            literal = repr(value)
+            if "e" in literal or "n" in literal:
+                return None
+            return literal
+        if type(value) == str:
+            for char in ['"', "\\", "\n"]:
+                if char in value:
+                    return None
+            return '"' + value + '"'
+        return None
+
+
+    def dump(self):
+        return self.dump_block(0, len(self.statements), 0)
+
+
+    def dump_block(self, start, stop, depth):
+        lines = []
+        i = start
+        while i < stop:
+            statement = self.statements[i]
+            if statement.kind == "if" and statement.end != None:
+                lines += self.dump_chain(statement, depth)
+                i = statement.end + 1
+            elif (statement.opens_block() or statement.kind == "function") and statement.end != None:
+                lines.append(indentation * depth + self.dump_statement(statement))
+                lines += self.dump_block(i + 1, statement.end, depth + 1)
+                lines.append(indentation * depth + "end")
+                i = statement.end + 1
+            else:
+                lines.append(indentation * depth + self.dump_statement(statement))
+                i += 1
+        return lines
+
+
+    def dump_chain(self, statement, depth):
+        lines = []
+        header = "if"
+        for arm, condition, start, stop in statement.chain:
+            if condition != None:
+                lines.append(indentation * depth + header + " " + condition)
+            elif header == "if":
+                lines.append(indentation * depth + "if [true]")
+            else:
+                lines.append(indentation * depth + "else")
+            lines += self.dump_block(start, stop, depth + 1)
+            header = "elseIf"
+        if len(lines) > 0:
+            lines.append(indentation * depth + "end")
+        return lines
+
+
+    def dump_statement(self, statement):
+        if statement.kind == "comment" or len(statement.parameters) == 0:
+            return statement.line.strip()
+        if statement.kind == "while":
+            return statement.function + " " + statement.while_condition
+        return statement.function + " " + statement.parameters
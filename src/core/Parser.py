@@ -0,0 +1,96 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+from core.Statement import Statement
+
+
+class Parser:
+    def __init__ (self, lines, file_name, first_line_number):
+        self.lines = lines
+        self.file_name = file_name
+        self.first_line_number = first_line_number
+
+
+    def parse(self):
+        statements = []
+        for i in range(0, len(self.lines), 1):
+            statement = Statement(self.lines[i], self.first_line_number + i, self.file_name)
+            statement.index = i
+            statement.program = statements
+            self.parse_arguments(statement)
+            statements.append(statement)
+        self.index_blocks(statements)
+        return statements
+
+
+    def index_blocks(self, statements):
+        open_blocks = []
+        for statement in statements:
+            kind = statement.kind
+            if statement.opens_block() or kind == "function":
+                if kind == "function":
+                    self.mark_nested_function(open_blocks, statement)
+                open_blocks.append(statement)
+            elif kind == "elseIf" or kind == "else":
+                if len(open_blocks) > 0:
+                    block = open_blocks[-1]
+                    if len(block.arms) > 0:
+                        block.arms[-1].next_arm = statement.index
+                    else:
+                        block.next_arm = statement.index
+                    block.arms.append(statement)
+            elif kind == "end" and len(open_blocks) > 0:
+                block = open_blocks.pop()
+                block.end = statement.index
+                if len(block.arms) > 0:
+                    block.arms[-1].next_arm = statement.index
+                else:
+                    block.next_arm = statement.index
+                for arm in block.arms:
+                    arm.end = statement.index
+                if block.kind == "if":
+                    self.index_chain(block)
+
+
+    def index_chain(self, statement):
+        statement.chain = []
+        for arm in [statement] + statement.arms:
+            condition = arm.parameters
+            if arm.kind == "else":
+                condition = None
+            statement.chain.append((arm, condition, arm.index + 1, arm.next_arm))
+
+
+    def mark_nested_function(self, open_blocks, function):
+        for block in open_blocks:
+            if block.nested_function == None:
+                block.nested_function = function
+            for arm in block.arms:
+                if arm.nested_function == None:
+                    arm.nested_function = function
+
+
+    def parse_arguments(self, statement):
+        if statement.kind == "repeat":
+            self.parse_repeat(statement)
+        elif statement.kind == "while":
+            statement.while_condition = ' '.join(statement.parameters.split())
+        elif statement.kind == "for":
+            statement.for_parameters = statement.parameters.split()
+
+
+    def parse_repeat(self, statement):
+        parameters = ' '.join(statement.parameters.split())
+        parameter_tokens = parameters.split(",")
+        statement.repeat_count = parameter_tokens[0]
+        statement.repeat_options = []
+        for option_token in parameter_tokens[1:]:
+            option_token = option_token.strip()
+            if option_token[:8] == "counter ":
+                statement.repeat_options.append(("counter", option_token[8:]))
+            elif option_token[:5] == "step ":
+                statement.repeat_options.append(("step", option_token[5:]))
+            elif option_token[:6] == "start ":
+                statement.repeat_options.append(("start", option_token[6:]))
+            else:
+                statement.repeat_options.append((None, option_token))
@@ -5,6 +5,8 @@ from colors import color
 import types
 from core.Fail import fail
 from core.Expression import Expression
+from core.Array import is_array
+from core.Set import Set
 
 
 class Printer:
@@ -18,10 +20,18 @@ class Printer:
 
     def print(self):
         expression = Expression(self.expression, self.call_stack, self.variables)
-        self.expression = expression.evaluate()
+        self.print_value(expression.evaluate())
 
-        if type(self.expression) == list:
+
+    def print_value(self, value):
+        self.expression = value
+
+        if is_array(self.expression):
             self.expression = self.stringify_array(self.expression)
+        elif type(self.expression) == dict:
+            self.expression = self.stringify_map(self.expression)
+        elif type(self.expression) == Set:
+            self.expression = self.stringify_set(self.expression)
         elif self.expression == str:
             self.expression = "@Type:String"
         elif self.expression == int or self.expression == float:
@@ -30,6 +40,10 @@ class Printer:
             self.expression = "@Type:Boolean"
         elif self.expression == list:
             self.expression = "@Type:Array"
+        elif self.expression == dict:
+            self.expression = "@Type:Map"
+        elif self.expression == Set:
+            self.expression = "@Type:Set"
         elif self.expression == types.FunctionType:
             self.expression = "@Type:Function"
         else:
@@ -48,23 +62,45 @@ class Printer:
     def stringify_array(self, array):
         array_string = "<"
         for element in array:
-            if type(element) != list:
-                if type(element) == str:
-                    element = "'" + element + "'"
-                elif element == str:
-                    element = "@Type:String"
-                else:
-                    element = str(element)
-                if element == "True" or element == "False":
-                    element = element.lower()
-                array_string += element + ", "
-            else:
-                array_string += self.stringify_array(element) + ", "
+            array_string += self.stringify_element(element) + ", "
         if len(array_string) >= 2:
             if array_string[-2] == ",":
                 array_string = array_string[:-2]
         array_string += ">"
         return array_string
+
+
+    def stringify_map(self, map_object):
+        map_string = "{"
+        for key in map_object:
+            map_string += self.stringify_element(key) + ": " + self.stringify_element(map_object[key]) + ", "
+        if len(map_string) >= 2:
+            if map_string[-2] == ",":
+                map_string = map_string[:-2]
+        map_string += "}"
+        return map_string
+
+
+    def stringify_set(self, set_object):
+        return "{" + ', '.join([self.stringify_element(value) for value in set_object]) + "}"
+
+
+    def stringify_element(self, element):
+        if is_array(element):
+            return self.stringify_array(element)
+        if type(element) == dict:
+            return self.stringify_map(element)
+        if type(element) == Set:
+            return self.stringify_set(element)
+        if type(element) == str:
+            element = "'" + element + "'"
+        elif element == str:
+            element = "@Type:String"
+        else:
+            element = str(element)
+        if element == "True" or element == "False":
+            element = element.lower()
+        return element
             
 
     def print_switch(self):
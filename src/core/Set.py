@@ -0,0 +1,87 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+# Sets keep their values as the keys of a dictionary, so membership is checked in constant time
+# and values stay in the order they were added, which keeps printing sets deterministic.
+class Set:
+    def __init__ (self, values=()):
+        self.values = dict.fromkeys(values)
+
+
+    def add(self, value):
+        self.values[value] = None
+
+
+    def remove(self, value):
+        del self.values[value]
+
+
+    def union(self, other):
+        union = Set(self.values)
+        union.values.update(other.values)
+        return union
+
+
+    def intersection(self, other):
+        return Set([value for value in self.values if value in other.values])
+
+
+    def difference(self, other):
+        return Set([value for value in self.values if value not in other.values])
+
+
+    def __contains__(self, value):
+        return value in self.values
+
+
+    def __iter__(self):
+        return iter(self.values)
+
+
+    def __len__(self):
+        return len(self.values)
+
+
+    def __repr__(self):
+        return "{" + ', '.join([repr(value) for value in self.values]) + "}"
+
+
+    # Sets are equal when they hold the same values, and one set is less than another
+    # when it is a proper subset of it.
+    def __eq__(self, other):
+        if type(other) != Set:
+            return NotImplemented
+        return self.values.keys() == other.values.keys()
+
+
+    def __ne__(self, other):
+        if type(other) != Set:
+            return NotImplemented
+        return self.values.keys() != other.values.keys()
+
+
+    def __lt__(self, other):
+        if type(other) != Set:
+            return NotImplemented
+        return self.values.keys() < other.values.keys()
+
+
+    def __le__(self, other):
+        if type(other) != Set:
+            return NotImplemented
+        return self.values.keys() <= other.values.keys()
+
+
+    def __gt__(self, other):
+        if type(other) != Set:
+            return NotImplemented
+        return self.values.keys() > other.values.keys()
+
+
+    def __ge__(self, other):
+        if type(other) != Set:
+            return NotImplemented
+        return self.values.keys() >= other.values.keys()
+
+
+    __hash__ = None
@@ -0,0 +1,46 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+from core.Line import Line
+
+
+class Statement(Line):
+    def __init__ (self, line, line_number, file_name):
+        super().__init__(line.lstrip(), line_number, file_name)
+        self.function = self.line.split(' ')[0].strip()
+        self.parameters = self.line[len(self.function)+1:].strip()
+        self.kind = self.get_kind(self.function)
+        self.index = 0
+        self.program = [self]
+        self.end = None
+        self.next_arm = None
+        self.nested_function = None
+        self.arms = []
+        self.chain = []
+
+
+    def get_kind(self, function):
+        if function[:1] == "#" or function == "":
+            return "comment"
+        elif function in ["if", "elseIf", "else", "repeat", "while", "for", "function", "return", "end",
+                          "set", "merge", "sleep", "exit"]:
+            return function
+        elif function[:5] == "print":
+            return "print"
+        elif function[:3] == "log":
+            return "log"
+        elif function == "append" or function == "prepend" or function == "push":
+            return "append"
+        elif function == "put":
+            return "put"
+        elif function == "add":
+            return "add"
+        elif function == "pop" or function == "removeFirst" or function == "removeLast" or function == "remove":
+            return "remove"
+        elif function == "sort" or function == "sortReverse":
+            return "sort"
+        return "call"
+
+
+    def opens_block(self):
+        return self.kind == "if" or self.kind == "repeat" or self.kind == "while" or self.kind == "for"
@@ -0,0 +1,70 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+from collections import OrderedDict
+
+default_token_cache_size = 1024
+default_function_cache_size = 1024
+
+
+class TokenCache:
+    def __init__ (self, size, name="Token cache"):
+        self.size = size
+        self.name = name
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def get(self, tokenizer, expression):
+        key = (tokenizer, expression)
+        tokens = self.entries.get(key)
+        if tokens == None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        if type(tokens) == list:
+            return list(tokens)
+        return tokens
+
+
+    def put(self, tokenizer, expression, tokens):
+        if self.size <= 0:
+            return
+        if type(tokens) == list:
+            tokens = list(tokens)
+        self.entries[(tokenizer, expression)] = tokens
+        self.evict()
+
+
+    def resize(self, size):
+        self.size = size
+        self.evict()
+
+
+    def evict(self):
+        while len(self.entries) > max(self.size, 0):
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def get_stats(self):
+        return "%s: %d hits, %d misses, %d evictions (%d/%d entries)" % (
+            self.name, self.hits, self.misses, self.evictions, len(self.entries), self.size)
+
+
+token_cache = TokenCache(default_token_cache_size)
+# compiled programs are immutable, so they are shared instead of copied
+program_cache = TokenCache(default_token_cache_size, "Program cache")
+call_site_cache = TokenCache(default_token_cache_size, "Call site cache")
+# return values of cached functions keyed by function and arguments
+function_cache = TokenCache(default_function_cache_size, "Function cache")
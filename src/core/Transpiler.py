@@ -0,0 +1,299 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+# Translates statements into a Python function where variables are Python locals.
+# Statements that cannot be translated are handed back to the interpreter, with the
+# locals stored to and loaded from the variables of the current scope around them.
+
+from core.NativeExpression import NativeExpression
+from core.Function import get_function_name
+
+STORE = "\0store"
+LOAD = "\0load"
+
+
+class Transpiler:
+    def __init__ (self, statements, file_name):
+        self.statements = statements
+        self.file_name = file_name
+        self.program = statements
+        self.function_names = []
+        self.source = []
+        self.entries = []
+        self.names = []
+        self.temporary_count = 0
+
+
+    def compile(self, namespace):
+        source = self.transpile()
+        namespace["S"] = self.entries
+        namespace["NAMES"] = self.names
+        exec(compile(source, "<" + self.file_name + ">", "exec"), namespace)
+        return namespace["run"]
+
+
+    def transpile(self):
+        self.source = []
+        if len(self.statements) > 0:
+            self.program = self.statements[0].program
+            self.function_names = self.get_function_names()
+            self.transpile_block(self.statements[0].index, self.statements[-1].index + 1, (), 1)
+        self.emit(STORE, 1)
+        arguments = ["rt", "variables", "S=S", "NAMES=NAMES"]
+        for name in ["UNDEFINED", "defined", "number", "power", "root_of", "boolean_operand", "equals", "not_equals",
+                     "less_than", "less_than_equals", "greater_than", "greater_than_equals", "boolean_and",
+                     "boolean_or", "store", "load", "finish"]:
+            arguments.append(name + "=" + name)
+        lines = ["def run(" + ', '.join(arguments) + "):"]
+        if len(self.names) > 0:
+            lines.append("    " + self.get_load())
+        for line in self.source:
+            indent = line[:len(line) - len(line.lstrip(" "))]
+            if line.lstrip(" ") == STORE:
+                if len(self.names) > 0:
+                    lines.append(indent + self.get_store())
+            elif line.lstrip(" ") == LOAD:
+                if len(self.names) > 0:
+                    lines.append(indent + self.get_load())
+            else:
+                lines.append(line)
+        return '\n'.join(lines) + "\n"
+
+
+    def get_store(self):
+        return "store(variables, NAMES, (" + ''.join(["v_" + name + ", " for name in self.names]) + "))"
+
+
+    def get_load(self):
+        return ''.join(["v_" + name + ", " for name in self.names]) + "= load(variables, NAMES)"
+
+
+    def get_function_names(self):
+        function_names = []
+        for statement in self.program:
+            if statement.kind == "function":
+                function_names.append(get_function_name(statement.parameters))
+        return function_names
+
+
+    def transpile_block(self, start, stop, path, indent):
+        source_length = len(self.source)
+        i = start
+        while i < stop:
+            statement = self.program[i]
+            kind = statement.kind
+            if kind == "comment":
+                pass
+            elif statement.opens_block() or kind == "function":
+                if statement.end == None or statement.nested_function != None or kind == "function":
+                    self.emit_block_fallback(statement, path, indent)
+                    if statement.end == None or statement.nested_function != None:
+                        i += 1
+                        continue
+                elif kind == "if":
+                    self.transpile_conditional(statement, path, indent)
+                elif kind == "while":
+                    self.transpile_while(statement, path, indent)
+                else:
+                    self.transpile_loop(statement, path, indent)
+                i = statement.end
+            elif kind == "set":
+                self.transpile_set(statement, path, indent)
+            elif kind == "print":
+                self.transpile_print(statement, path, indent)
+            elif kind == "return":
+                self.transpile_return(statement, path, indent)
+            else:
+                self.emit_fallback("rt.execute(" + self.entry(statement, path) + ")", indent)
+            i += 1
+        if len(self.source) == source_length:
+            self.emit("pass", indent)
+
+
+    def transpile_set(self, statement, path, indent):
+        parameter_tokens = statement.parameters.split(None, 2)
+        value = None
+        if len(parameter_tokens) == 3 and parameter_tokens[1] == "to":
+            variable = parameter_tokens[0]
+            expression = NativeExpression(variable, self.function_names)
+            if expression.tokenize() and len(expression.tokens) == 1 and expression.is_native_name(variable, False):
+                value = self.translate(parameter_tokens[2], "value")
+        if value == None:
+            self.emit_fallback("rt.execute(" + self.entry(statement, path) + ")", indent)
+            return
+        self.emit("try:", indent)
+        self.emit(self.local(variable) + " = " + value, indent + 1)
+        self.emit("except Exception:", indent)
+        self.emit_fallback("rt.execute(" + self.entry(statement, path) + ")", indent + 1)
+
+
+    def transpile_print(self, statement, path, indent):
+        value = None
+        if statement.function == "print":
+            value = self.translate(statement.parameters, "value")
+        if value == None:
+            self.emit_fallback("rt.execute(" + self.entry(statement, path) + ")", indent)
+            return
+        entry = self.entry(statement, path)
+        temporary = self.temporary()
+        self.emit("try:", indent)
+        self.emit(temporary + " = " + value, indent + 1)
+        self.emit("except Exception:", indent)
+        self.emit_fallback("rt.execute(" + entry + ")", indent + 1)
+        self.emit("else:", indent)
+        self.emit("rt.print_value(" + entry + ", " + temporary + ")", indent + 1)
+
+
+    def transpile_return(self, statement, path, indent):
+        value = self.translate(statement.parameters, "value")
+        if value == None or self.statements is self.program:
+            self.emit(STORE, indent)
+            self.emit("rt.execute(" + self.entry(statement, path) + ")", indent)
+            self.emit("return -1", indent)
+            return
+        temporary = self.temporary()
+        self.emit("try:", indent)
+        self.emit(temporary + " = " + value, indent + 1)
+        self.emit("except Exception:", indent)
+        self.emit(STORE, indent + 1)
+        self.emit("rt.execute(" + self.entry(statement, path) + ")", indent + 1)
+        self.emit("return -1", indent + 1)
+        self.emit("rt.set_return_value(" + temporary + ")", indent)
+        self.emit(STORE, indent)
+        self.emit("return -1", indent)
+
+
+    def transpile_conditional(self, statement, path, indent):
+        if len(statement.chain) == 0:
+            return
+        arm = self.temporary()
+        selection = ""
+        needs_store = False
+        arm_number = 0
+        for header, condition, start, stop in statement.chain:
+            arm_number += 1
+            if condition == None:
+                selection += str(arm_number)
+                break
+            native_condition = self.translate(condition, "condition")
+            if native_condition == None:
+                native_condition = "rt.condition(" + self.entry(header, path) + ")"
+                needs_store = True
+            selection += str(arm_number) + " if " + native_condition + " == True else "
+        if condition != None:
+            selection += "0"
+        if needs_store:
+            self.emit(STORE, indent)
+        self.emit("try:", indent)
+        self.emit(arm + " = " + selection, indent + 1)
+        self.emit("except Exception:", indent)
+        if needs_store == False:
+            self.emit(STORE, indent + 1)
+        self.emit(arm + " = rt.select_arm(" + self.entry(statement, path) + ")", indent + 1)
+        arm_number = 0
+        for header, condition, start, stop in statement.chain:
+            arm_number += 1
+            if arm_number == 1:
+                self.emit("if " + arm + " == 1:", indent)
+            else:
+                self.emit("elif " + arm + " == " + str(arm_number) + ":", indent)
+            self.transpile_block(start, stop, path + (header,), indent + 1)
+
+
+    def transpile_while(self, statement, path, indent):
+        condition = self.translate(statement.while_condition, "condition")
+        entry = self.entry(statement, path)
+        temporary = self.temporary()
+        self.emit("while True:", indent)
+        if condition == None:
+            self.emit_fallback(temporary + " = rt.while_condition(" + entry + ")", indent + 1)
+        else:
+            self.emit("try:", indent + 1)
+            self.emit(temporary + " = " + condition, indent + 2)
+            self.emit("except Exception:", indent + 1)
+            self.emit_fallback(temporary + " = rt.while_condition(" + entry + ")", indent + 2)
+        self.emit("if " + temporary + " != True:", indent + 1)
+        self.emit("break", indent + 2)
+        self.transpile_block(statement.index + 1, statement.end, path + (statement,), indent + 1)
+
+
+    def transpile_loop(self, statement, path, indent):
+        variable = self.get_loop_variable(statement)
+        if variable == False:
+            self.emit_block_fallback(statement, path, indent)
+            return
+        loop = self.temporary()
+        if statement.kind == "repeat":
+            self.emit_fallback(loop + " = rt.start_repeat(" + self.entry(statement, path) + ")", indent)
+        else:
+            self.emit_fallback(loop + " = rt.start_for(" + self.entry(statement, path) + ")", indent)
+        if variable == None:
+            self.emit("for _ in " + loop + ".values:", indent)
+        else:
+            self.emit("for " + self.local(variable) + " in " + loop + ".values:", indent)
+        self.transpile_block(statement.index + 1, statement.end, path + (statement,), indent + 1)
+        if variable != None:
+            self.emit(self.local(variable) + " = finish(" + loop + ", " + self.local(variable) + ")", indent)
+
+
+    def get_loop_variable(self, statement):
+        if statement.kind == "repeat":
+            counters = [value for option, value in statement.repeat_options if option == "counter"]
+            if len(counters) == 0:
+                return None
+            if len(counters) > 1:
+                return False
+            variable = counters[0]
+        else:
+            if len(statement.for_parameters) < 3:
+                return False
+            variable = statement.for_parameters[0]
+        expression = NativeExpression(variable, self.function_names)
+        if expression.tokenize() and len(expression.tokens) == 1 and expression.is_native_name(variable, False):
+            return variable
+        return False
+
+
+    def translate(self, expression, context):
+        native_expression = NativeExpression(expression, self.function_names)
+        if context == "condition":
+            source = native_expression.translate_condition()
+        else:
+            source = native_expression.translate_value()
+        if source != None:
+            for name in native_expression.names:
+                self.local(name)
+        return source
+
+
+    def local(self, name):
+        if name not in self.names:
+            self.names.append(name)
+        return "v_" + name
+
+
+    def entry(self, statement, path):
+        self.entries.append((statement, path))
+        return "S[" + str(len(self.entries) - 1) + "]"
+
+
+    def temporary(self):
+        self.temporary_count += 1
+        return "t_" + str(self.temporary_count)
+
+
+    def emit_block_fallback(self, statement, path, indent):
+        self.emit(STORE, indent)
+        self.emit("if rt.execute(" + self.entry(statement, path) + ") == -1:", indent)
+        self.emit("return -1", indent + 1)
+        self.emit(LOAD, indent)
+
+
+    def emit_fallback(self, line, indent):
+        self.emit(STORE, indent)
+        self.emit(line, indent)
+        self.emit(LOAD, indent)
+
+
+    def emit(self, line, indent):
+        self.source.append("    " * indent + line)
@@ -0,0 +1,8 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+# Variables of a call to a function that has been specialized for the types of its arguments.
+# number_names are parameters that hold numbers for the whole call, so they can be used
+# without checking their type.
+class TypedFrame(dict):
+    number_names = frozenset()
@@ -29,9 +29,9 @@ class timeout():
        self.exit=True
 
 
-@pytest.fixture(scope='function')
+@pytest.fixture(scope='function', params=["interpreter", "native"])
 def interpreter(request):
-    return Interpreter("test")
+    return Interpreter("test", request.param)
 
 
 def assert_stack_trace(interpreter, script, line_numbers):
@@ -811,6 +811,156 @@ remove 1 from x into y into
     assert_error(interpreter, script)
 
 
+# ARRAYS USED AS QUEUES
+def test_array_can_be_used_as_queue(interpreter):
+    script = """
+set x to <1, 2>
+push 0 to x
+append 3 to x
+pop from x into front
+removeLast from x into back
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == [1, 2]
+    assert interpreter.variables['front'] == 0
+    assert interpreter.variables['back'] == 3
+
+def test_array_changed_at_both_ends_can_be_indexed_sliced_and_printed(capfd, interpreter):
+    script = """
+set x to <2, 3, 4>
+prepend 1 to x
+removeLast from x
+print x<0>
+print x<1:end>
+print x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "1\n<2, 3>\n<1, 2, 3>\n"
+
+def test_removing_from_array_does_not_change_other_variables(interpreter):
+    script = """
+set x to <1, 2, 3>
+set y to x
+pop from x
+removeLast from x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == [2]
+    assert interpreter.variables['y'] == [1, 2, 3]
+
+def test_array_sharing_values_with_removed_array_can_be_changed(interpreter):
+    script = """
+set x to <1, 2, 3>
+set y to x
+pop from x
+append 4 to x
+append 5 to y
+prepend 0 to x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == [0, 2, 3, 4]
+    assert interpreter.variables['y'] == [1, 2, 3, 5]
+
+def test_for_visits_values_removed_while_iterating(interpreter):
+    script = """
+set x to <1, 2, 3, 4, 5, 6>
+set seen to <>
+for value in x
+    append value to seen
+    removeFirst from x
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['seen'] == [1, 2, 3, 4, 5, 6]
+    assert interpreter.variables['x'] == []
+
+def test_for_visits_values_appended_while_iterating(interpreter):
+    script = """
+set x to <1>
+set seen to <>
+for value in x
+    append value to seen
+    if [value lessThan 5]
+        append (value + 1) to x
+    end
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['seen'] == [1, 2, 3, 4, 5]
+
+
+# NUMBER ARRAYS
+def test_number_array_supports_array_operations(capfd, interpreter):
+    script = """
+set x to numbers <3, 1, 2>
+append 4 to x
+push 0 to x
+removeLast from x into removed
+remove 1 from x
+sort x
+print x
+print x<1:end>
+print type x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['removed'] == 4
+    assert capfd.readouterr().out == "<0, 1, 2>\n<1, 2>\n@Type:Array\n"
+
+def test_number_array_keeps_integers_after_decimal_is_added(interpreter):
+    script = """
+set x to numbers <1, 2>
+append 2.5 to x
+set head to x<0>
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == [1, 2, 2.5]
+    assert type(interpreter.variables['head']) == int
+
+def test_number_array_can_be_iterated(interpreter):
+    script = """
+set x to numbers <1, 2.5, 3>
+set total to 0
+for value in x
+    set total to (total + value)
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['total'] == 6.5
+
+def test_arrays_can_be_merged_into_number_array(interpreter):
+    script = """
+set x to numbers <1>
+set y to <2>
+append 3.5 to y
+merge y into x
+merge x into x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == [1, 2, 3.5, 1, 2, 3.5]
+
+def test_variable_named_numbers_is_not_a_number_array(capfd, interpreter):
+    script = """
+set numbers to "abc"
+print numbers . "!"
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "abc!\n"
+
+def test_string_cannot_be_appended_to_number_array(interpreter):
+    script = """
+set x to numbers <1>
+append "a" to x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+def test_array_of_strings_cannot_be_merged_into_number_array(interpreter):
+    script = """
+set x to numbers <1>
+merge <2, "a"> into x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+
 # MERGE
 def test_two_arrays_can_be_merged(interpreter):
     script = """
@@ -848,6 +998,34 @@ merge <4, 5> into xinto
     assert_success(interpreter, script)
     assert interpreter.variables['xinto'] == [1, 2, 3, 4, 5]
 
+def test_merge_changes_into_array_in_place(interpreter):
+    script = """
+set x to <1, 2>
+set y to x
+merge <3, 4> into x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['y'] == [1, 2, 3, 4]
+
+def test_merge_does_not_change_from_array(interpreter):
+    script = """
+set x to <1, 2>
+set y to <3>
+merge y into x
+append 4 to x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == [1, 2, 3, 4]
+    assert interpreter.variables['y'] == [3]
+
+def test_array_can_be_merged_into_itself(interpreter):
+    script = """
+set x to <1, 2>
+merge x into x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == [1, 2, 1, 2]
+
 def test_string_cannot_be_merged_into_an_array(interpreter):
     script = """
 set x to <1, 2, 3>
@@ -0,0 +1,239 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+from Interpreter_test_util import *
+from Interpreter import Interpreter
+
+
+# PUT
+def test_value_can_be_put_in_map(interpreter):
+    script = """
+set x to {"a": 1}
+put 2 at "b" in x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == {'a': 1, 'b': 2}
+
+def test_put_replaces_existing_value(interpreter):
+    script = """
+set x to {"a": 1}
+put <1, 2> at "a" in x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == {'a': [1, 2]}
+
+def test_put_can_use_expressions(interpreter):
+    script = """
+set x to map
+set key to "b"
+put "value " . (1 + 1) at "a" . key in x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == {'ab': 'value 2'}
+
+def test_put_changes_map_in_place(interpreter):
+    script = """
+set x to map
+set y to x
+put 1 at "a" in x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['y'] == {'a': 1}
+
+def test_put_will_fail_if_in_keyword_is_missing(interpreter):
+    script = """
+set x to map
+put 1 at "a" x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+def test_put_will_fail_if_at_keyword_is_missing(interpreter):
+    script = """
+set x to map
+put 1 in x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+def test_put_will_fail_if_map_does_not_exist(interpreter):
+    script = """
+put 1 at "a" in x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+def test_put_will_fail_on_array(interpreter):
+    script = """
+set x to <1>
+put 1 at 0 in x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+def test_put_will_fail_if_key_is_an_array(interpreter):
+    script = """
+set x to map
+put 1 at <1> in x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+
+# GET
+def test_value_can_be_read_from_map(capfd, interpreter):
+    script = """
+set x to {"a": 1, "b": <2, 3>}
+set key to "b"
+print x<"a">
+print x<key><1>
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "1\n3\n"
+
+def test_reading_missing_key_fails(interpreter):
+    script = """
+set x to {"a": 1}
+print x<"b">
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+
+# REMOVE
+def test_value_can_be_removed_from_map(interpreter):
+    script = """
+set x to {"a": 1, "b": 2}
+remove "a" from x into removed
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == {'b': 2}
+    assert interpreter.variables['removed'] == 1
+
+def test_removing_missing_key_fails(interpreter):
+    script = """
+set x to {"a": 1}
+remove "b" from x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+def test_pop_from_map_fails(interpreter):
+    script = """
+set x to {"a": 1}
+pop from x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+
+# CONTAINS
+def test_map_contains_key(capfd, interpreter):
+    script = """
+set x to {"a": 1}
+if [x contains "a"]
+    print "a"
+end
+if [x contains "b"]
+    print "b"
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "a\n"
+
+
+# EQUALS
+def test_maps_can_be_compared(capfd, interpreter):
+    script = """
+set x to {"a": 1, "b": <1, 2>}
+set y to {"b": <1, 2>, "a": 1}
+set z to {"a": 2}
+if [x equals y]
+    print "equal"
+end
+if [x notEquals z]
+    print "not equal"
+end
+if [x equals z]
+    print "wrong"
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "equal\nnot equal\n"
+
+def test_maps_cannot_be_ordered(interpreter):
+    script = """
+set x to {"a": 1}
+if [x lessThan x]
+    print "wrong"
+end
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+def test_map_cannot_be_compared_to_array(interpreter):
+    script = """
+set x to {"a": 1}
+if [x equals <1>]
+    print "wrong"
+end
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+
+# FOR
+def test_for_iterates_over_keys_of_map(capfd, interpreter):
+    script = """
+set x to {"a": 1, "b": 2}
+for key in x
+    print key . " " . x<key>
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "a 1\nb 2\n"
+
+def test_map_can_be_changed_while_iterating(interpreter):
+    script = """
+set x to {"a": 1, "b": 2}
+for key in x
+    remove key from x
+    put 1 at key . key in x
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == {'aa': 1, 'bb': 1}
+
+
+# PRINT AND TYPE
+def test_map_can_be_printed(capfd, interpreter):
+    script = """
+set x to {"a": 1, 2: <"b">, "c": {"d": true}}
+print x
+print type x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "{'a': 1, 2: <'b'>, 'c': {'d': true}}\n@Type:Map\n"
+
+def test_map_type_can_be_compared(capfd, interpreter):
+    script = """
+set x to map
+if [type x equals @Type:Map]
+    print "map"
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "map\n"
+
+
+# FUNCTIONS
+def test_map_can_be_passed_to_and_returned_from_function(interpreter):
+    script = """
+function withValue(m, key)
+    put true at key in m
+    return m
+end
+set x to withValue({"a": 1, "b": 2}, "c")
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == {'a': 1, 'b': 2, 'c': True}
+
+def test_map_values_can_call_functions(interpreter):
+    script = """
+function double(n)
+    return (n * 2)
+end
+set x to {"a": double(2)}
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == {'a': 4}
@@ -0,0 +1,176 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+from Interpreter_test_util import *
+from Interpreter import Interpreter
+from core.Set import Set
+
+
+# ADD
+def test_value_can_be_added_to_set(interpreter):
+    script = """
+set x to {1, 2}
+add 3 to x
+add 1 to x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == Set([1, 2, 3])
+
+def test_value_can_be_added_to_empty_set(interpreter):
+    script = """
+set x to emptySet
+add "a" . "b" to x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == Set(['ab'])
+
+def test_add_changes_set_in_place(interpreter):
+    script = """
+set x to emptySet
+set y to x
+add 1 to x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['y'] == Set([1])
+
+def test_add_will_fail_if_to_keyword_is_missing(interpreter):
+    script = """
+set x to emptySet
+add 1 x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+def test_add_will_fail_on_array(interpreter):
+    script = """
+set x to <1>
+add 1 to x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+def test_add_will_fail_if_value_is_an_array(interpreter):
+    script = """
+set x to emptySet
+add <1> to x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+
+# REMOVE
+def test_value_can_be_removed_from_set(interpreter):
+    script = """
+set x to {1, 2}
+remove 1 from x into removed
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == Set([2])
+    assert interpreter.variables['removed'] == 1
+
+def test_removing_missing_value_fails(interpreter):
+    script = """
+set x to {1, 2}
+remove 3 from x
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+
+# CONTAINS
+def test_set_contains_value(capfd, interpreter):
+    script = """
+set x to {"a", "b"}
+if [x contains "a"]
+    print "a"
+end
+if [x contains "c"]
+    print "c"
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "a\n"
+
+
+# OPERATIONS
+def test_set_operations(capfd, interpreter):
+    script = """
+set x to {1, 2, 3}
+set y to {2, 3, 4}
+print x union y
+print x intersection y
+print x difference y
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "{1, 2, 3, 4}\n{2, 3}\n{1}\n"
+
+def test_set_operations_do_not_change_operands(interpreter):
+    script = """
+set x to {1, 2}
+set y to x union {3}
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == Set([1, 2])
+    assert interpreter.variables['y'] == Set([1, 2, 3])
+
+def test_set_operations_can_use_function_results(interpreter):
+    script = """
+function values()
+    return {1, 2}
+end
+set x to values() intersection {2, 3}
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['x'] == Set([2])
+
+def test_set_operation_fails_on_array(interpreter):
+    script = """
+set x to <1, 2> union {3}
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+
+# EQUALS
+def test_sets_can_be_compared(capfd, interpreter):
+    script = """
+set x to {1, 2}
+set y to {2, 1}
+set z to {1}
+if [x equals y]
+    print "equal"
+end
+if [x notEquals z]
+    print "not equal"
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "equal\nnot equal\n"
+
+def test_set_cannot_be_compared_to_map(interpreter):
+    script = """
+set x to {1, 2}
+if [x equals {"a": 1}]
+    print "wrong"
+end
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+
+# FOR
+def test_for_iterates_over_values_of_set_in_order_added(capfd, interpreter):
+    script = """
+set x to {"b", "a"}
+add "c" to x
+for value in x
+    print value
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "b\na\nc\n"
+
+
+# PRINT AND TYPE
+def test_set_can_be_printed(capfd, interpreter):
+    script = """
+set x to {1, "a", false}
+print x
+print type x
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert capfd.readouterr().out == "{1, 'a', false}\n@Type:Set\n"
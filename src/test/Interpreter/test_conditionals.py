@@ -359,6 +359,56 @@ print x
     assert_code_works_in_REPL(capfd, script, 'Changed by if in else on second if chain\n')
 
 
+def test_else_follows_arm_that_ends_with_nested_if(interpreter):
+    script = """
+set x to "Unchanged"
+if [false]
+    set x to "Changed by if"
+elseIf [true]
+    if [true]
+        set x to "Changed by nested if"
+    end
+else
+    set x to "Changed by else"
+end
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables["x"] == 'Changed by nested if'
+def test_else_follows_arm_that_ends_with_nested_if_REPL(capfd):
+    script = """
+set x to "Unchanged"
+if [true]
+    if [true]
+        set x to "Changed by nested if"
+    end
+else
+    set x to "Changed by else"
+end
+print x
+""".splitlines(True)
+    assert_code_works_in_REPL(capfd, script, 'Changed by nested if\n')
+
+
+def test_only_first_true_arm_of_long_chain_executes(interpreter):
+    script = """
+set x to 3
+set y to 0
+if [x equals 1]
+    set y to 1
+elseIf [x equals 2]
+    set y to 2
+elseIf [x equals 3]
+    set y to 3
+elseIf [x equals 3]
+    set y to 4
+else
+    set y to 5
+end
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables["y"] == 3
+
+
 def test_when_all_ifs_are_false_no_else_or_elseif_will_execute(interpreter):
     script = """
 set x to "Unchanged"
@@ -706,4 +756,36 @@ if [true]
 end
 """.splitlines(True)
     assert_stack_trace(interpreter, script, [3, 2])
-    assert_stack_trace_REPL(capfd, script, [3, 2])
\ No newline at end of file
+    assert_stack_trace_REPL(capfd, script, [3, 2])
+
+def test_arms_that_are_never_taken_are_not_run(interpreter):
+    script = """
+set x to 0
+if [false]
+    set x to 1
+elseIf [(1 + 1) equals 3]
+    set x to 2
+elseIf [x equals 0]
+    set x to 3
+else
+    set x to 4
+end
+if [false]
+    set x to y
+end
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables["x"] == 3
+
+def test_dump_optimized_prints_program_instead_of_running_it(capfd, interpreter):
+    script = """
+set x to (60 * 60)
+if [false]
+    print x
+end
+print x
+""".splitlines(True)
+    interpreter.dump_optimized = True
+    interpreter.run_script(script, None)
+    assert capfd.readouterr().out == "\nset x to 3600\nprint x\n"
+    assert "x" not in interpreter.variables
@@ -3,6 +3,8 @@
 
 from Interpreter_test_util import *
 from Interpreter import Interpreter
+from core.TokenCache import function_cache
+import sys
 
 
 # FUNCTIONS DEFINITION
@@ -285,6 +287,148 @@ set returnValue to [true and returnBool()]
     interpreter.run_script(script, None)
     assert interpreter.variables['returnValue'] == True
 
+def test_array_return_value_of_function_is_passed_as_value(interpreter):
+    script = """
+function returnArray()
+    return <"a b", "c">
+end
+set arrayValue to returnArray()
+set stringValue to "hello" . returnArray()
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['arrayValue'] == ["a b", "c"]
+    assert interpreter.variables['stringValue'] == "hello<'a b', 'c'>"
+
+def test_return_value_of_nested_call_does_not_stay_in_function_scope(interpreter):
+    script = """
+function inner()
+    return "inner"
+end
+function outer()
+    return inner()
+end
+set a to outer()
+set b to outer()
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['a'] == "inner"
+    assert interpreter.variables['b'] == "inner"
+
+def test_return_value_is_not_left_in_scope_after_last_statement(interpreter):
+    script = """
+function word()
+    return "abc"
+end
+set s to word()
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['s'] == "abc"
+    assert [name for name in interpreter.variables if name[0] == "_"] == []
+
+def test_return_value_is_not_left_in_scope_after_error(interpreter):
+    script = """
+function word()
+    return "abc"
+end
+set s to word() . undefinedVariable
+""".splitlines(True)
+    assert_error(interpreter, script)
+    assert [name for name in interpreter.variables if name[0] == "_"] == []
+
+def test_return_values_of_loop_headers_are_not_left_in_scope(interpreter):
+    script = """
+function values()
+    return <1, 2>
+end
+function word()
+    return "abc"
+end
+for value in values()
+    set final to value
+end
+while [word() notEquals "abc"]
+    print "unreachable"
+end
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['final'] == 2
+    assert [name for name in interpreter.variables if name[0] == "_"] == []
+
+def test_function_name_inside_another_function_name_is_not_called(interpreter):
+    script = """
+function f(x)
+    return 100
+end
+function half(x)
+    return (x / 2)
+end
+set returnValue to (half(4) + 1)
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['returnValue'] == 3
+
+def test_type_of_function_in_boolean_expression(interpreter):
+    script = """
+function test()
+    return 1
+end
+set returnValue to [type test equals @Type:Function]
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['returnValue'] == True
+
+def test_cached_function_returns_cached_result(interpreter):
+    script = """
+function cached fib(n)
+    if [n lessThan 2]
+        return n
+    end
+    return (fib((n - 1)) + fib((n - 2)))
+end
+set val to fib(20)
+""".splitlines(True)
+    function_cache.clear()
+    interpreter.run_script(script, None)
+    assert interpreter.variables['val'] == 6765
+    assert function_cache.misses == 21
+    assert function_cache.hits == 18
+
+def test_cached_function_cannot_print(capfd, interpreter):
+    script = """
+function cached test(x)
+    print x
+    return x
+end
+""".splitlines(True)
+    assert_stack_trace(interpreter, script, [3, 2])
+
+def test_cached_function_cannot_read_input(capfd, interpreter):
+    script = """
+function cached test(x)
+    set y to input
+    return y
+end
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+def test_cached_function_is_not_cached_when_function_it_calls_prints(capfd, interpreter):
+    script = """
+function noisy(x)
+    print x
+    return x
+end
+function cached test(x)
+    return (noisy(x) + 1)
+end
+set a to test(1)
+set b to test(1)
+""".splitlines(True)
+    function_cache.clear()
+    interpreter.run_script(script, None)
+    assert capfd.readouterr().out == "1\n1\n"
+    assert interpreter.variables['b'] == 2
+    assert function_cache.hits == 0
+
 def test_recursion_works_when_returning_calls_to_self(interpreter):
     script = """
 function shortCircuit()
@@ -311,6 +455,23 @@ set val to countDown(10)
     interpreter.run_script(script, None)
     assert interpreter.variables['val'] == 0
 
+def test_recursion_does_not_change_variables_of_outer_call(interpreter):
+    script = """
+function sumTo(n)
+    if [n equals 0]
+        return 0
+    end
+    set rest to sumTo((n - 1))
+    return (n + rest)
+end
+
+set val to sumTo(4)
+set again to sumTo(3)
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['val'] == 10
+    assert interpreter.variables['again'] == 6
+
 def test_recursion_works_when_return_calls_to_self(interpreter):
     script = """
 function countDown(x)
@@ -325,6 +486,199 @@ set val to countDown(10)
     interpreter.run_script(script, None)
     assert interpreter.variables['val'] == 0
 
+def test_recursion_can_reach_recursion_limit(interpreter):
+    interpreter.set_recursion_limit(5)
+    interpreter.run_script(recursive_count_down(4), None)
+    assert interpreter.variables['val'] == 0
+
+def test_recursion_fails_past_recursion_limit(interpreter):
+    interpreter.set_recursion_limit(5)
+    assert_error(interpreter, recursive_count_down(5))
+
+def test_recursion_through_set_statements_fails_past_recursion_limit(interpreter):
+    interpreter.set_recursion_limit(5)
+    assert_error(interpreter, recursive_count_up(5))
+
+def test_recursion_through_set_statements_is_not_limited_by_python_frames():
+    interpreter = Interpreter("test")
+    interpreter.set_recursion_limit(5000)
+    interpreter.run_script(recursive_count_up(4999), None)
+    assert interpreter.variables['val'] == 4999
+    assert interpreter.recursion_depth == 0
+
+def test_recursion_through_call_statements_is_not_limited_by_python_frames():
+    script = """
+function countDown(x)
+    if [x greaterThan 0]
+        countDown((x-1))
+    end
+end
+
+countDown(4999)
+""".splitlines(True)
+    interpreter = Interpreter("test")
+    interpreter.set_recursion_limit(5000)
+    interpreter.run_script(script, None)
+    assert interpreter.recursion_depth == 0
+
+def test_recursion_inside_expressions_fails_before_python_recursion_limit(interpreter):
+    interpreter.set_recursion_limit(100000)
+    assert_error(interpreter, recursive_count_down(5000))
+
+def test_python_recursion_limit_is_restored_after_running(interpreter):
+    python_recursion_limit = sys.getrecursionlimit()
+    interpreter.set_recursion_limit(5000)
+    interpreter.run_script(recursive_count_down(10), None)
+    assert sys.getrecursionlimit() == python_recursion_limit
+
+def test_tail_recursion_does_not_count_towards_recursion_limit(interpreter):
+    script = """
+function sumTo(x, total)
+    if [x greaterThan 0]
+        return sumTo((x-1), (total+x))
+    end
+    return total
+end
+
+set val to sumTo(100, 0)
+""".splitlines(True)
+    interpreter.set_recursion_limit(5)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['val'] == 5050
+
+def test_tail_call_to_other_function_returns_its_value(interpreter):
+    script = """
+function greet(name)
+    return "hello " . name
+end
+function greetWorld()
+    return greet("world")
+end
+
+set val to greetWorld()
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['val'] == "hello world"
+
+def test_stack_trace_shows_last_tail_call(capfd, interpreter):
+    script = """
+function countDown(x)
+    if [x greaterThan 0]
+        return countDown((x-1))
+    end
+    print y
+end
+
+countDown(3)
+""".splitlines(True)
+    assert_stack_trace(interpreter, script, [6, 4, 9])
+
+def test_function_that_only_returns_is_run_inline(interpreter):
+    script = """
+function addOne(x)
+    return (x + 1)
+end
+
+set val to addOne(1)
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.functions['addOne'].inline_return != None
+    assert interpreter.variables['val'] == 2
+    assert interpreter.recursion_depth == 0
+
+def test_inline_function_that_calls_function_is_run_as_call(interpreter):
+    script = """
+function addOne(x)
+    return (x + 1)
+end
+function addTwo(x)
+    return (addOne(x) + 1)
+end
+
+set val to addTwo(1)
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['val'] == 3
+
+def test_stack_trace_shows_return_of_inline_function(capfd, interpreter):
+    script = """
+function addY(x)
+    return (x + y)
+end
+
+set val to addY(1)
+""".splitlines(True)
+    assert_stack_trace(interpreter, script, [3, 6])
+    assert_stack_trace_REPL(capfd, script, [3, 6])
+
+def test_specialized_function_returns_same_values(interpreter):
+    script = """
+function isSmall(x)
+    return [x lessThan 5]
+end
+
+set total to 0
+repeat 20, counter i
+    set small to isSmall(i)
+    if [small equals true]
+        set total to (total + i)
+    end
+end
+""".splitlines(True)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['total'] == 10
+
+def test_specialized_function_fails_on_arguments_of_other_types(interpreter):
+    script = """
+function double(x)
+    return (x * 2)
+end
+
+repeat 20, counter i
+    set val to double(i)
+end
+set val to double("text")
+""".splitlines(True)
+    assert_error(interpreter, script)
+
+def test_parameter_reassigned_by_remove_is_not_specialized(interpreter):
+    script = """
+function firstIsA(x, words)
+    removeFirst from words into x
+    return [x equals "a"]
+end
+
+set count to 0
+repeat 20, counter i
+    set words to <"a", "b">
+    set isA to firstIsA(i, words)
+    if [isA equals true]
+        set count to (count + 1)
+    end
+end
+""".splitlines(True)
+    assert_success(interpreter, script)
+    assert interpreter.variables['count'] == 20
+
+def test_deep_recursion_through_nested_blocks_works_with_raised_recursion_limit(interpreter):
+    script = """
+function countDown(x)
+    repeat 1
+        while [true]
+            if [x greaterThan 0]
+                return countDown((x-1))
+            end
+            return x
+        end
+    end
+end
+
+set val to countDown(2000)
+""".splitlines(True)
+    interpreter.set_recursion_limit(2500)
+    interpreter.run_script(script, None)
+    assert interpreter.variables['val'] == 0
+
 def test_recursion_works_when_return_calls_to_self_and_base_case_in_else(interpreter):
     script = """
 function countDown(x)
@@ -384,4 +738,30 @@ else
 end
 """.splitlines(True)
     interpreter.run_script(script, None)
-    assert interpreter.variables['val'] == 0
\ No newline at end of file
+    assert interpreter.variables['val'] == 0
+
+
+def recursive_count_up(end):
+    return ("""
+function countUp(x)
+    if [x equals 0]
+        return 0
+    end
+    set count to countUp((x-1))
+    return (count + 1)
+end
+
+set val to countUp(""" + str(end) + """)
+""").splitlines(True)
+
+def recursive_count_down(start):
+    return ("""
+function countDown(x)
+    if [x greaterThan 0]
+        return (countDown((x-1)) + 0)
+    end
+    return x
+end
+
+set val to countDown(""" + str(start) + """)
+""").splitlines(True)
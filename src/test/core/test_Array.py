@@ -0,0 +1,45 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+from core.Array import Array, NumberArray
+
+
+def test_removing_first_value_shares_values():
+    array = Array([1, 2, 3])
+    rest = array.without_first()
+    assert rest == [2, 3]
+    assert rest.buffer is array.buffer
+    assert array == [1, 2, 3]
+def test_draining_array_from_front_does_not_keep_removed_values():
+    array = Array(range(100))
+    for value in range(10000):
+        array.append(value)
+        array = array.without_first()
+    assert len(array) == 100
+    assert len(array.buffer.values) < 300
+def test_iteration_sees_values_appended_while_iterating():
+    array = Array([1, 2, 3])
+    seen = []
+    for value in array:
+        seen.append(value)
+        if value < 3:
+            array.append(value + 10)
+    assert seen == [1, 2, 3, 11, 12]
+def test_prepending_to_shared_array_does_not_change_other_array():
+    array = Array([1, 2, 3])
+    rest = array.without_first()
+    rest.appendleft(0)
+    assert rest == [0, 2, 3]
+    assert array == [1, 2, 3]
+def test_negative_indexes_and_slices_are_relative_to_first_value():
+    array = Array([0, 1, 2, 3]).without_first()
+    assert array[-1] == 3
+    assert array[0:2] == [1, 2]
+    assert array[::2] == [1, 3]
+def test_number_array_promoted_while_shared_does_not_change_other_array():
+    array = NumberArray([1, 2, 3])
+    rest = array.without_first()
+    rest.append(2.5)
+    assert rest == [2, 3, 2.5]
+    assert array == [1, 2, 3]
+    assert array.buffer.values.typecode == "q"
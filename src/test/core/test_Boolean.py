@@ -607,6 +607,34 @@ def test_missing_comma_when_comparing_arrays_raises_error():
     assert_error(Boolean('[<1, 2, 3> equals <1 2, 4>]', test_stack, {}))
 
 
+# CONTAINS
+def test_map_contains_key_true():
+    assert Boolean('[x contains "a"]', test_stack, {'x': {'a': 1}}).evaluate() == True
+    assert Boolean('[x contains 1]', test_stack, {'x': {1: 'a'}}).evaluate() == True
+def test_map_contains_key_false():
+    assert Boolean('[x contains "b"]', test_stack, {'x': {'a': 1}}).evaluate() == False
+    assert Boolean('[x contains 1]', test_stack, {'x': {'a': 1}}).evaluate() == False
+def test_array_contains_element():
+    assert Boolean('[<1, "a"> contains "a"]', test_stack, {}).evaluate() == True
+    assert Boolean('[<1, "a"> contains 2]', test_stack, {}).evaluate() == False
+def test_string_contains_substring():
+    assert Boolean('["hello" contains "ell"]', test_stack, {}).evaluate() == True
+    assert Boolean('["hello" contains "x"]', test_stack, {}).evaluate() == False
+def test_set_contains_value():
+    assert Boolean('[{1, "a"} contains "a"]', test_stack, {}).evaluate() == True
+    assert Boolean('[{1, "a"} contains 2]', test_stack, {}).evaluate() == False
+def test_equal_sets_are_equal_in_any_order():
+    assert Boolean('[{1, 2} equals {2, 1}]', test_stack, {}).evaluate() == True
+    assert Boolean('[{1, 2} notEquals {1}]', test_stack, {}).evaluate() == True
+def test_set_is_less_than_its_supersets():
+    assert Boolean('[{1} lessThan {1, 2}]', test_stack, {}).evaluate() == True
+    assert Boolean('[{1, 2} lessThan {1, 2}]', test_stack, {}).evaluate() == False
+def test_contains_is_combined_with_other_operators():
+    assert Boolean('[[x contains "a"] and [x contains "b"]]', test_stack, {'x': {'a': 1}}).evaluate() == False
+def test_contains_on_number_fails():
+    assert_error(Boolean('[1 contains 1]', test_stack, {}))
+
+
 # COMPARING TO DIFFERENT VALUE TYPES
 # STRING
 def test_string_cannot_be_compared_to_an_integer():
@@ -711,6 +739,25 @@ def test_inline_or_fails_if_third_operator_is_not_boolean():
     assert_error(Boolean('["hello" or "hello" or "hello"]', test_stack, {}))
 
 
+# SHORT CIRCUITING
+def test_and_skips_comparison_when_first_operand_is_false():
+    assert Boolean('[[x greaterThan 1] and [y equals 1]]', test_stack, {'x': 1}).evaluate() == False
+def test_or_skips_comparison_when_first_operand_is_true():
+    assert Boolean('[[x equals 1] or [y equals 1]]', test_stack, {'x': 1}).evaluate() == True
+def test_and_evaluates_comparison_when_first_operand_is_true():
+    assert_error(Boolean('[[x equals 1] and [y equals 1]]', test_stack, {'x': 1}))
+def test_and_still_compares_value_types_when_first_operand_is_false():
+    assert_error(Boolean('[false and "hello"]', test_stack, {}))
+
+
+# MALFORMED EXPRESSIONS
+def test_unclosed_group_in_string_expression_fails(capfd):
+    assert_error(Boolean('[x equals "a" . (]', test_stack, {'x': 1}))
+    assert "Missing ')' after '('." in capfd.readouterr().err
+def test_unclosed_array_in_string_expression_fails():
+    assert_error(Boolean('[x equals "a" . <]', test_stack, {'x': 1}))
+
+
 # COMPLICATED
 def test_complicated_expression_successful():
     assert Boolean('[[x."hello" equals (1 + 1)."hello"] lessThan ["world" or "test"] and true]', test_stack, {'x': 2}).evaluate() == False
@@ -6,6 +6,9 @@ import types
 from core.Line import Line
 from core.Stack import Stack
 from core.Expression import Expression
+from core.Set import Set
+from core.Array import NumberArray
+from core.Fail import failed_evaluation
 from Reserved import reserved
 
 line = Line("TEST", 0, "test")
@@ -327,6 +330,96 @@ def test_get_subarray_of_nested_array_element_fails_when_end_angle_bracket_is_mi
     assert_error(Expression('x<0><1:end', test_stack, {'x': [[5,6,7],2,3]}))
 
 
+# NUMBER ARRAYS
+def test_number_array():
+    value = Expression('numbers <1, 2.5, (1 + 2)>', test_stack, {}).evaluate()
+    assert type(value) == NumberArray
+    assert value == [1, 2.5, 3]
+def test_empty_number_array():
+    assert Expression('numbers <>', test_stack, {}).evaluate() == []
+def test_number_array_from_variable():
+    assert Expression('numbers x', test_stack, {'x': [1, 2]}).evaluate() == [1, 2]
+def test_number_array_of_strings_fails():
+    assert_error(Expression('numbers <1, "a">', test_stack, {}))
+def test_number_array_of_booleans_fails():
+    assert_error(Expression('numbers <true>', test_stack, {}))
+def test_number_array_from_number_fails():
+    assert_error(Expression('numbers 1', test_stack, {}))
+def test_number_array_element_and_subarray():
+    assert Expression('x<1>', test_stack, {'x': NumberArray([1, 2, 3])}).evaluate() == 2
+    assert Expression('x<1:end>', test_stack, {'x': NumberArray([1, 2, 3])}).evaluate() == [2, 3]
+def test_variable_named_numbers_can_be_concatenated():
+    assert Expression('numbers . "!"', test_stack, {'numbers': 'abc'}).evaluate() == "abc!"
+def test_type_of_number_array_is_array():
+    assert Expression('type x', test_stack, {'x': NumberArray()}).evaluate() == list
+
+
+# MAPS
+def test_empty_map():
+    assert Expression('{}', test_stack, {}).evaluate() == {}
+def test_empty_map_using_map_keyword():
+    assert Expression('map', test_stack, {}).evaluate() == {}
+def test_map_of_values():
+    assert Expression('{"a": 1, "b": "test", 3: true}', test_stack, {}).evaluate() == {'a': 1, 'b': 'test', 3: True}
+def test_map_of_expressions():
+    assert Expression('{"a" . "b": (1 + 2), x: <1, 2>}', test_stack, {'x': 'c'}).evaluate() == {'ab': 3, 'c': [1, 2]}
+def test_map_of_maps():
+    assert Expression('{"a": {"b": 1, "c": 2}, "d": {}}', test_stack, {}).evaluate() == {'a': {'b': 1, 'c': 2}, 'd': {}}
+def test_map_keys_can_contain_commas_and_colons():
+    assert Expression('{"a, b": 1, "c:d": 2}', test_stack, {}).evaluate() == {'a, b': 1, 'c:d': 2}
+def test_map_entry_without_colon_fails():
+    assert_error(Expression('{"a" 1}', test_stack, {}))
+def test_map_with_extra_comma_fails():
+    assert_error(Expression('{"a": 1,}', test_stack, {}))
+def test_map_with_array_key_fails():
+    assert_error(Expression('{<1>: 1}', test_stack, {}))
+def test_get_map_value():
+    assert Expression('x<"a">', test_stack, {'x': {'a': 1}}).evaluate() == 1
+def test_get_map_value_with_variable_key():
+    assert Expression('x<y>', test_stack, {'x': {'a': 1}, 'y': 'a'}).evaluate() == 1
+def test_get_element_of_array_in_map():
+    assert Expression('x<"a"><1>', test_stack, {'x': {'a': [1, 2]}}).evaluate() == 2
+def test_get_value_of_map_in_array():
+    assert Expression('x<0><"a">', test_stack, {'x': [{'a': 1}]}).evaluate() == 1
+def test_get_map_value_that_does_not_exist_fails():
+    assert_error(Expression('x<"b">', test_stack, {'x': {'a': 1}}))
+def test_map_concatenated_with_string():
+    assert Expression('"test" . x', test_stack, {'x': {'a': 1}}).evaluate() == "test{'a': 1}"
+def test_type_of_map():
+    assert Expression('type x', test_stack, {'x': {}}).evaluate() == dict
+    assert Expression('@Type:Map', test_stack, {}).evaluate() == dict
+
+
+# SETS
+def test_empty_set_using_empty_set_keyword():
+    assert Expression('emptySet', test_stack, {}).evaluate() == Set()
+def test_set_of_values():
+    assert Expression('{1, "a", true}', test_stack, {}).evaluate() == Set([1, 'a', True])
+def test_set_does_not_keep_duplicate_values():
+    assert len(Expression('{1, 1, (0 + 1), "a", "a"}', test_stack, {}).evaluate()) == 2
+def test_set_can_not_contain_map_entries():
+    assert_error(Expression('{1, "a": 2}', test_stack, {}))
+def test_set_can_not_contain_arrays():
+    assert_error(Expression('{<1>}', test_stack, {}))
+def test_set_union():
+    assert Expression('x union {3, 4}', test_stack, {'x': Set([1, 3])}).evaluate() == Set([1, 3, 4])
+def test_set_intersection():
+    assert Expression('x intersection {3, 4}', test_stack, {'x': Set([1, 3])}).evaluate() == Set([3])
+def test_set_difference():
+    assert Expression('x difference {3, 4}', test_stack, {'x': Set([1, 3])}).evaluate() == Set([1])
+def test_set_operations_are_evaluated_from_left_to_right():
+    assert Expression('{1} union {2} difference {1}', test_stack, {}).evaluate() == Set([2])
+def test_set_operation_on_array_fails():
+    assert_error(Expression('<1> union {2}', test_stack, {}))
+def test_set_operators_in_strings_are_not_performed():
+    assert Expression('"a union b"', test_stack, {}).evaluate() == "a union b"
+def test_set_concatenated_with_string():
+    assert Expression('"test" . x', test_stack, {'x': Set([1, 'a'])}).evaluate() == "test{1, 'a'}"
+def test_type_of_set():
+    assert Expression('type x', test_stack, {'x': Set()}).evaluate() == Set
+    assert Expression('@Type:Set', test_stack, {}).evaluate() == Set
+
+
 # SUBSTRINGS
 def test_get_entire_string_as_substring():
     assert Expression('x<0:5>', test_stack, {'x': 'hello'}).evaluate() == 'hello'
@@ -437,6 +530,19 @@ def test_string_can_contain_type():
     assert Expression('"hello type 1"', test_stack, {}).evaluate() == "hello type 1"
 
 
+
+# TRY EVALUATE
+def test_try_evaluate_returns_value():
+    assert Expression('"hello" . 1', test_stack, {}).try_evaluate() == "hello1"
+def test_try_evaluate_signals_failure_without_output(capsys, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert Expression('test', test_stack, {}).try_evaluate() == failed_evaluation
+    assert capsys.readouterr().err == ""
+    assert not (tmp_path / ".oserrorreport").exists()
+def test_errors_are_reported_again_after_try_evaluate():
+    Expression('test', test_stack, {}).try_evaluate()
+    assert_error(Expression('test', test_stack, {}))
+
 def assert_error(expression):
     with pytest.raises(SystemExit) as error:
             expression.evaluate()
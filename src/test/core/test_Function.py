@@ -5,7 +5,8 @@ import pytest
 import types
 from core.Line import Line
 from core.Stack import Stack
-from core.Function import Function
+from core.Function import Function, specialization_threshold
+from core.TypedFrame import TypedFrame
 from Interpreter import reserved
 
 line = Line("TEST", 0, "test")
@@ -16,24 +17,29 @@ test_stack.push(line)
 # FUNCTION DEFINITION
 def test_valid_function_definition_constructs_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    assert b.function_variables == {'x' : None, 'y' : None, 'z' : None}
+    assert b.parameters == ['x', 'y', 'z']
     assert b.function_start == 0
 def test_function_can_be_defined_with_no_parameters():
     b = Function('testFunc()', [], test_stack, {}, {}, 0)
-    assert b.function_variables == {}
+    assert b.parameters == []
     assert b.function_start == 0
 def test_function_can_be_defined_with_no_parameters_and_extra_white_space():
     b = Function('testFunc(   )', [], test_stack, {}, {}, 0)
-    assert b.function_variables == {}
+    assert b.parameters == []
     assert b.function_start == 0
 def test_valid_function_definition_with_no_spaces_between_parameters_and_commas_works():
     b = Function('testFunc(x,y,z)', [], test_stack, {}, {}, 0)
-    assert b.function_variables == {'x' : None, 'y' : None, 'z' : None}
+    assert b.parameters == ['x', 'y', 'z']
     assert b.function_start == 0
 def test_valid_function_definition_extra_spaces_between_parameters_and_commas_works():
     b = Function('testFunc(   x   ,   y   ,   z   )', [], test_stack, {}, {}, 0)
-    assert b.function_variables == {'x' : None, 'y' : None, 'z' : None}
+    assert b.parameters == ['x', 'y', 'z']
     assert b.function_start == 0
+def test_cached_function_definition_constructs_cached_function():
+    b = Function('cached testFunc(x)', [], test_stack, {}, {}, 0)
+    assert b.function_name == "testFunc"
+    assert b.parameters == ['x']
+    assert b.cached == True
 def test_extra_non_space_characters_after_function_defintion_raises_error():
     assert_error_on_init("testFunc (x, y, z) print 'test'")
 def test_space_between_function_name_and_function_definition_raises_error():
@@ -69,86 +75,119 @@ def test_passing_in_math_as_parameter_in_function_definition_raises_error():
 # PARAMETER SUBSTITUION
 def test_integers_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables('(1, 2, 3)')
-    assert b.function_variables == {'x' : 1, 'y' : 2, 'z' : 3}
+    assert b.create_frame('(1, 2, 3)') == {'x' : 1, 'y' : 2, 'z' : 3}
 def test_decimals_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables('(1.1, 2.3, 3.4)')
-    assert b.function_variables == {'x' : 1.1, 'y' : 2.3, 'z' : 3.4}
+    assert b.create_frame('(1.1, 2.3, 3.4)') == {'x' : 1.1, 'y' : 2.3, 'z' : 3.4}
 def test_double_quote_strings_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables('("hello", "world", "test")')
-    assert b.function_variables == {'x' : 'hello', 'y' : 'world', 'z' : 'test'}
+    assert b.create_frame('("hello", "world", "test")') == {'x' : 'hello', 'y' : 'world', 'z' : 'test'}
 def test_single_quote_strings_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables("('hello', 'world', 'test')")
-    assert b.function_variables == {'x' : 'hello', 'y' : 'world', 'z' : 'test'}
+    assert b.create_frame("('hello', 'world', 'test')") == {'x' : 'hello', 'y' : 'world', 'z' : 'test'}
 def test_boolean_values_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables('(true, false, true)')
+    b.create_frame('(true, false, true)')
 def test_array_values_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables('(<1, 2>, <3, 4>, <5, 6>)')
-    assert b.function_variables == {'x' : [1, 2], 'y' : [3, 4], 'z' : [5, 6]}
+    assert b.create_frame('(<1, 2>, <3, 4>, <5, 6>)') == {'x' : [1, 2], 'y' : [3, 4], 'z' : [5, 6]}
 def test_complex_array_values_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables('(<1, <"hello", "world">>, <<true, false>, 4>, <<(1 + 1), 5.1>, 6>)')
-    assert b.function_variables == {'x' : [1, ['hello', 'world']], 'y' : [[True, False], 4], 'z' : [[2, 5.1], 6]}
+    assert b.create_frame('(<1, <"hello", "world">>, <<true, false>, 4>, <<(1 + 1), 5.1>, 6>)') == {'x' : [1, ['hello', 'world']], 'y' : [[True, False], 4], 'z' : [[2, 5.1], 6]}
 def test_types_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z, a, b)', [], test_stack, {}, {}, 0)
-    b.populate_variables('(@Type:String, @Type:Number, @Type:Boolean, @Type:Array, @Type:Function)')
-    assert b.function_variables == {'x' : str, 'y' : float, 'z' : bool, 'a' : list, 'b' : types.FunctionType}
+    assert b.create_frame('(@Type:String, @Type:Number, @Type:Boolean, @Type:Array, @Type:Function)') == {'x' : str, 'y' : float, 'z' : bool, 'a' : list, 'b' : types.FunctionType}
 def test_types_of_values_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z, a, b)', [], test_stack, {}, {}, 0)
-    b.populate_variables('(type "hello", type 1, type 1.1, type true, type <>)')
-    assert b.function_variables == {'x' : str, 'y' : int, 'z' : float, 'a' : bool, 'b' : list}
+    assert b.create_frame('(type "hello", type 1, type 1.1, type true, type <>)') == {'x' : str, 'y' : int, 'z' : float, 'a' : bool, 'b' : list}
 def test_variables_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {'a' : 1, 'b' : 2, 'c' : 3}, 0)
-    b.populate_variables('(a, b, c)')
-    assert b.function_variables == {'x' : 1, 'y' : 2, 'z' : 3}
+    assert b.create_frame('(a, b, c)') == {'x' : 1, 'y' : 2, 'z' : 3}
 def test_when_undefined_variables_are_passed_in_when_calling_function_error_raised():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    assert_error_on_populating_variables(b, "(a, b, c)")
+    assert_error_on_creating_frame(b, "(a, b, c)")
 def test_string_expressions_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables('("hello" . 1, "world" . 2.3, "test" . "world")')
-    assert b.function_variables == {'x' : 'hello1', 'y' : 'world2.3', 'z' : 'testworld'}
+    assert b.create_frame('("hello" . 1, "world" . 2.3, "test" . "world")') == {'x' : 'hello1', 'y' : 'world2.3', 'z' : 'testworld'}
 def test_math_expressions_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables('((1+1), (2*(1+1)), (4/2))')
-    assert b.function_variables == {'x' : 2, 'y' : 4, 'z' : 2}
+    assert b.create_frame('((1+1), (2*(1+1)), (4/2))') == {'x' : 2, 'y' : 4, 'z' : 2}
 def test_boolean_expressions_can_be_passed_in_when_calling_function():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables('([true], ["hello" lessThan "world"], [true and false])')
-    assert b.function_variables == {'x' : True, 'y' : True, 'z' : False}
+    assert b.create_frame('([true], ["hello" lessThan "world"], [true and false])') == {'x' : True, 'y' : True, 'z' : False}
 def test_valid_parameter_subsitution_with_no_spaces_between_parameters_and_commas_when_calling_function_works():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables('(1,2,3)')
-    assert b.function_variables == {'x' : 1, 'y' : 2, 'z' : 3}
+    assert b.create_frame('(1,2,3)') == {'x' : 1, 'y' : 2, 'z' : 3}
 def test_valid_parameter_subsitution_with_extra_space_between_parameters_and_commas_when_calling_function_works():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    b.populate_variables('(   1  ,   2   ,   3   )')
-    assert b.function_variables == {'x' : 1, 'y' : 2, 'z' : 3}
+    assert b.create_frame('(   1  ,   2   ,   3   )') == {'x' : 1, 'y' : 2, 'z' : 3}
 def test_passing_too_few_parameters_into_function_raises_error():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    assert_error_on_populating_variables(b, "(1, 2)")
+    assert_error_on_creating_frame(b, "(1, 2)")
 def test_passing_too_many_parameters_into_function_raises_error():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    assert_error_on_populating_variables(b, "(1, 2, 3, 4)")
+    assert_error_on_creating_frame(b, "(1, 2, 3, 4)")
 def test_passing_parameters_into_function_that_takes_no_parameters_raises_error():
     b = Function('testFunc()', [], test_stack, {}, {}, 0)
-    assert_error_on_populating_variables(b, "(1)")
+    assert_error_on_creating_frame(b, "(1)")
 def test_passing_no_parameters_into_function_that_takes_no_parameters_works():
     b = Function('testFunc()', [], test_stack, {}, {}, 0)
-    b.populate_variables('()')
-    assert b.function_variables == {}
+    assert b.create_frame('()') == {}
 def test_passing_no_parameters_into_function_that_takes_no_parameters_with_white_space_works():
     b = Function('testFunc()', [], test_stack, {}, {}, 0)
-    b.populate_variables('(   )')
-    assert b.function_variables == {}
+    assert b.create_frame('(   )') == {}
+def test_each_call_gets_its_own_frame():
+    b = Function('testFunc(x)', [], test_stack, {}, {}, 0)
+    frame = b.create_frame('(1)')
+    assert b.create_frame('(2)') == {'x' : 2}
+    assert frame == {'x' : 1}
+def test_parameters_are_evaluated_in_scope_of_caller():
+    b = Function('testFunc(x)', [], test_stack, {}, {'a' : 1}, 0)
+    assert b.create_frame('(a)', {'a' : 2}) == {'x' : 2}
+def test_cache_key_separates_values_of_different_types():
+    b = Function('cached testFunc(x)', [], test_stack, {}, {}, 0)
+    assert b.get_cache_key(b.create_frame('(true)')) != b.get_cache_key(b.create_frame('(1)'))
+def test_calls_with_arrays_have_no_cache_key():
+    b = Function('cached testFunc(x)', [], test_stack, {}, {}, 0)
+    assert b.get_cache_key(b.create_frame('(<1, 2>)')) == None
+def test_arguments_of_call_site_are_parsed_once():
+    b = Function('testFunc(x, y)', [], test_stack, {}, {}, 0)
+    arguments = b.parse_arguments('(1, a)')
+    assert arguments == (("value", 1), ("expression", "a"))
+    assert b.parse_arguments('(1, a)') is arguments
+def test_variable_arguments_are_evaluated_on_every_call():
+    b = Function('testFunc(x, y)', [], test_stack, {}, {}, 0)
+    assert b.create_frame('(1, a)', {'a' : 2}) == {'x' : 1, 'y' : 2}
+    assert b.create_frame('(1, a)', {'a' : "test"}) == {'x' : 1, 'y' : "test"}
+def test_frames_are_specialized_after_calls_with_same_types():
+    b = Function('testFunc(x, y)', [], test_stack, {}, {}, 0)
+    for i in range(specialization_threshold):
+        assert type(b.create_frame('(1, "a")')) == dict
+    frame = b.create_frame('(1, "a")')
+    assert type(frame) == TypedFrame
+    assert frame == {'x' : 1, 'y' : "a"}
+    assert frame.number_names == {'x'}
+def test_frames_are_not_specialized_when_types_change():
+    b = Function('testFunc(x)', [], test_stack, {}, {}, 0)
+    for i in range(specialization_threshold):
+        b.create_frame('(1)')
+    assert type(b.create_frame('("a")')) == dict
+    assert type(b.create_frame('(1)')) == dict
+def test_parameters_that_are_assigned_to_are_not_specialized():
+    body = [Line("set x to \"a\"", 1, "test")]
+    body[0].kind = "set"
+    body[0].parameters = "x to \"a\""
+    b = Function('testFunc(x, y)', body, test_stack, {}, {}, 0)
+    assert b.specializable_parameters == ('y',)
+def test_parameters_that_removed_values_are_put_into_are_not_specialized():
+    body = [Line("removeFirst from values into x", 1, "test")]
+    body[0].kind = "remove"
+    body[0].parameters = "from values into x"
+    b = Function('testFunc(x, y, values)', body, test_stack, {}, {}, 0)
+    assert b.specializable_parameters == ('y', 'values')
 def test_extra_non_space_characters_after_right_parenthesis_raises_error():
     b = Function('testFunc(x, y, z)', [], test_stack, {}, {}, 0)
-    assert_error_on_populating_variables(b, "(1, 2, 3) print 'test'")
+    assert_error_on_creating_frame(b, "(1, 2, 3) print 'test'")
 
 
 def assert_error_on_init(function_definition):
@@ -158,8 +197,8 @@ def assert_error_on_init(function_definition):
     assert error.value.code == 1
 
 
-def assert_error_on_populating_variables(function, parameters):
+def assert_error_on_creating_frame(function, parameters):
     with pytest.raises(SystemExit) as error:
-        function.populate_variables(parameters)
+        function.create_frame(parameters)
     assert error.type == SystemExit
     assert error.value.code == 1
\ No newline at end of file
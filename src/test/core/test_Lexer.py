@@ -0,0 +1,73 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+import pytest
+import sys
+from core.Line import Line
+from core.Stack import Stack
+from Interpreter import reserved
+from core.Expression import Expression
+from core.Math import Math
+from core.Boolean import Boolean
+from core.Lexer import Lexer
+
+line = Line("TEST", 0, "test")
+test_stack = Stack()
+test_stack.push(line)
+
+
+def test_lexer_strips_expression():
+    lexer = Lexer("  1 + 1  ")
+    assert lexer.expression == "1 + 1"
+    assert lexer.offset == 2
+def test_lexer_is_finished_at_trailing_space():
+    lexer = Lexer("1 ")
+    lexer.add_token("1", 0, 1)
+    assert lexer.is_finished() == True
+def test_lexer_find():
+    lexer = Lexer("a b c")
+    assert lexer.find(" ", 0) == 1
+    assert lexer.find(" ", 2) == 3
+    assert lexer.find(" ", 4) == -1
+def test_lexer_find_searching_backwards():
+    lexer = Lexer("a b c")
+    lexer.find(" ", 2)
+    assert lexer.find(" ", 0) == 1
+def test_lexer_find_closing():
+    lexer = Lexer("(1 (2)) 3")
+    assert lexer.find_closing(0, "(", ")") == 7
+def test_lexer_find_closing_unbalanced():
+    lexer = Lexer("(1 (2) 3")
+    with pytest.raises(IndexError):
+        lexer.find_closing(0, "(", ")")
+
+def test_expression_token_offsets():
+    assert get_offsets(Expression, ' "a" . x . "b"') == (['"a"', '.', 'x', '.', '"b"'], [1, 5, 7, 9, 11])
+def test_math_token_offsets():
+    assert get_offsets(Math, "(1 + 20) * 3") == (['(', '1 ', '+', '20', ')', '*', '3'], [0, 1, 3, 5, 7, 9, 11])
+def test_boolean_token_offsets():
+    assert get_offsets(Boolean, "[x equals 1] and [true]") == (['[', 'x', 'equals', '1', ']', 'and', '[', 'true', ']'], [0, 1, 3, 10, 11, 13, 17, 18, 22])
+
+def test_long_expression_does_not_depend_on_recursion_limit():
+    expression = " . ".join(['"a"'] * 2000)
+    assert len(tokenize_with_recursion_limit(Expression, expression, 100)) == 3999
+def test_long_math_expression_does_not_depend_on_recursion_limit():
+    expression = " + ".join(["1"] * 2000)
+    assert len(tokenize_with_recursion_limit(Math, expression, 100)) == 3999
+def test_long_boolean_expression_does_not_depend_on_recursion_limit():
+    expression = " and ".join(["[true]"] * 1000)
+    assert len(tokenize_with_recursion_limit(Boolean, expression, 100)) == 3999
+
+
+
+def get_offsets(tokenizer, expression):
+    lexer = tokenizer(expression, test_stack, {}).parse_expression(expression)
+    return lexer.tokens, lexer.offsets
+
+def tokenize_with_recursion_limit(tokenizer, expression, limit):
+    recursion_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(limit)
+    try:
+        return tokenizer(expression, test_stack, {}).parse_expression(expression).tokens
+    finally:
+        sys.setrecursionlimit(recursion_limit)
@@ -83,6 +83,15 @@ def test_math_using_valid_variable_successful():
     assert_success(Math('(1 + (x * (2 ^ y)) * 2)', test_stack, {'x': 2, 'y': 3}))
 def test_math_using_invalid_variable_fails():
     assert_error(Math('(1 + ( x * (2 ^ y)) * 2)', test_stack, {'x': "string is no good", 'y': 3}))
+def test_math_using_changed_variable_successful():
+    Math('(x * 2)', test_stack, {'x': 2}).calculate()
+    assert Math('(x * 2)', test_stack, {'x': 5}).calculate() == "10.0"
+
+# EVALUATION ORDER
+def test_operations_are_evaluated_left_to_right():
+    assert Math('(1 + 2 * 3)', test_stack, {}).calculate() == "9.0"
+def test_single_value_is_returned_as_written():
+    assert Math('(5)', test_stack, {}).calculate() == "5"
 
 
 # ZERO RELATED ERRORS
@@ -107,6 +116,13 @@ def test_math_operations_cannot_be_type_of_value():
     assert_error(Math('(1 / type 1)', test_stack, {}))
 
 
+# MALFORMED EXPRESSIONS
+def test_unclosed_array_in_string_expression_fails():
+    assert_error(Math('(1 + "a" . <)', test_stack, {}))
+def test_unclosed_boolean_in_string_expression_fails():
+    assert_error(Math('(1 + "a" . [)', test_stack, {}))
+
+
 def assert_error(expression):
     with pytest.raises(SystemExit) as error:
             expression.calculate()
@@ -0,0 +1,61 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+import pytest
+import Interpreter
+from core.NativeExpression import NativeExpression
+
+
+# VALUES
+def test_literals_are_translated():
+    assert translate_value("1") == "1"
+    assert translate_value('"hello"') == "'hello'"
+def test_variables_are_translated_to_locals():
+    assert translate_value("x") == "defined(v_x)"
+def test_math_is_translated_left_to_right():
+    assert translate_value("(1 + x * 2)") == "number(((1.0 + float(v_x)) * 2.0))"
+def test_power_and_root_use_helpers():
+    assert translate_value("(2 ^ 3 rootOf 4)") == "number(root_of(power(2.0, 3.0), 4.0))"
+def test_single_nested_math_group_is_translated():
+    assert translate_value("(1 - (2 + 3))") == "number((1.0 - (2.0 + 3.0)))"
+def test_leading_flat_math_groups_are_translated():
+    assert translate_value("((1 + 1) - (2 + 2))") == "number(((1.0 + 1.0) - (2.0 + 2.0)))"
+def test_math_groups_that_are_not_paired_left_to_right_are_not_translated():
+    assert translate_value("(1 - (1 + 1) - (1 + 1))") == None
+    assert translate_value("((1 + 1) ^ (1 / (2 ^ 2)))") == None
+def test_single_variable_groups_are_not_translated():
+    assert translate_value("(x)") == None
+def test_functions_and_reserved_words_are_not_translated():
+    assert translate_value("test()") == None
+    assert translate_value("(x + test)", ["test"]) == None
+    assert translate_value("(x + input)") == None
+def test_string_expressions_are_not_translated():
+    assert translate_value('"a" . "b"') == None
+    assert translate_value('"a.b"') == None
+def test_types_and_arrays_are_not_translated():
+    assert translate_value("@Integer") == None
+    assert translate_value("x<0>") == None
+
+
+# CONDITIONS
+def test_conditions_are_translated_to_helpers():
+    assert translate_condition("[x lessThan 2]") == "less_than(boolean_operand(v_x), 2.0)"
+def test_conditions_are_translated_left_to_right():
+    assert translate_condition("[true and x equals 1]") == "equals(boolean_and(True, boolean_operand(v_x)), 1.0)"
+def test_numeric_strings_are_compared_as_numbers():
+    assert translate_condition('[x equals "1"]') == "equals(boolean_operand(v_x), 1.0)"
+def test_conditions_can_contain_math():
+    assert translate_condition("[(x + 1) equals 2]") == "equals((float(v_x) + 1.0), 2.0)"
+def test_names_containing_boolean_symbols_are_not_translated_inside_math():
+    assert translate_condition("[order equals 1]") == "equals(boolean_operand(v_order), 1.0)"
+    assert translate_condition("[(order + 1) equals 2]") == None
+def test_conditions_must_be_boolean_expressions():
+    assert translate_condition("x") == None
+    assert translate_condition("[x]") == None
+
+
+def translate_value(expression, function_names=[]):
+    return NativeExpression(expression, function_names).translate_value()
+
+def translate_condition(expression, function_names=[]):
+    return NativeExpression(expression, function_names).translate_condition()
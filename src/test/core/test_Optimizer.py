@@ -0,0 +1,58 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+import pytest
+from core.Stack import Stack
+from core.Parser import Parser
+from core.Optimizer import Optimizer
+
+test_stack = Stack()
+
+
+# EXPRESSIONS
+def test_literal_math_is_folded():
+    assert optimized("set x to (60 * 60 * 24)\n")[0].parameters == "x to 86400"
+def test_literal_math_inside_expression_is_folded():
+    assert optimized("set x to (y * (60 * 60))\n")[0].parameters == "x to (y * 3600)"
+def test_literal_string_concatenation_is_folded():
+    assert optimized('print "octane" . "script"\n')[0].parameters == '"octanescript"'
+def test_literal_boolean_is_folded():
+    assert optimized("return [1 lessThan 2]\n")[0].parameters == "true"
+def test_function_call_parameters_are_not_folded():
+    assert optimized("set x to f(1)\n")[0].parameters == "x to f(1)"
+def test_math_inside_strings_is_not_folded():
+    assert optimized('print "(1 + 1)" . y\n')[0].parameters == '"(1 + 1)" . y'
+def test_expressions_that_fail_are_not_folded():
+    assert optimized("set x to (1 / 0)\n")[0].parameters == "x to (1 / 0)"
+def test_expressions_with_variables_are_not_folded():
+    assert optimized('print "a" . b\n')[0].parameters == '"a" . b'
+
+
+# CONDITIONALS
+def test_arms_that_are_always_false_are_dropped():
+    statements = optimized("if [false]\nprint 1\nelseIf [x]\nprint 2\nend\n")
+    assert [(arm.index, condition) for arm, condition, start, stop in statements[0].chain] == [(2, "[x]")]
+def test_arms_after_arm_that_is_always_true_are_dropped():
+    statements = optimized("if [x]\nprint 1\nelseIf [1 lessThan 2]\nprint 2\nelse\nprint 3\nend\n")
+    assert [(arm.index, condition) for arm, condition, start, stop in statements[0].chain] == [(0, "[x]"), (2, None)]
+def test_conditional_that_is_always_false_has_no_arms():
+    assert optimized("if [false]\nprint 1\nend\n")[0].chain == []
+
+
+# DUMP
+def test_dump_shows_folded_program_without_dead_arms():
+    statements = optimized("set x to (2 * 2)\nif [false]\nprint 1\nelse\nprint 2\nend\nwhile [x lessThan (1 + 1)]\nset x to (x + 1)\nend\n")
+    assert Optimizer(statements, test_stack).dump() == [
+        "set x to 4",
+        "if [true]",
+        "    print 2",
+        "end",
+        "while [x lessThan 2]",
+        "    set x to (x + 1)",
+        "end"
+    ]
+
+
+def optimized(code):
+    statements = Parser(code.splitlines(True), "test", 0).parse()
+    return Optimizer(statements, test_stack).optimize()
@@ -0,0 +1,119 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+import pytest
+from core.Parser import Parser
+from core.Statement import Statement
+
+
+# STATEMENTS
+def test_each_line_becomes_a_statement():
+    statements = Parser(["print 'hello'\n", "set x to 1\n"], "test", 0).parse()
+    assert len(statements) == 2
+    assert statements[0].function == "print"
+    assert statements[0].parameters == "'hello'"
+    assert statements[1].function == "set"
+    assert statements[1].parameters == "x to 1"
+def test_statements_keep_their_line_numbers():
+    statements = Parser(["\n", "print 'hello'\n", "invalid\n"], "test", 0).parse()
+    assert statements[1].line_number == 1
+    assert statements[2].get_line_info() == "test (3): invalid\n"
+def test_statements_are_offset_by_first_line_number():
+    statements = Parser(["print 'hello'\n"], "REPL", 4).parse()
+    assert statements[0].line_number == 4
+    assert statements[0].index == 0
+def test_leading_white_space_is_ignored():
+    statements = Parser(["        print 'hello'\n"], "test", 0).parse()
+    assert statements[0].function == "print"
+    assert statements[0].line == "print 'hello'\n"
+def test_statements_reference_their_program():
+    statements = Parser(["print 'hello'\n", "print 'world'\n"], "test", 0).parse()
+    assert statements[0].program is statements
+    assert statements[1].program is statements
+    assert statements[1].index == 1
+
+
+# KINDS
+def test_comments_and_blank_lines_are_comments():
+    assert_kind("# comment", "comment")
+    assert_kind("", "comment")
+    assert_kind("    ", "comment")
+def test_print_and_log_variants_share_a_kind():
+    assert_kind("printRedBold 'hello'", "print")
+    assert_kind("logWarn 'hello'", "log")
+def test_array_operations_share_a_kind():
+    assert_kind("append 1 to x", "append")
+    assert_kind("prepend 1 to x", "append")
+    assert_kind("push 1 to x", "append")
+    assert_kind("pop from x", "remove")
+    assert_kind("removeFirst from x", "remove")
+    assert_kind("removeLast from x", "remove")
+    assert_kind("remove 1 from x", "remove")
+    assert_kind("sortReverse x", "sort")
+def test_keywords_are_their_own_kind():
+    for keyword in ["if", "elseIf", "else", "repeat", "while", "for", "function", "return", "end", "set", "merge", "sleep", "exit"]:
+        assert_kind(keyword + " x", keyword)
+def test_unknown_words_are_function_calls():
+    assert_kind("myFunction(1, 2)", "call")
+    assert_kind("invalid", "call")
+def test_only_loops_and_conditionals_open_blocks():
+    assert Statement("if [true]", 0, "test").opens_block()
+    assert Statement("repeat 10", 0, "test").opens_block()
+    assert Statement("while [true]", 0, "test").opens_block()
+    assert Statement("for x in y", 0, "test").opens_block()
+    assert not Statement("else", 0, "test").opens_block()
+    assert not Statement("function test()", 0, "test").opens_block()
+    assert not Statement("ifTrue()", 0, "test").opens_block()
+
+
+# ARGUMENTS
+def test_repeat_options_are_parsed_once():
+    statement = Parser(["repeat   10,  counter i, step 2,start 1, invalid\n"], "test", 0).parse()[0]
+    assert statement.repeat_count == "10"
+    assert statement.repeat_options == [("counter", "i"), ("step", "2"), ("start", "1"), (None, "invalid")]
+def test_while_condition_white_space_is_normalized():
+    statement = Parser(["while   [x   lessThan 10]\n"], "test", 0).parse()[0]
+    assert statement.while_condition == "[x lessThan 10]"
+def test_for_parameters_are_tokenized():
+    statement = Parser(["for   element in   <1, 2>\n"], "test", 0).parse()[0]
+    assert statement.for_parameters == ["element", "in", "<1,", "2>"]
+
+
+# BLOCKS
+def test_blocks_know_their_matching_end():
+    statements = parse("repeat 2\nwhile [true]\nend\nprint 1\nend\n")
+    assert statements[0].end == 4
+    assert statements[1].end == 2
+def test_if_chain_arms_point_to_the_next_arm():
+    statements = parse("if [true]\nif [false]\nelse\nend\nelseIf [true]\nelse\nend\n")
+    assert statements[0].next_arm == 4
+    assert statements[4].next_arm == 5
+    assert statements[5].next_arm == 6
+    assert statements[1].next_arm == 2
+    assert statements[2].next_arm == 3
+def test_if_chain_arms_share_the_chain_end():
+    statements = parse("if [true]\nelseIf [true]\nelse\nend\n")
+    assert [statement.end for statement in statements[:3]] == [3, 3, 3]
+def test_if_chains_are_indexed_as_arms():
+    statements = parse("if [x]\nprint 1\nelseIf [y]\nprint 2\nprint 3\nelse\nend\n")
+    assert [(arm.index, condition, start, stop) for arm, condition, start, stop in statements[0].chain] == [
+        (0, "[x]", 1, 2), (2, "[y]", 3, 5), (5, None, 6, 6)]
+def test_functions_know_their_matching_end():
+    statements = parse("function test()\nif [true]\nend\nend\n")
+    assert statements[0].end == 3
+def test_blocks_missing_end_have_no_end():
+    statements = parse("repeat 2\nif [true]\nend\n")
+    assert statements[0].end == None
+    assert statements[1].end == 2
+def test_blocks_remember_nested_functions():
+    statements = parse("if [true]\nprint 1\nelse\nfunction test()\nend\nend\n")
+    assert statements[0].nested_function is statements[3]
+    assert statements[2].nested_function is statements[3]
+    assert statements[3].nested_function == None
+
+
+def parse(script):
+    return Parser(script.splitlines(True), "test", 0).parse()
+
+def assert_kind(line, kind):
+    assert Statement(line, 0, "test").kind == kind
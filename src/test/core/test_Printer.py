@@ -40,6 +40,24 @@ def test_print_array_works():
     assert_success(Printer("print", "<1, 2, 3>", test_stack, {}))
 
 
+# MAP
+def test_print_map_works(capfd):
+    assert_success(Printer("print", '{"a": 1, 2: <"b", true>, "c": {}}', test_stack, {}))
+    assert capfd.readouterr().out == "{'a': 1, 2: <'b', true>, 'c': {}}\n"
+def test_print_map_type_works(capfd):
+    assert_success(Printer("print", "@Type:Map", test_stack, {}))
+    assert capfd.readouterr().out == "@Type:Map\n"
+
+
+# SET
+def test_print_set_works(capfd):
+    assert_success(Printer("print", '{1, "a", false}', test_stack, {}))
+    assert capfd.readouterr().out == "{1, 'a', false}\n"
+def test_print_set_type_works(capfd):
+    assert_success(Printer("print", "@Type:Set", test_stack, {}))
+    assert capfd.readouterr().out == "@Type:Set\n"
+
+
 # TYPE
 def test_print_type_works():
     assert_success(Printer("print", "@Type:String", test_stack, {}))
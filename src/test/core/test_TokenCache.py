@@ -0,0 +1,84 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+import pytest
+from core.Line import Line
+from core.Stack import Stack
+from Interpreter import reserved
+from core.Expression import Expression
+from core.Math import Math
+from core.TokenCache import TokenCache, token_cache, program_cache
+
+line = Line("TEST", 0, "test")
+test_stack = Stack()
+test_stack.push(line)
+
+
+def test_missing_expression_is_a_miss():
+    cache = TokenCache(2)
+    assert cache.get("Expression", "x") == None
+    assert cache.misses == 1
+def test_cached_expression_is_a_hit():
+    cache = TokenCache(2)
+    cache.put("Expression", "x", ["x"])
+    assert cache.get("Expression", "x") == ["x"]
+    assert cache.hits == 1
+def test_cached_tokens_are_copies():
+    cache = TokenCache(2)
+    cache.put("Expression", "x", ["x"])
+    cache.get("Expression", "x").append("y")
+    assert cache.get("Expression", "x") == ["x"]
+def test_tokenizers_are_cached_separately():
+    cache = TokenCache(2)
+    cache.put("Expression", "(1 + 1)", ["(1 + 1)"])
+    assert cache.get("Math", "(1 + 1)") == None
+def test_least_recently_used_expression_is_evicted():
+    cache = TokenCache(2)
+    cache.put("Expression", "x", ["x"])
+    cache.put("Expression", "y", ["y"])
+    cache.get("Expression", "x")
+    cache.put("Expression", "z", ["z"])
+    assert cache.get("Expression", "y") == None
+    assert cache.get("Expression", "x") == ["x"]
+    assert cache.evictions == 1
+def test_resizing_evicts_extra_expressions():
+    cache = TokenCache(3)
+    for expression in ["x", "y", "z"]:
+        cache.put("Expression", expression, [expression])
+    cache.resize(1)
+    assert list(cache.entries) == [("Expression", "z")]
+    assert cache.evictions == 2
+def test_cache_of_size_0_stores_nothing():
+    cache = TokenCache(0)
+    cache.put("Expression", "x", ["x"])
+    assert cache.get("Expression", "x") == None
+def test_stats_report_counters():
+    cache = TokenCache(4)
+    cache.put("Expression", "x", ["x"])
+    cache.get("Expression", "x")
+    cache.get("Expression", "y")
+    assert cache.get_stats() == "Token cache: 1 hits, 1 misses, 0 evictions (1/4 entries)"
+def test_cached_programs_are_shared():
+    cache = TokenCache(2, "Program cache")
+    program = (("result", "x"),)
+    cache.put("Math", "(x)", program)
+    assert cache.get("Math", "(x)") is program
+    assert cache.get_stats() == "Program cache: 1 hits, 0 misses, 0 evictions (1/2 entries)"
+
+
+def test_expressions_are_tokenized_once():
+    token_cache.clear()
+    evaluate_expression('"a" . x . "c"', {"x" : "b"})
+    assert evaluate_expression('"a" . x . "c"', {"x" : "d"}) == "adc"
+    assert token_cache.hits == 1
+def test_math_is_compiled_once():
+    token_cache.clear()
+    program_cache.clear()
+    Math("(x + 1)", test_stack, {"x" : 1}).calculate()
+    assert Math("(x + 1)", test_stack, {"x" : 2}).calculate() == "3.0"
+    assert program_cache.hits == 1
+    assert token_cache.misses == 1
+
+
+def evaluate_expression(expression, variables):
+    return Expression(expression, test_stack, variables).evaluate()
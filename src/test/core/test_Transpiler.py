@@ -0,0 +1,60 @@
+# This file is licensed under the MIT license.
+# See license for more details: https://github.com/leonard112/OctaneScript/blob/main/README.md
+
+import pytest
+import Interpreter
+from core.Parser import Parser
+from core.Transpiler import Transpiler
+from core.NativeRuntime import boolean_operand
+from core.Array import Array
+
+
+# STATEMENTS
+def test_variables_are_python_locals():
+    source = transpile("set x to 1\nset x to (x + 1)\n")
+    assert "v_x = 1\n" in source
+    assert "v_x = number((float(v_x) + 1.0))\n" in source
+def test_untranslated_statements_run_on_the_interpreter():
+    source = transpile('set x to "a" . "b"\n')
+    assert "rt.execute(S[0])" in source
+    assert "v_x = " not in source
+def test_translated_statements_fall_back_to_the_interpreter_on_errors():
+    source = transpile("set x to (x + 1)\n")
+    assert "except Exception:\n        store(variables, NAMES, (v_x, ))\n        rt.execute(S[0])\n" in source
+def test_print_values_are_printed_by_the_interpreter():
+    assert "rt.print_value(S[0], t_1)" in transpile("print 1\n")
+def test_top_level_return_runs_on_the_interpreter():
+    assert "rt.execute(S[0])\n    return -1\n" in transpile("return 1\n")
+def test_function_definitions_run_on_the_interpreter():
+    assert "if rt.execute(S[0]) == -1:" in transpile("function test()\nreturn 1\nend\n")
+
+
+# BLOCKS
+def test_if_chains_select_an_arm():
+    assert "t_1 = 1 if equals(boolean_operand(v_x), 1.0) == True else 2" in transpile("if [x equals 1]\nprint 1\nelse\nprint 2\nend\n")
+def test_repeat_counters_are_python_for_loops():
+    assert "for v_i in t_1.values:" in transpile("repeat 3, counter i\nprint i\nend\n")
+def test_while_loops_are_python_while_loops():
+    assert "while True:" in transpile("while [x lessThan 1]\nset x to (x + 1)\nend\n")
+def test_blocks_missing_end_are_left_to_the_interpreter():
+    assert "if rt.execute(S[0]) == -1:" in transpile("repeat 2\nprint 1\n")
+
+
+# FUNCTIONS
+def test_function_returns_set_the_return_value():
+    statements = parse("function test(n)\nreturn (n + 1)\nend\n")
+    source = Transpiler(statements[1:2], "test").transpile()
+    assert "rt.set_return_value(t_1)" in source
+
+
+# RUNTIME
+def test_arrays_are_boolean_operands():
+    array = Array([1, 2])
+    assert boolean_operand(array) is array
+
+
+def parse(script):
+    return Parser(script.splitlines(True), "test", 0).parse()
+
+def transpile(script):
+    return Transpiler(parse(script), "test").transpile()
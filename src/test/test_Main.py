@@ -4,6 +4,7 @@
 import pytest
 from pytest_mock import mocker
 from Main import *
+import Main
 
 def test_enters_repl_when_no_arguments_passed_in(mocker):
     mocked_enter_interpreter_as = mocker.patch('Main.enter_interpreter_as')
@@ -15,6 +16,60 @@ def test_runs_octanescript_script_when_script_name_passed_in(mocker):
     perform_operation_based_on_arguments(['python', 'HelloWorld.os'])
     mocked_enter_interpreter_as.assert_called_with("HelloWorld.os")
 
+def test_runs_octanescript_script_compiled_to_python_when_native_flag_passed_in(mocker):
+    mocked_enter_interpreter_as = mocker.patch('Main.enter_interpreter_as')
+    perform_operation_based_on_arguments(['python', '--native', 'HelloWorld.os'])
+    mocked_enter_interpreter_as.assert_called_with("HelloWorld.os", "native")
+
+def test_runs_octanescript_script_with_recursion_limit_when_recursion_limit_flag_passed_in(mocker):
+    mocked_enter_interpreter_as = mocker.patch('Main.enter_interpreter_as')
+    mocker.patch('Main.recursion_limit', 500)
+    perform_operation_based_on_arguments(['python', '--recursion-limit', '2000', '--native', 'HelloWorld.os'])
+    mocked_enter_interpreter_as.assert_called_with("HelloWorld.os", "native")
+    assert Main.recursion_limit == 2000
+
+def test_resizes_token_cache_when_token_cache_size_flag_passed_in(mocker):
+    mocked_enter_interpreter_as = mocker.patch('Main.enter_interpreter_as')
+    mocker.patch.object(token_cache, 'size', 1024)
+    mocker.patch.object(program_cache, 'size', 1024)
+    mocker.patch.object(call_site_cache, 'size', 1024)
+    perform_operation_based_on_arguments(['python', '--token-cache-size', '64', 'HelloWorld.os'])
+    mocked_enter_interpreter_as.assert_called_with("HelloWorld.os")
+    assert token_cache.size == 64
+    assert program_cache.size == 64
+    assert call_site_cache.size == 64
+
+def test_resizes_function_cache_when_function_cache_size_flag_passed_in(mocker):
+    mocked_enter_interpreter_as = mocker.patch('Main.enter_interpreter_as')
+    mocker.patch.object(function_cache, 'size', 1024)
+    perform_operation_based_on_arguments(['python', '--function-cache-size', '8', 'HelloWorld.os'])
+    mocked_enter_interpreter_as.assert_called_with("HelloWorld.os")
+    assert function_cache.size == 8
+
+def test_shows_cache_stats_when_cache_stats_flag_passed_in(mocker):
+    mocked_enter_interpreter_as = mocker.patch('Main.enter_interpreter_as')
+    mocker.patch('Main.show_cache_stats', False)
+    perform_operation_based_on_arguments(['python', '--cache-stats', 'HelloWorld.os'])
+    mocked_enter_interpreter_as.assert_called_with("HelloWorld.os")
+    assert Main.show_cache_stats == True
+
+def test_dumps_optimized_program_when_dump_optimized_flag_passed_in(mocker):
+    mocked_enter_interpreter_as = mocker.patch('Main.enter_interpreter_as')
+    mocker.patch('Main.dump_optimized', False)
+    perform_operation_based_on_arguments(['python', '--dump-optimized', 'HelloWorld.os'])
+    mocked_enter_interpreter_as.assert_called_with("HelloWorld.os")
+    assert Main.dump_optimized == True
+
+def test_prints_help_info_when_recursion_limit_is_not_a_positive_integer(mocker):
+    mocked_print_help = mocker.patch('Main.print_help')
+    perform_operation_based_on_arguments(['python', '--recursion-limit', '-5', 'HelloWorld.os'])
+    mocked_print_help.assert_called()
+
+def test_prints_help_info_when_native_flag_passed_in_without_script(mocker):
+    mocked_print_help = mocker.patch('Main.print_help')
+    perform_operation_based_on_arguments(['python', '--native'])
+    mocked_print_help.assert_called()
+
 def test_prints_info_when_info_flag_passed_in(mocker):
     mocked_print_info = mocker.patch('Main.print_info')
     perform_operation_based_on_arguments(['python', '--info'])